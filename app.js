@@ -237,10 +237,11 @@ function clearSessionSilently() {
 async function checkSession() {
     const params = new URLSearchParams(window.location.search);
 
-    // Check for existing session first - valid cookie always wins
+    // Check for existing session first - valid cookie always wins.
+    // serve_index inlines the bootstrap payload for logged-in visitors;
+    // otherwise /api/bootstrap brings clients, jobs and todos in one trip.
     try {
-        const response = await fetch('/api/check-session');
-        const data = await response.json();
+        const data = readInlineBootstrap() || await (await fetch(`${API_BASE}/bootstrap?todos=1`)).json();
         
         if (data.authenticated && data.user) {
             state.currentUser = {
@@ -250,7 +251,7 @@ async function checkSession() {
                 client: data.user.clientCode,
                 accessLevel: data.user.accessLevel
             };
-            unlockApp();
+            unlockApp(data);
 
             // If we just arrived from a magic-link verify, open the Welcome
             // modal over the destination view. The modal sits while initial
@@ -284,6 +285,17 @@ async function checkSession() {
     document.body.classList.remove('loading');
 }
 
+// JSON island rendered into index.html by the server (null if absent/unreadable)
+function readInlineBootstrap() {
+    const el = $('hub-bootstrap');
+    if (!el) return null;
+    try {
+        return JSON.parse(el.textContent);
+    } catch (e) {
+        return null;
+    }
+}
+
 // ----- Auth overlay face helpers (Phase D) -----
 
 function showAuthFace(faceName) {
@@ -460,7 +472,7 @@ async function submitPin() {
     }
 }
 
-function unlockApp() {
+function unlockApp(boot) {
     // Remove logged-out and loading states
     document.body.classList.remove('logged-out');
     document.body.classList.remove('loading');
@@ -473,8 +485,17 @@ function unlockApp() {
     // Apply access level filtering
     applyAccessLevel();
     
-    loadClients();
-    loadJobs();
+    // Use bootstrap data where it arrived; fetch any section that didn't
+    if (boot?.clients) state.allClients = boot.clients; else loadClients();
+    if (boot?.jobs) {
+        state.allJobs = boot.jobs;
+        state.jobsCursor = boot.jobsCursor;
+        jobsLanded();
+    } else {
+        loadJobs();
+    }
+    if (boot?.todos && typeof window.seedTodos === 'function') window.seedTodos(boot.todos);
+    connectLiveEvents();
     resetInactivityTimer();
     
     // Apply deep link if present — otherwise route to default landing for this user
@@ -651,10 +672,20 @@ async function loadClients() {
 }
 
 async function loadJobs() {
-    try {
-        const response = await fetch(`${API_BASE}/jobs/all`);
-        state.allJobs = await response.json();
-    } catch (e) { state.allJobs = []; }
+    // After the first load, fetch only what changed (falls back to a full load)
+    const patched = state.jobsLoaded && state.jobsCursor && await loadJobChanges();
+    if (!patched) {
+        try {
+            const response = await fetch(`${API_BASE}/jobs/all`);
+            state.allJobs = await response.json();
+            state.jobsCursor = response.headers.get('X-Jobs-Cursor');
+        } catch (e) { state.allJobs = []; }
+    }
+    jobsLanded();
+}
+
+// Jobs are in state.allJobs — mark loaded and refresh anything waiting on them
+function jobsLanded() {
     state.jobsLoaded = true;
     
     // Re-render WIP if we're on that view
@@ -668,6 +699,76 @@ async function loadJobs() {
     }
 }
 
+// Merge /api/jobs/changes into state.allJobs in place. Returns false if the
+// delta couldn't be fetched, so the caller does a full reload instead.
+async function loadJobChanges() {
+    try {
+        const response = await fetch(`${API_BASE}/jobs/changes?since=${encodeURIComponent(state.jobsCursor)}`);
+        if (!response.ok) return false;
+        mergeJobChanges(await response.json());
+        return true;
+    } catch (e) { return false; }
+}
+
+function mergeJobChanges(delta) {
+    const changed = new Map(delta.jobs.map(j => [j.jobNumber, j]));
+    const removed = new Set(delta.removed);
+    state.allJobs = state.allJobs
+        .filter(j => !removed.has(j.jobNumber))
+        .map(j => {
+            const fresh = changed.get(j.jobNumber);
+            if (fresh) changed.delete(j.jobNumber);
+            return fresh || j;
+        })
+        .concat([...changed.values()]);
+    state.jobsCursor = delta.cursor;
+}
+
+// Apply a jobs delta fetched elsewhere (e.g. in an /api/batch save)
+window.applyJobChanges = function(delta) {
+    mergeJobChanges(delta);
+    jobsLanded();
+};
+
+// ===== LIVE EVENTS =====
+// /api/events pushes a compact event for every save (ours or a teammate's).
+// Jobs and todos are patched in place from the event payload; tracker views
+// reload just the open client. 'resync' means we fell behind — reload all.
+const ACTIVE_JOB_STATUSES = ['Incoming', 'In Progress', 'On Hold'];
+let liveEvents = null;
+
+function connectLiveEvents() {
+    if (liveEvents || typeof EventSource === 'undefined') return;
+    liveEvents = new EventSource(`${API_BASE}/events`);
+    liveEvents.addEventListener('job', (e) => applyJobEvent(JSON.parse(e.data)));
+    liveEvents.addEventListener('todo', (e) => {
+        if (typeof window.applyTodoEvent === 'function') window.applyTodoEvent(JSON.parse(e.data));
+    });
+    liveEvents.addEventListener('tracker', (e) => {
+        const event = JSON.parse(e.data);
+        if (event.clientCode && event.clientCode !== state.trackerClient) return;
+        window.refreshAfterMutation(['tracker']);
+    });
+    liveEvents.addEventListener('resync', () => window.refreshAfterMutation(['jobs', 'tracker', 'todo']));
+}
+
+function applyJobEvent(event) {
+    const deleted = event.action === 'deleted';
+    if (!state.jobsLoaded || !(event.job || deleted)) return;
+    const idx = state.allJobs.findIndex(j => j.jobNumber === event.jobNumber);
+    const stillActive = !deleted && ACTIVE_JOB_STATUSES.includes(event.job.status);
+    if (idx >= 0 && stillActive) {
+        state.allJobs[idx] = event.job;
+    } else if (idx >= 0) {
+        state.allJobs.splice(idx, 1);
+    } else if (stillActive) {
+        state.allJobs.push(event.job);
+    } else {
+        return;
+    }
+    if (state.currentView === 'wip') renderWip();
+}
+
 // ===== REFRESH AFTER MUTATION =====
 // Single dispatcher for "something changed, update the visible page".
 // Used by updateModal, newJobModal, and askDotModal so the page reflects
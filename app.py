@@ -6,19 +6,36 @@ Ask Dot brain lives in Traffic - this is just data.
 
 # load_dotenv() — local only, Railway uses env vars directly
 
-from flask import Flask, jsonify, request, send_from_directory, make_response, redirect
+from flask import Flask, jsonify, request, send_from_directory, make_response, redirect, Response, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException, MethodNotAllowed
 import requests
 import os
-from datetime import datetime, date
+import json
+import queue
+from datetime import datetime, date, timezone
+from urllib.parse import unquote, urlsplit
 import re
 import hashlib  # NEW: For auth tokens
 import time     # NEW: For auth tokens
 import base64   # NEW: For auth tokens
 import hmac      # PIN: constant-time compare
 import threading # PIN: rate-limit lock
+import functools
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import tracker  # Tracker math (quarter, rollover, chart months)
+import search   # In-memory full-text index
+import people   # In-memory People directory
+import ratelimit  # Brute-force guard store
+import resilience  # Circuit breaker + stale cache for Airtable outages
+import webhooks   # Airtable webhook MAC + payload parsing
+import tablecache  # In-memory copies of the hot Airtable tables
+import jobnumbers  # Pre-reserved job number blocks
+import memostore   # Results memoised against an input fingerprint
+import trackerframe  # Columnar Tracker entries
 
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)
@@ -27,6 +44,7 @@ CORS(app)
 AIRTABLE_API_KEY = os.environ.get('AIRTABLE_API_KEY')
 AIRTABLE_BASE_ID = os.environ.get('AIRTABLE_BASE_ID', 'app8CI7NAZqhQ4G1Y')
 WORKERS_URL = os.environ.get('WORKERS_URL', 'https://dot-workers.up.railway.app')
+AIRTABLE_API_URL = os.environ.get('AIRTABLE_API_URL', 'https://api.airtable.com')  # override to point at a local stand-in
 
 HEADERS = {
     'Authorization': f'Bearer {AIRTABLE_API_KEY}',
@@ -34,7 +52,204 @@ HEADERS = {
 }
 
 def get_airtable_url(table):
-    return f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{table}'
+    return f'{AIRTABLE_API_URL}/v0/{AIRTABLE_BASE_ID}/{table}'
+
+
+# ===== AIRTABLE RESILIENCE =====
+# Every Airtable call goes through airtable_request(): a timeout, so a hung
+# connection can't pin a worker thread, and a per-table circuit breaker
+# (resilience.py). After AIRTABLE_BREAKER_FAILURES consecutive failures
+# (timeouts, connection errors, 5xx, 429) a table's calls fail fast with
+# AirtableUnavailable, and a background probe retries it every
+# AIRTABLE_BREAKER_COOLDOWN_SECONDS until Airtable answers. Meanwhile GET
+# routes wrapped in @serve_stale answer from their last good payload.
+AIRTABLE_TIMEOUT = (5, 20)   # (connect, read) seconds
+OUTBOUND_TIMEOUT = 30        # Postman / workers
+AIRTABLE_BREAKER_FAILURES = 3
+AIRTABLE_BREAKER_COOLDOWN_SECONDS = 30
+STALE_CACHE_ENTRIES = 500
+
+# Hedged reads: a GET still unanswered after its table's recent p95 latency
+# gets a duplicate request, and whichever answers first wins — one slow page
+# no longer stalls a whole pagination loop. Hedges only go out when the shared
+# rate budget (Airtable allows 5 requests/second per base) has a token spare.
+AIRTABLE_RATE_PER_SECOND = 5
+AIRTABLE_HEDGE_DEFAULT_SECONDS = 2.0   # until a table has enough samples
+AIRTABLE_HEDGE_MIN_SECONDS = 0.3
+AIRTABLE_HEDGE_MAX_SECONDS = 5.0
+AIRTABLE_HEDGE_WORKERS = 16
+_airtable_latency = resilience.LatencyTracker()
+_airtable_budget = resilience.RateBudget(AIRTABLE_RATE_PER_SECOND)
+_airtable_pool = ThreadPoolExecutor(max_workers=AIRTABLE_HEDGE_WORKERS, thread_name_prefix='airtable')
+_airtable_breaker = resilience.CircuitBreaker(AIRTABLE_BREAKER_FAILURES, AIRTABLE_BREAKER_COOLDOWN_SECONDS)
+_stale_cache = resilience.StaleCache(STALE_CACHE_ENTRIES)
+_airtable_probes = set()     # tables with a recovery probe running
+_airtable_probes_lock = threading.Lock()
+
+
+class AirtableUnavailable(Exception):
+    """Raised, without calling Airtable, while a table's breaker is open."""
+
+
+def _airtable_table(url):
+    """Table name from an Airtable table or record URL (breaker key)."""
+    prefix = get_airtable_url('')
+    if not url.startswith(prefix):
+        return url
+    return url[len(prefix):].split('/')[0].split('?')[0]
+
+
+def airtable_request(method, url, **kwargs):
+    """requests.<method>(url, ...) for Airtable, with timeout and breaker.
+
+    Raises AirtableUnavailable while the table's breaker is open; otherwise
+    behaves like requests (including raising on timeouts).
+    """
+    table = _airtable_table(url)
+    if not _airtable_breaker.allow(table):
+        raise AirtableUnavailable(f'Airtable {table} is unavailable (retrying in the background)')
+    kwargs.setdefault('headers', HEADERS)
+    kwargs.setdefault('timeout', AIRTABLE_TIMEOUT)
+    _airtable_budget.spend()
+    try:
+        if method == 'get':
+            response = _hedged_get(table, url, kwargs)
+        else:
+            response = getattr(requests, method)(url, **kwargs)
+    except requests.RequestException:
+        _airtable_failed(table)
+        raise
+    if response.status_code >= 500 or response.status_code == 429:
+        _airtable_failed(table)
+    else:
+        _airtable_breaker.success(table)
+    return response
+
+
+def _hedge_delay(table):
+    """Seconds to wait on a GET before hedging: the table's recent p95, clamped."""
+    p95 = _airtable_latency.percentile(table, 95)
+    if p95 is None:
+        return AIRTABLE_HEDGE_DEFAULT_SECONDS
+    return min(AIRTABLE_HEDGE_MAX_SECONDS, max(AIRTABLE_HEDGE_MIN_SECONDS, p95))
+
+
+def _timed_get(table, url, kwargs):
+    started = time.monotonic()
+    response = requests.get(url, **kwargs)
+    _airtable_latency.record(table, time.monotonic() - started)
+    return response
+
+
+def _hedge_answered(future):
+    """True if a finished GET got a usable answer (not an error, 5xx or 429)."""
+    if future.exception() is not None:
+        return False
+    status = future.result().status_code
+    return status < 500 and status != 429
+
+
+def _hedged_get(table, url, kwargs):
+    """GET url; if it outlasts _hedge_delay(table) and the rate budget allows,
+    race a duplicate and return whichever answers first. A 5xx / 429 or an
+    error only wins if the other request fails too."""
+    primary = _airtable_pool.submit(_timed_get, table, url, kwargs)
+    done, _ = wait([primary], timeout=_hedge_delay(table))
+    if done or not _airtable_budget.try_spend():
+        return primary.result()
+
+    hedge = _airtable_pool.submit(_timed_get, table, url, kwargs)
+    pending = {primary, hedge}
+    finished = []
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        answered = [f for f in done if _hedge_answered(f)]
+        if answered:
+            return answered[0].result()  # the loser finishes in the background
+        finished.extend(done)
+    # Both failed: hand back an error response if there was one, else raise
+    responses = [f for f in finished if f.exception() is None]
+    return (responses[0] if responses else finished[0]).result()
+
+
+def airtable_get(url, **kwargs):
+    return airtable_request('get', url, **kwargs)
+
+
+def airtable_post(url, **kwargs):
+    return airtable_request('post', url, **kwargs)
+
+
+def airtable_patch(url, **kwargs):
+    return airtable_request('patch', url, **kwargs)
+
+
+def airtable_delete(url, **kwargs):
+    return airtable_request('delete', url, **kwargs)
+
+
+def _airtable_failed(table):
+    if not _airtable_breaker.failure(table):
+        return
+    print(f'[Hub API] Airtable {table} circuit open — serving cached reads')
+    with _airtable_probes_lock:
+        if table in _airtable_probes:
+            return
+        _airtable_probes.add(table)
+    threading.Thread(target=_probe_airtable, args=(table,), daemon=True).start()
+
+
+def _probe_airtable(table):
+    """Background: one cheap read per cooldown until the table answers."""
+    try:
+        while _airtable_breaker.is_open(table):
+            time.sleep(AIRTABLE_BREAKER_COOLDOWN_SECONDS)
+            try:
+                airtable_get(get_airtable_url(table), params={'maxRecords': 1})
+            except Exception:
+                pass  # still down (or a request's own trial is in flight)
+        print(f'[Hub API] Airtable {table} recovered')
+    finally:
+        with _airtable_probes_lock:
+            _airtable_probes.discard(table)
+
+
+def serve_stale(view):
+    """Decorator for JSON GET routes: remember the last good response per URL
+    and access scope; when the live read fails (5xx), answer with it instead.
+
+    A stale answer carries X-Hub-Stale: true and X-Hub-Stale-Age (seconds);
+    object payloads also get 'stale': true and 'staleAge'.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = f"{_request_scope() or '*'}|{request.full_path}"
+        try:
+            response = make_response(view(*args, **kwargs))
+        except AirtableUnavailable as e:
+            response = make_response(jsonify({'error': str(e)}), 503)
+
+        if response.status_code == 200 and response.is_json:
+            extra = {k: v for k, v in response.headers.items() if k.startswith('X-')}
+            _stale_cache.put(key, (response.get_data(), extra))
+            return response
+        if response.status_code < 500:
+            return response
+
+        cached = _stale_cache.get(key)
+        if cached is None:
+            return response
+        (body, extra), age = cached
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            payload = {**payload, 'stale': True, 'staleAge': int(age)}
+        stale = make_response(jsonify(payload))
+        stale.headers.update(extra)
+        stale.headers['X-Hub-Stale'] = 'true'
+        stale.headers['X-Hub-Stale-Age'] = str(int(age))
+        print(f'[Hub API] Serving stale {request.path} ({int(age)}s old)')
+        return stale
+    return wrapper
 
 
 def parse_year_end_month(value):
@@ -72,12 +287,23 @@ SESSION_EXPIRY_DAYS = 180
 # this owner's People.Pin and nothing else.
 PIN_OWNER_EMAIL = os.environ.get('PIN_OWNER_EMAIL', 'michael@hunch.co.nz')
 
-# Brute-force guard for /api/verify-pin. In-memory, per-IP. Resets on redeploy
-# and is per-instance (fine for a single Railway dyno).
+# Small local state that should outlive a redeploy and be shared by every
+# worker (PIN lockouts, job number leases, closed-quarter rollovers). Unset = in-memory, per-process.
+HUB_STATE_DB = os.environ.get('HUB_STATE_DB', '')
+
+# Brute-force guard for /api/verify-pin, per IP. Bounded (ratelimit.py): at
+# most PIN_ATTEMPTS_MAX_KEYS IPs are remembered and entries expire after the
+# lockout, so memory stays flat under a credential-stuffing burst. In-memory
+# unless HUB_STATE_DB is set.
 PIN_MAX_FAILS = 5
 PIN_LOCKOUT_SECONDS = 5 * 60
-_pin_attempts = {}          # ip -> {'fails': int, 'locked_until': float}
-_pin_attempts_lock = threading.Lock()
+PIN_ATTEMPTS_MAX_KEYS = 10000
+if HUB_STATE_DB:
+    _pin_attempts = ratelimit.SqliteAttemptLimiter(
+        HUB_STATE_DB, PIN_MAX_FAILS, PIN_LOCKOUT_SECONDS, max_keys=PIN_ATTEMPTS_MAX_KEYS)
+else:
+    _pin_attempts = ratelimit.AttemptLimiter(
+        PIN_MAX_FAILS, PIN_LOCKOUT_SECONDS, max_keys=PIN_ATTEMPTS_MAX_KEYS)
 
 
 # ===== AUTH FUNCTIONS (NEW) =====
@@ -131,64 +357,118 @@ def verify_token(token):
         return None, 'invalid'
 
 
-def lookup_person(email):
-    """Look up a person by email in Airtable People table."""
-    if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
-        print("[Auth] Warning: Airtable not configured")
+def _session_user():
+    """The verified user from the dot_session cookie, or None."""
+    session_token = request.cookies.get('dot_session')
+    if not session_token:
         return None
-    
-    url = get_airtable_url('People')
-    params = {
-        'filterByFormula': f'LOWER({{Email Address}}) = LOWER("{email}")',
-        'maxRecords': 1
-    }
-    
-    try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        if not data.get('records'):
-            return None
-        
-        record = data['records'][0]
-        fields = record.get('fields', {})
-        
-        return {
-            'email': fields.get('Email Address', email),
-            'first_name': fields.get('First Name', 'there'),
-            'client_code': fields.get('clientCode', ['UNKNOWN'])[0],
-            'access_level': fields.get('Access', 'Client WIP')  # Default to most restricted
-        }
-        
-    except Exception as e:
-        print(f"[Auth] Airtable lookup error: {e}")
+    user, error = verify_token(session_token)
+    if error or not user:
         return None
+    return user
 
 
-def lookup_person_with_pin(email):
-    """Look up a person including their PIN. Returns dict (with 'pin' as a
-    string, or None if unset) or None if not found. Used only by the PIN login."""
-    if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
-        print("[Auth] Warning: Airtable not configured")
+def _user_client_scope(user):
+    """Client code a user is limited to, or None for agency-wide (Full) access.
+
+    Mirrors applyAccessLevel() in app.js: anyone below Full with a real client
+    code only sees that client.
+    """
+    if not user or user['access_level'] == 'Full':
+        return None
+    client_code = user.get('client_code')
+    if not client_code or client_code == 'ALL':
         return None
+    return client_code
+
+
+def _request_scope():
+    """Client scope for the current request's session (None = unscoped).
 
-    url = get_airtable_url('People')
-    params = {
-        'filterByFormula': f'LOWER({{Email Address}}) = LOWER("{email}")',
-        'maxRecords': 1
+    Requests without a session (server-to-server callers such as Traffic)
+    stay unscoped, as before.
+    """
+    return _user_client_scope(_session_user())
+
+
+def _job_in_scope(job_number, scope):
+    """True if job_number belongs to scope (always True when unscoped)."""
+    return scope is None or extract_client_code(job_number) == scope
+
+
+def _session_json(user):
+    """User block returned by /api/check-session and /api/bootstrap."""
+    return {
+        'email': user['email'],
+        'firstName': user['first_name'],
+        'clientCode': user['client_code'],
+        'accessLevel': user['access_level']
     }
 
-    try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        data = response.json()
 
-        if not data.get('records'):
+# People directory: the People table indexed by email and client (people.py).
+# Its records come from the People table cache (see TABLE CACHE below — loaded
+# and topped up there, patched by Hub writes and the webhook); the directory
+# follows that cache's change journal, and only rebuilds on first use or if
+# the journal no longer reaches back. A lookup that misses (new person,
+# changed PIN) may force an early cache top-up, but no more than every
+# PEOPLE_MISS_REFRESH_SECONDS so a spray of unknown emails can't hammer Airtable.
+PEOPLE_MISS_REFRESH_SECONDS = 30
+ONE_NZ_CLIENT_CODES = ('ONE', 'ONB', 'ONS')  # One NZ divisions share contacts
+_people_directory = people.PeopleDirectory()
+_people_refresh_lock = threading.Lock()
+_people_state = {'version': None}  # People cache version the directory reflects
+
+
+def _refresh_people_directory(max_age=None):
+    """Bring the directory up to date with the People cache, topping the cache
+    up first if its last sync is older than max_age (default: the cache's own
+    refresh interval).
+
+    Returns True if Airtable was asked (so a lookup miss is worth retrying).
+    A failed first load raises.
+    """
+    synced_at = _table_cache_state['People']['synced_at']
+    cache = _cached_table('People', max_age)
+    with _people_refresh_lock:
+        changes = None
+        if _people_state['version'] is not None:
+            version, changes = cache.changes_after(_people_state['version'])
+        if changes is None:
+            version = cache.version  # read before the records: a racing write is re-applied next time
+            _people_directory.replace_all(cache.records())
+            print(f'[Auth] Built people directory: {len(_people_directory)} people')
+        else:
+            for old, new in changes:
+                if new is not None:
+                    _people_directory.upsert(new)
+                else:
+                    _people_directory.remove(old.get('id'))
+        _people_state['version'] = version
+    return _table_cache_state['People']['synced_at'] != synced_at
+
+
+def _person_fields(email):
+    """People fields for email (case-insensitive), or None. Retries a miss once
+    against fresh Airtable data."""
+    _refresh_people_directory()
+    fields = _people_directory.by_email(email)
+    if fields is None and _refresh_people_directory(PEOPLE_MISS_REFRESH_SECONDS):
+        fields = _people_directory.by_email(email)
+    return fields
+
+
+def lookup_person(email):
+    """Look up a person by email in the People directory."""
+    if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
+        print("[Auth] Warning: Airtable not configured")
+        return None
+
+    try:
+        fields = _person_fields(email)
+        if fields is None:
             return None
 
-        fields = data['records'][0].get('fields', {})
-        pin_val = fields.get('Pin')
         client_code = fields.get('clientCode', ['UNKNOWN'])
         if isinstance(client_code, list):
             client_code = client_code[0] if client_code else 'UNKNOWN'
@@ -197,13 +477,54 @@ def lookup_person_with_pin(email):
             'email': fields.get('Email Address', email),
             'first_name': fields.get('First Name', 'there'),
             'client_code': client_code,
-            'access_level': fields.get('Access', 'Client WIP'),
-            'pin': str(pin_val).strip() if pin_val is not None else None
+            'access_level': fields.get('Access', 'Client WIP')  # Default to most restricted
         }
 
     except Exception as e:
-        print(f"[Auth] PIN lookup error: {e}")
+        print(f"[Auth] People lookup error: {e}")
+        return None
+
+
+def confirm_person(email):
+    """Re-read email's People record from Airtable before a session is issued,
+    so someone deleted (or re-addressed) there since the cache last synced
+    can't log in on the cached copy. The fresh record is fed into the cache.
+
+    Returns False if the record is gone or no longer has this email. If
+    Airtable can't be asked, the cached copy stands (True).
+    """
+    record_id = _people_directory.id_for(email)
+    if record_id is None:
+        return False
+    fetched_at = time.time()
+    try:
+        response = airtable_get(f"{get_airtable_url('People')}/{record_id}", headers=HEADERS)
+        if response.status_code == 404:
+            _write_through_removed('People', record_id)
+            _refresh_people_directory()
+            print(f'[Auth] {email} no longer in People, refusing login')
+            return False
+        response.raise_for_status()
+        record = response.json()
+    except Exception as e:
+        print(f'[Auth] Could not confirm {email} against Airtable (using cached People): {e}')
+        return True
+    _write_through('People', record, as_of=fetched_at)
+    _refresh_people_directory()
+    confirmed = (record.get('fields', {}).get('Email Address') or '').strip().lower() == email.strip().lower()
+    if not confirmed:
+        print(f'[Auth] {email} no longer on its People record, refusing login')
+    return confirmed
+
+
+def lookup_person_with_pin(email):
+    """Look up a person including their PIN. Returns dict (with 'pin' as a
+    string, or None if unset) or None if not found. Used only by the PIN login."""
+    person = lookup_person(email)
+    if person is None:
         return None
+    person['pin'] = _people_directory.pin_for(email)
+    return person
 
 
 def update_last_login(email):
@@ -268,7 +589,7 @@ def send_magic_link_email(email, first_name, token):
             'body': body
         }
         
-        response = requests.post(POSTMAN_URL, json=payload)
+        response = requests.post(POSTMAN_URL, json=payload, timeout=OUTBOUND_TIMEOUT)
         response.raise_for_status()
         print(f"[Auth] Email sent to {email}")
         return True
@@ -293,10 +614,10 @@ def handle_request_login():
             'message': 'Please enter an email address'
         }), 400
     
-    # Look up in People table
+    # Look up in People table (confirmed against Airtable, not just the cache)
     person = lookup_person(email)
     
-    if not person:
+    if not person or not confirm_person(email):
         return jsonify({
             'success': False,
             'error': 'not_found',
@@ -348,6 +669,10 @@ def handle_verify():
     if error or not user:
         return redirect(f"/?error=invalid")
     
+    # The link may predate the person's removal from People
+    if not confirm_person(user['email']):
+        return redirect(f"/?error=invalid")
+    
     # Success! Set cookie and redirect to Hub with welcome flag
     response = make_response(redirect('/?welcome=1'))
 
@@ -431,24 +756,14 @@ def demo_login():
 @app.route('/api/check-session')
 def handle_check_session():
     """Check if current session is valid. Used by frontend to determine login state."""
-    session_token = request.cookies.get('dot_session')
-    
-    if not session_token:
-        return jsonify({'authenticated': False})
+    user = _session_user()
     
-    user, error = verify_token(session_token)
-    
-    if error or not user:
+    if not user:
         return jsonify({'authenticated': False})
     
     return jsonify({
         'authenticated': True,
-        'user': {
-            'email': user['email'],
-            'firstName': user['first_name'],
-            'clientCode': user['client_code'],
-            'accessLevel': user['access_level']
-        }
+        'user': _session_json(user)
     })
 
 
@@ -471,19 +786,17 @@ def handle_verify_pin():
     # Identify caller (Railway sits behind a proxy — first X-Forwarded-For hop)
     fwd = request.headers.get('X-Forwarded-For', '')
     ip = fwd.split(',')[0].strip() if fwd else (request.remote_addr or 'unknown')
-    now = time.time()
 
     # Rate-limit gate
-    with _pin_attempts_lock:
-        rec = _pin_attempts.get(ip)
-        if rec and rec.get('locked_until', 0) > now:
-            retry = int(rec['locked_until'] - now)
-            return jsonify({
-                'success': False,
-                'error': 'locked',
-                'message': f"Too many tries. Try again in {retry // 60 + 1} min.",
-                'retryAfter': retry
-            }), 429
+    locked_for = _pin_attempts.locked_for(ip)
+    if locked_for:
+        retry = int(locked_for)
+        return jsonify({
+            'success': False,
+            'error': 'locked',
+            'message': f"Too many tries. Try again in {retry // 60 + 1} min.",
+            'retryAfter': retry
+        }), 429
 
     data = request.get_json() or {}
     pin = str(data.get('pin', '')).strip()
@@ -498,20 +811,24 @@ def handle_verify_pin():
     # Constant-time compare; treat a missing/blank stored PIN as never-match
     matched = bool(real_pin) and hmac.compare_digest(pin, real_pin)
 
+    # The PIN may have just been changed in Airtable — recheck once against
+    # fresh data (rate-limited by the directory, so this can't be used to
+    # hammer Airtable)
+    if not matched and _refresh_people_directory(PEOPLE_MISS_REFRESH_SECONDS):
+        owner = lookup_person_with_pin(PIN_OWNER_EMAIL)
+        real_pin = owner['pin'] if owner else None
+        matched = bool(real_pin) and hmac.compare_digest(pin, real_pin)
+
+    if matched and not confirm_person(PIN_OWNER_EMAIL):
+        matched = False  # removed from People since the cache last synced
+
     if not matched:
-        with _pin_attempts_lock:
-            rec = _pin_attempts.get(ip, {'fails': 0, 'locked_until': 0})
-            rec['fails'] += 1
-            if rec['fails'] >= PIN_MAX_FAILS:
-                rec['locked_until'] = now + PIN_LOCKOUT_SECONDS
-                rec['fails'] = 0
-            _pin_attempts[ip] = rec
+        _pin_attempts.fail(ip)
         return jsonify({'success': False, 'error': 'wrong',
                         'message': "That's not it"}), 401
 
     # Success — clear attempts, mint the long session
-    with _pin_attempts_lock:
-        _pin_attempts.pop(ip, None)
+    _pin_attempts.reset(ip)
 
     session_days = SESSION_EXPIRY_DAYS if owner['access_level'] == 'Full' else TOKEN_EXPIRY_DAYS
     session_token = generate_token(
@@ -548,14 +865,165 @@ def health():
         'status': 'ok',
         'service': 'dot-hub',
         'version': '1.1',  # Bumped for auth
-        'features': ['static', 'api', 'universal-schema', 'magic-link-auth']
+        'features': ['static', 'api', 'universal-schema', 'magic-link-auth', 'live-events'],
+        'airtableOpenCircuits': _airtable_breaker.open_keys()
     })
 
 
+# ===== LIVE EVENTS (SSE) =====
+# Every mutation route publishes a compact change event here, and open tabs
+# patch their local state from it instead of refetching whole lists after
+# each save. In-memory and per-instance, same as the PIN guard.
+EVENT_QUEUE_SIZE = 100          # per subscriber; a tab that falls this far behind is told to resync
+EVENT_KEEPALIVE_SECONDS = 25    # comment line so proxies don't close an idle stream
+_event_subscribers = {}         # queue.Queue per open /api/events stream -> its client scope
+_event_subscribers_lock = threading.Lock()
+_event_seq = 0
+_event_listeners = []           # in-process callbacks (e.g. search index), called with each event
+
+
+def publish_event(event_type, **data):
+    """Fan a change event out to every open /api/events stream.
+
+    event_type: 'job', 'update', 'tracker' or 'todo'. Keyword args form the
+    payload (keep it small — the record that changed, not the whole list).
+    Never raises: a failed publish must not fail the write that triggered it.
+    """
+    global _event_seq
+    try:
+        with _event_subscribers_lock:
+            _event_seq += 1
+            event = {**data, 'type': event_type, 'seq': _event_seq}
+            subscribers = list(_event_subscribers.items())
+        for listener in _event_listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f'[Events] Listener {listener.__name__} failed for {event_type}: {e}')
+        for q, scope in subscribers:
+            if not _event_visible(event, scope):
+                continue
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # Slow tab — drop its backlog and tell it to reload from scratch
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait({'type': 'resync', 'seq': event['seq']})
+    except Exception as e:
+        print(f'[Events] Publish failed for {event_type}: {e}')
+
+
+def _event_visible(event, scope):
+    """Client-scoped streams only see their own client's changes, and no todos."""
+    if scope is None:
+        return True
+    if event['type'] == 'todo':
+        return False
+    return event.get('clientCode') == scope
+
+
+def _format_sse(event):
+    """Serialise an event dict as one SSE frame."""
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@app.route('/api/events')
+def stream_events():
+    """Server-sent events stream of job, update, tracker and todo changes."""
+    q = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+    with _event_subscribers_lock:
+        _event_subscribers[q] = _request_scope()
+
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    event = q.get(timeout=EVENT_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield _format_sse(event)
+        finally:
+            with _event_subscribers_lock:
+                _event_subscribers.pop(q, None)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 # ===== STATIC FILES (must be after API routes) =====
+# For a logged-in visitor, index.html goes out with the /api/bootstrap payload
+# inlined as a JSON island, so the WIP board renders without waiting on any
+# fetch. Clients + jobs are cached per access scope (everyone at Full shares
+# one entry, each client another) and dropped on any job write.
+INDEX_CACHE_SECONDS = 30
+_index_html = None
+_first_paint_cache = {}     # scope ('*' for agency-wide) -> (built_at, data)
+_first_paint_lock = threading.Lock()
+
+
+def _cached_first_paint(scope):
+    """Clients + active jobs for a scope, from cache when fresh. None on failure."""
+    key = scope or '*'
+    now = time.time()
+    with _first_paint_lock:
+        hit = _first_paint_cache.get(key)
+    if hit and now - hit[0] < INDEX_CACHE_SECONDS:
+        return hit[1]
+    data, errors = _first_paint_data(scope)
+    if errors:
+        return None  # don't inline a half payload — the page falls back to /api/bootstrap
+    with _first_paint_lock:
+        _first_paint_cache[key] = (now, data)
+    return data
+
+
+def _first_paint_on_event(event):
+    """publish_event listener: any job change invalidates every scope."""
+    if event['type'] == 'job':
+        with _first_paint_lock:
+            _first_paint_cache.clear()
+
+
+_event_listeners.append(_first_paint_on_event)
+
+
 @app.route('/')
 def serve_index():
-    return send_from_directory('.', 'index.html')
+    global _index_html
+    user = _session_user()
+    if not user:
+        return send_from_directory('.', 'index.html')
+
+    try:
+        data = _cached_first_paint(_user_client_scope(user))
+    except Exception as e:
+        print(f'[Hub API] First-paint data failed (serving plain index): {e}')
+        data = None
+    if data is None:
+        return send_from_directory('.', 'index.html')
+
+    if _index_html is None:
+        with open(os.path.join(app.root_path, 'index.html'), encoding='utf-8') as f:
+            _index_html = f.read()
+
+    payload = {'authenticated': True, 'user': _session_json(user), **data}
+    # '<' escaped so no value can close the script tag early
+    island = json.dumps(payload).replace('<', '\\u003c')
+    html = _index_html.replace(
+        '</head>',
+        f'<script id="hub-bootstrap" type="application/json">{island}</script>\n</head>',
+        1,
+    )
+    response = make_response(html)
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.headers['Cache-Control'] = 'no-store'  # per-user page
+    return response
 
 
 # ===== DATE PARSING HELPERS =====
@@ -734,26 +1202,32 @@ def transform_project(record):
 
 
 # ===== CLIENTS =====
+def _load_clients():
+    """Clients list in API shape, sorted by name."""
+    url = get_airtable_url('Clients')
+    response = airtable_get(url, headers=HEADERS)
+    response.raise_for_status()
+    
+    clients = []
+    for record in response.json().get('records', []):
+        fields = record.get('fields', {})
+        clients.append({
+            'code': fields.get('Client code', ''),
+            'name': fields.get('Clients', ''),
+            'teamsId': fields.get('Teams ID', ''),
+            'sharepointId': fields.get('Sharepoint ID', '')
+        })
+    
+    clients.sort(key=lambda x: x['name'])
+    return clients
+
+
 @app.route('/api/clients')
+@serve_stale
 def get_clients():
     """Get list of clients"""
     try:
-        url = get_airtable_url('Clients')
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-        
-        clients = []
-        for record in response.json().get('records', []):
-            fields = record.get('fields', {})
-            clients.append({
-                'code': fields.get('Client code', ''),
-                'name': fields.get('Clients', ''),
-                'teamsId': fields.get('Teams ID', ''),
-                'sharepointId': fields.get('Sharepoint ID', '')
-            })
-        
-        clients.sort(key=lambda x: x['name'])
-        return jsonify(clients)
+        return jsonify(_load_clients())
     
     except Exception as e:
         print(f'[Hub API] Error fetching clients: {e}')
@@ -762,48 +1236,30 @@ def get_clients():
 
 # ===== PEOPLE =====
 @app.route('/api/people/<client_code>')
+@serve_stale
 def get_people_for_client(client_code):
     """Get contacts for a specific client"""
     try:
-        url = get_airtable_url('People')
-        
-        # Handle One NZ divisions - search for ONE, ONB, or ONS
-        if client_code in ['ONE', 'ONB', 'ONS']:
-            filter_formula = "AND({Active} = TRUE(), OR({Client Link} = 'ONE', {Client Link} = 'ONB', {Client Link} = 'ONS'))"
-        else:
-            filter_formula = f"AND({{Active}} = TRUE(), {{Client Link}} = '{client_code}')"
-        
-        params = {'filterByFormula': filter_formula}
+        _refresh_people_directory()
+
+        # Handle One NZ divisions - contacts for ONE, ONB and ONS
+        codes = ONE_NZ_CLIENT_CODES if client_code in ONE_NZ_CLIENT_CODES else (client_code,)
+
         all_people = []
-        offset = None
-        
-        while True:
-            if offset:
-                params['offset'] = offset
-            
-            response = requests.get(url, headers=HEADERS, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            for record in data.get('records', []):
-                fields = record.get('fields', {})
-                name = fields.get('Name', fields.get('Full name', ''))
-                if name:
-                    all_people.append({
-                        'name': name,
-                        'firstName': fields.get('First Name', name.split()[0] if name else ''),
-                        'email': fields.get('Email Address', ''),
-                        'accessLevel': fields.get('Access', 'Client WIP'),
-                        'clientCode': fields.get('Client Link', '')
-                    })
-            
-            offset = data.get('offset')
-            if not offset:
-                break
-        
+        for fields in _people_directory.active_for_clients(codes):
+            name = fields.get('Name', fields.get('Full name', ''))
+            if name:
+                all_people.append({
+                    'name': name,
+                    'firstName': fields.get('First Name', name.split()[0] if name else ''),
+                    'email': fields.get('Email Address', ''),
+                    'accessLevel': fields.get('Access', 'Client WIP'),
+                    'clientCode': fields.get('Client Link', '')
+                })
+
         all_people.sort(key=lambda x: x['name'])
         return jsonify(all_people)
-    
+
     except Exception as e:
         print(f'[Hub API] Error fetching people: {e}')
         return jsonify({'error': str(e)}), 500
@@ -829,11 +1285,7 @@ def create_person():
         url = get_airtable_url('People')
 
         # Guard against a duplicate email
-        existing = requests.get(url, headers=HEADERS, params={
-            'filterByFormula': f"LOWER({{Email Address}}) = '{email.lower()}'",
-            'maxRecords': 1,
-        })
-        if existing.ok and existing.json().get('records'):
+        if _person_fields(email) is not None:
             return jsonify({'error': 'A person with that email already exists'}), 409
 
         # NOTE: 'Name' is a computed (formula) field in People — Airtable derives
@@ -848,18 +1300,19 @@ def create_person():
 
         # Client Link only applies to client-access people, and only if a client is chosen
         if access != 'Full' and client_code:
-            cl = requests.get(get_airtable_url('Clients'), headers=HEADERS, params={
+            cl = airtable_get(get_airtable_url('Clients'), headers=HEADERS, params={
                 'filterByFormula': f"{{Client code}} = '{client_code}'",
                 'maxRecords': 1,
             })
             if cl.ok and cl.json().get('records'):
                 fields['Client Link'] = [cl.json()['records'][0]['id']]
 
-        resp = requests.post(url, headers=HEADERS, json={'fields': fields})
+        resp = airtable_post(url, headers=HEADERS, json={'fields': fields})
         if not resp.ok:
             print(f'[Hub API] Airtable rejected person create ({resp.status_code}): {resp.text}')
             return jsonify({'error': 'Airtable rejected the create'}), 502
 
+        _write_through('People', resp.json())
         print(f'[Hub API] Created person: {name} ({access})')
         return jsonify({'success': True, 'name': name, 'access': access})
 
@@ -869,28 +1322,118 @@ def create_person():
 
 
 # ===== NEW JOB =====
+# Job numbers come from per-client leases (jobnumbers.py): when a client's
+# lease runs out, one read of its Next # and one PATCH reserve the next
+# JOB_NUMBER_BLOCK numbers, and new jobs take numbers locally under a lock —
+# no read-increment-write per job, and no duplicates between concurrent
+# creations. With HUB_STATE_DB set, leases live in that SQLite file, shared
+# by every worker process on the host (they take turns refilling); otherwise
+# each process holds its own in memory. Run ONE Hub host per base: the Next #
+# read-then-PATCH isn't atomic in Airtable, so two hosts refilling the same
+# client at once could reserve the same block. A restart without
+# HUB_STATE_DB (or losing its file) skips the unused rest of each client's
+# block — gaps of up to JOB_NUMBER_BLOCK - 1. If the Next Job # format can't
+# be read off the client record, a single number is reserved the old way.
+JOB_NUMBER_BLOCK = int(os.environ.get('JOB_NUMBER_BLOCK', 5))
+if HUB_STATE_DB:
+    _job_number_leases = jobnumbers.SqliteJobNumberLeases(HUB_STATE_DB)
+else:
+    _job_number_leases = jobnumbers.JobNumberLeases()
+
+
+def _get_client_record(client_code):
+    """Clients record for client_code, or None."""
+    response = airtable_get(
+        get_airtable_url('Clients'),
+        headers=HEADERS,
+        params={'filterByFormula': f"{{Client code}} = '{client_code}'", 'maxRecords': 1}
+    )
+    response.raise_for_status()
+    records = response.json().get('records', [])
+    return records[0] if records else None
+
+
+def _client_job_sequence(client_code):
+    """(client record, formatted Next Job #, Next #) — ValueError if unusable."""
+    record = _get_client_record(client_code)
+    if not record:
+        raise ValueError(f'Client {client_code} not found')
+    fields = record.get('fields', {})
+    next_job = fields.get('Next Job #', '')
+    if not next_job:
+        raise ValueError(f'No job number sequence configured for {client_code}')
+    try:
+        next_num = int(fields.get('Next #', 0))
+    except (ValueError, TypeError):
+        raise ValueError(f'Invalid Next # value for {client_code}')
+    return record, next_job, next_num
+
+
+def _move_next_job_number(record, next_num):
+    response = airtable_patch(
+        f"{get_airtable_url('Clients')}/{record['id']}",
+        headers=HEADERS,
+        json={'fields': {'Next #': next_num}}
+    )
+    response.raise_for_status()
+
+
+def _reserve_job_numbers(client_code, count):
+    """Lease refill: move the client's Next # on by count.
+
+    Returns (prefix, width, start, start + count), or None (nothing reserved)
+    if Next Job # isn't Next # in a format we can reproduce.
+    """
+    record, next_job, start = _client_job_sequence(client_code)
+    number_format = jobnumbers.job_number_format(next_job, start)
+    if number_format is None:
+        print(f'[Hub API] Unreadable job number format for {client_code} ({next_job!r}), not leasing')
+        return None
+    _move_next_job_number(record, start + count)
+    print(f'[Hub API] Leased {client_code} job numbers {start}-{start + count - 1}')
+    return (*number_format, start, start + count)
+
+
+def _reserve_one_job_number(client_code):
+    """The old way: take Next Job # as-is and bump Next # by one."""
+    record, next_job, next_num = _client_job_sequence(client_code)
+    _move_next_job_number(record, next_num + 1)
+    return next_job
+
+
+def _allocate_job_number(client_code):
+    """A job number for a new job, from the client's lease.
+
+    Numbers that already exist in the Projects cache (e.g. Next # was wound
+    back by hand) are skipped. Raises ValueError if the client has no usable
+    number sequence.
+    """
+    projects = _table_caches['Projects']
+    for _ in range(JOB_NUMBER_BLOCK * 4):
+        job_number = _job_number_leases.take(
+            client_code, lambda: _reserve_job_numbers(client_code, JOB_NUMBER_BLOCK))
+        if job_number is None:
+            job_number = _reserve_one_job_number(client_code)
+        if not (projects.loaded and projects.get_by_key(job_number)):
+            return job_number
+        print(f'[Hub API] Job number {job_number} already exists, skipping')
+    raise ValueError(f'No free job number for {client_code} — check its Next #')
+
+
 @app.route('/api/preview-job-number/<client_code>')
 def preview_job_number(client_code):
     """Preview the next job number for a client (does NOT reserve it)"""
     try:
-        url = get_airtable_url('Clients')
-        params = {
-            'filterByFormula': f"{{Client code}} = '{client_code}'",
-            'maxRecords': 1
-        }
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        
-        records = response.json().get('records', [])
-        if not records:
+        record = _get_client_record(client_code)
+        if not record:
             return jsonify({'error': f'Client {client_code} not found'}), 404
         
-        record = records[0]
         fields = record.get('fields', {})
         client_name = fields.get('Clients', client_code)
         
-        # Next Job # is the formatted job number (e.g. "HUN 059")
-        preview_job_num = fields.get('Next Job #', '')
+        # Next from the client's lease, else Next Job # — the formatted job
+        # number (e.g. "HUN 059") the next lease would start at
+        preview_job_num = _job_number_leases.peek(client_code) or fields.get('Next Job #', '')
         if not preview_job_num:
             return jsonify({'error': f'No job number sequence configured for {client_code}'}), 400
         
@@ -910,7 +1453,7 @@ def preview_job_number(client_code):
 
 @app.route('/api/new-job', methods=['POST'])
 def create_new_job():
-    """Create a new job in Airtable - reserves job number atomically, creates Tracker record"""
+    """Create a new job in Airtable - takes a job number from the client's lease, creates Tracker record"""
     try:
         data = request.json
         
@@ -928,45 +1471,17 @@ def create_new_job():
         if not client_code or not job_name:
             return jsonify({'error': 'Missing required fields'}), 400
         
-        # Step 1: Get client record and reserve job number atomically
-        client_url = get_airtable_url('Clients')
-        client_response = requests.get(
-            client_url,
-            headers=HEADERS,
-            params={'filterByFormula': f"{{Client code}} = '{client_code}'", 'maxRecords': 1}
-        )
-        client_response.raise_for_status()
-        client_records = client_response.json().get('records', [])
-        
-        if not client_records:
+        # Step 1: Get client record (Team ID for setup worker)
+        client_record = _get_client_record(client_code)
+        if not client_record:
             return jsonify({'error': f'Client {client_code} not found'}), 404
+        team_id = client_record.get('fields', {}).get('Teams ID', '')
         
-        client_record = client_records[0]
-        client_record_id = client_record.get('id')
-        client_fields = client_record.get('fields', {})
-        
-        # Get Team ID for setup worker
-        team_id = client_fields.get('Teams ID', '')
-        
-        # Read the formatted job number directly
-        job_number = client_fields.get('Next Job #', '')
-        if not job_number:
-            return jsonify({'error': f'No job number sequence configured for {client_code}'}), 400
-        
-        # Get raw number to increment
-        next_num = client_fields.get('Next #', 0)
+        # Step 2: Take a job number from the client's lease
         try:
-            next_num = int(next_num)
-        except (ValueError, TypeError):
-            return jsonify({'error': f'Invalid Next # value for {client_code}'}), 400
-        
-        # Step 2: Increment the client's Next # 
-        update_response = requests.patch(
-            f"{client_url}/{client_record_id}",
-            headers=HEADERS,
-            json={'fields': {'Next #': next_num + 1}}
-        )
-        update_response.raise_for_status()
+            job_number = _allocate_job_number(client_code)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         print(f'[Hub API] Reserved job number: {job_number}')
         
@@ -991,7 +1506,7 @@ def create_new_job():
         
         url = get_airtable_url('Projects')
         print(f'[Hub API] Creating project with fields: {fields}')
-        response = requests.post(
+        response = airtable_post(
             url,
             headers=HEADERS,
             json={'fields': fields}
@@ -1003,7 +1518,10 @@ def create_new_job():
         
         created_record = response.json()
         project_record_id = created_record.get('id')
+        _write_through('Projects', created_record)
         print(f'[Hub API] Created new job: {job_number} - {job_name}')
+        publish_event('job', action='created', jobNumber=job_number,
+                      clientCode=client_code, job=transform_project(created_record))
 
         # Per-step receipt — the job survives a sub-step failure; each step reports its own outcome.
         steps = {'project': 'created', 'tracker': 'pending', 'todo': 'pending', 'folder': 'pending'}
@@ -1019,9 +1537,11 @@ def create_new_job():
                 'Month': current_month,
                 'Spend type': 'Project budget'
             }
-            tr = requests.post(get_airtable_url('Tracker'), headers=HEADERS, json={'fields': tracker_fields})
+            tr = airtable_post(get_airtable_url('Tracker'), headers=HEADERS, json={'fields': tracker_fields})
             tr.raise_for_status()
             steps['tracker'] = 'created'
+            _write_through('Tracker', tr.json())
+            publish_event('tracker', action='created', **_tracker_event_fields(tr.json()))
             print(f"[Hub API] Tracker for {job_number}: ${cost} (ballpark={is_ballpark})")
         except Exception as e:
             steps['tracker'] = f'failed: {e}'
@@ -1037,9 +1557,11 @@ def create_new_job():
             cid = _resolve_client_record_id(client_code)
             if cid:
                 todo_fields['Client'] = [cid]
-            td = requests.post(get_airtable_url('Todo'), headers=HEADERS, json={'fields': todo_fields})
+            td = airtable_post(get_airtable_url('Todo'), headers=HEADERS, json={'fields': todo_fields})
             td.raise_for_status()
             steps['todo'] = 'created'
+            _write_through('Todo', td.json())
+            publish_event('todo', action='created', todo=_todo_record_to_dict(td.json()))
             print(f'[Hub API] Todo created for {job_number}')
         except Exception as e:
             steps['todo'] = f'failed: {e}'
@@ -1058,11 +1580,13 @@ def create_new_job():
                 steps['folder'] = 'created'
                 if files_url:
                     try:
-                        requests.patch(
+                        files_response = airtable_patch(
                             f"{get_airtable_url('Projects')}/{project_record_id}",
                             headers=HEADERS,
                             json={'fields': {'Files Url': files_url}}
                         )
+                        if files_response.ok:
+                            _write_through('Projects', files_response.json())
                     except Exception as e:
                         print(f'[Hub API] Files Url patch failed for {job_number}: {e}')
                 print(f'[Hub API] Folder created for {job_number}: {files_url}')
@@ -1092,93 +1616,295 @@ def create_new_job():
         return jsonify({'error': str(e)}), 500
 
 
-# ===== JOBS =====
-@app.route('/api/jobs/all')
-def get_all_jobs():
-    """
-    Get jobs in universal schema format.
-    
-    Query params:
-        status: 'active' (default), 'completed', 'all'
-        client: filter by client code (e.g., 'SKY', 'TOW')
+# ===== RECORD CACHE =====
+# Projects, Tracker, Todo, Updates and People are held in memory
+# (tablecache.py) and reads are answered from there — including the search
+# index, People directory and tracker frame, which follow their tables'
+# change journals rather than polling Airtable themselves. Each table loads on first use, is topped up
+# from LAST_MODIFIED_TIME() at most every TABLE_CACHE_REFRESH_SECONDS, and is
+# fully reloaded every TABLE_CACHE_REBUILD_SECONDS (drops records deleted in
+# Airtable). Hub writes feed the record Airtable sends back straight in
+# (_write_through), and /api/airtable-webhook patches in everyone else's
+# edits — with the webhook set up, the refresh interval can be long.
+TABLE_CACHE_REFRESH_SECONDS = int(os.environ.get('TABLE_CACHE_REFRESH_SECONDS', 60))
+TABLE_CACHE_REBUILD_SECONDS = 60 * 60
+_table_caches = {
+    'Projects': tablecache.TableCache(key_field='Job Number'),
+    'Tracker': tablecache.TableCache(),
+    'Todo': tablecache.TableCache(),
+    'Updates': tablecache.TableCache(),
+    'People': tablecache.TableCache(),
+}
+_table_cache_locks = {table: threading.Lock() for table in _table_caches}
+_table_cache_state = {table: {'built_at': 0.0, 'synced_at': 0.0} for table in _table_caches}
+
+
+def _cached_table(table, max_age=None):
+    """The TableCache for table, loaded or topped up first if due (last sync
+    older than max_age, default TABLE_CACHE_REFRESH_SECONDS).
+
+    A failed top-up is logged and the cached copy served; a failed first
+    load raises.
     """
-    try:
-        url = get_airtable_url('Projects')
-        
-        # Parse query params
-        status_filter = request.args.get('status', 'active')
-        client_filter = request.args.get('client')
-        
-        # Build status filter
-        if status_filter == 'active':
-            statuses = ['Incoming', 'In Progress', 'On Hold']
-        elif status_filter == 'completed':
-            statuses = ['Completed']
-        elif status_filter == 'all':
-            statuses = ['Incoming', 'In Progress', 'On Hold', 'Completed', 'Archived']
-        else:
-            statuses = ['Incoming', 'In Progress', 'On Hold']
-        
-        formula_parts = [f"{{Status}} = '{s}'" for s in statuses]
-        filter_formula = f"OR({', '.join(formula_parts)})"
-        
-        # Add client filter if provided
-        if client_filter:
-            filter_formula = f"AND({filter_formula}, FIND('{client_filter}', {{Job Number}})=1)"
-        
-        params = {'filterByFormula': filter_formula}
-        
-        all_jobs = []
-        offset = None
-        
-        while True:
-            if offset:
-                params['offset'] = offset
-            
-            response = requests.get(url, headers=HEADERS, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            for record in data.get('records', []):
-                all_jobs.append(transform_project(record))
-            
-            offset = data.get('offset')
-            if not offset:
-                break
-        
-        return jsonify(all_jobs)
+    cache = _table_caches[table]
+    state = _table_cache_state[table]
+    max_age = TABLE_CACHE_REFRESH_SECONDS if max_age is None else max_age
+    now = time.time()
+    if (cache.loaded and now - state['synced_at'] <= max_age
+            and now - state['built_at'] <= TABLE_CACHE_REBUILD_SECONDS):
+        return cache
+
+    with _table_cache_locks[table]:
+        # Stamp with the start time, so writes that land mid-fetch are re-read
+        # next time — and aren't overwritten by this fetch's older copy now
+        started = time.time()
+        try:
+            if started - state['built_at'] > TABLE_CACHE_REBUILD_SECONDS:
+                cache.replace_all(_fetch_records(table), as_of=started)
+                state['built_at'] = state['synced_at'] = started
+                print(f'[Hub API] Loaded {table} cache: {len(cache)} records')
+            elif started - state['synced_at'] > max_age:
+                since = _airtable_time(state['synced_at'] - JOBS_CURSOR_OVERLAP_SECONDS)
+                for record in _fetch_records(table, f"IS_AFTER(LAST_MODIFIED_TIME(), '{since}')"):
+                    cache.upsert(record, as_of=started)
+                state['synced_at'] = started
+        except Exception as e:
+            if not cache.loaded:
+                raise
+            print(f'[Hub API] {table} cache refresh failed (serving cached): {e}')
+    return cache
+
+
+def _write_through(table, record, as_of=None):
+    """Feed a record Airtable returned from a write into its table's cache.
+    as_of: when a record that was only read (not written) was fetched, so a
+    newer write-through isn't overwritten by it."""
+    cache = _table_caches.get(table)
+    if cache is not None and cache.loaded and record and record.get('id'):
+        cache.upsert(record, as_of=as_of)
+
+
+def _write_through_removed(table, record_id):
+    cache = _table_caches.get(table)
+    if cache is not None and cache.loaded:
+        cache.remove(record_id)
+
+
+def _unchanged_write(table, record, airtable_fields):
+    """Drop fields the record already holds, so saves that resubmit a whole
+    form only send what changed. Returns the fields still to write (empty =
+    skip the Airtable call). No cached record = write everything.
+
+    The cached record can be behind an edit made straight in Airtable (a
+    save may be reverting it), so before anything is dropped the record is
+    re-read from Airtable and diffed again; if that read fails, everything
+    is written.
+    """
+    if record is None:
+        return airtable_fields
+    changed = tablecache.changed_fields(record.get('fields', {}), airtable_fields)
+    if len(changed) == len(airtable_fields):
+        return changed
+    fetched_at = time.time()
+    try:
+        response = airtable_get(f"{get_airtable_url(table)}/{record['id']}", headers=HEADERS)
+        response.raise_for_status()
+        record = response.json()
+    except Exception as e:
+        print(f"[Hub API] {table} {record.get('id')}: re-read failed, writing every field: {e}")
+        return airtable_fields
+    _write_through(table, record, as_of=fetched_at)
+    changed = tablecache.changed_fields(record.get('fields', {}), airtable_fields)
+    skipped = sorted(set(airtable_fields) - set(changed))
+    if skipped:
+        print(f"[Hub API] {table} {record.get('id')}: unchanged, not sent: {skipped}")
+    return changed
+
+
+def _find_project(job_number):
+    """Cached Projects record for job_number, or None."""
+    return _cached_table('Projects').get_by_key(job_number)
+
+
+# ===== JOBS =====
+JOB_STATUSES = {
+    'active': ['Incoming', 'In Progress', 'On Hold'],
+    'completed': ['Completed'],
+    'all': ['Incoming', 'In Progress', 'On Hold', 'Completed', 'Archived'],
+}
+
+# Delta cursors overlap the previous fetch by this much, so a write that lands
+# while a fetch is in flight (or a little clock skew with Airtable) is never
+# missed. Re-sending a job the client already has is harmless.
+JOBS_CURSOR_OVERLAP_SECONDS = 5
+
+
+def _job_statuses(status_filter):
+    """Status list for a ?status= value; unknown values mean 'active'."""
+    return JOB_STATUSES.get(status_filter, JOB_STATUSES['active'])
+
+
+def _fetch_records(table, filter_formula=None):
+    """Fetch every record in table, optionally matching filter_formula (paginated)."""
+    url = get_airtable_url(table)
+    params = {'filterByFormula': filter_formula} if filter_formula else {}
+    records = []
+    offset = None
+
+    while True:
+        if offset:
+            params['offset'] = offset
+
+        response = airtable_get(url, headers=HEADERS, params=params)
+        response.raise_for_status()
+        data = response.json()
+        records.extend(data.get('records', []))
+
+        offset = data.get('offset')
+        if not offset:
+            break
+
+    return records
+
+
+def _airtable_time(ts):
+    """Unix timestamp -> ISO string Airtable formulas accept (UTC, whole seconds)."""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _new_jobs_cursor():
+    """Opaque delta cursor: base64 of the ISO time (minus overlap) the fetch started."""
+    iso = _airtable_time(time.time() - JOBS_CURSOR_OVERLAP_SECONDS)
+    return base64.urlsafe_b64encode(iso.encode()).decode().rstrip('=')
+
+
+def _parse_jobs_cursor(cursor):
+    """Decode a cursor from _new_jobs_cursor. Returns the ISO string or None."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        iso = base64.urlsafe_b64decode(padded.encode()).decode()
+        datetime.strptime(iso, '%Y-%m-%dT%H:%M:%S.000Z')
+        return iso
+    except Exception:
+        return None
+
+
+def _job_for_client(record, client_code):
+    """True if the Projects record's Job Number starts with client_code."""
+    return str(record.get('fields', {}).get('Job Number', '')).startswith(client_code)
+
+
+def _load_jobs(statuses, client_filter=None):
+    """Jobs in universal schema with one of statuses, optionally for one client."""
+    def wanted(record):
+        if record.get('fields', {}).get('Status') not in statuses:
+            return False
+        return not client_filter or _job_for_client(record, client_filter)
+
+    return [transform_project(r) for r in _cached_table('Projects').records(wanted)]
+
+
+@app.route('/api/jobs/all')
+@serve_stale
+def get_all_jobs():
+    """
+    Get jobs in universal schema format.
+    
+    Query params:
+        status: 'active' (default), 'completed', 'all'
+        client: filter by client code (e.g., 'SKY', 'TOW')
+
+    The X-Jobs-Cursor response header can be passed to /api/jobs/changes
+    to fetch only what changed since this call.
+    """
+    try:
+        # Parse query params — a client-scoped session only ever gets its own client
+        statuses = _job_statuses(request.args.get('status', 'active'))
+        client_filter = _request_scope() or request.args.get('client')
+        
+        cursor = _new_jobs_cursor()
+        response = jsonify(_load_jobs(statuses, client_filter))
+        response.headers['X-Jobs-Cursor'] = cursor
+        return response
     
     except Exception as e:
         print(f'[Hub API] Error fetching jobs: {e}')
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/jobs/changes')
+def get_job_changes():
+    """
+    Delta companion to /api/jobs/all — only jobs modified since a cursor.
+
+    Query params:
+        since: cursor from X-Jobs-Cursor or a previous /api/jobs/changes (required)
+        status, client: same meaning as /api/jobs/all
+
+    Answered from the Projects cache, which stamps each record when it sees
+    it change — Hub writes, the webhook and the cache's own top-ups from
+    Airtable — so edits made in Airtable or by Traffic show up too. Jobs that
+    changed but no longer match the status filter, and deleted jobs, come
+    back in `removed` so the client can drop them.
+
+    Returns: {'cursor': str, 'jobs': [universal schema], 'removed': [jobNumber]}
+    """
+    since = _parse_jobs_cursor(request.args.get('since', ''))
+    if not since:
+        return jsonify({'error': 'Valid since cursor required'}), 400
+
+    try:
+        statuses = _job_statuses(request.args.get('status', 'active'))
+        client_filter = _request_scope() or request.args.get('client')
+
+        since_ts = datetime.strptime(since, '%Y-%m-%dT%H:%M:%S.000Z').replace(tzinfo=timezone.utc).timestamp()
+
+        cursor = _new_jobs_cursor()
+        changed, deleted = _cached_table('Projects').changed_since(since_ts)
+        jobs, removed = [], []
+        # No status filter on changed — jobs that moved OUT of the filter are the point
+        for record in changed:
+            if client_filter and not _job_for_client(record, client_filter):
+                continue
+            job = transform_project(record)
+            if job['status'] in statuses:
+                jobs.append(job)
+            elif job['jobNumber']:
+                removed.append(job['jobNumber'])
+        for record in deleted:
+            if client_filter and not _job_for_client(record, client_filter):
+                continue
+            job_number = record.get('fields', {}).get('Job Number')
+            if job_number:
+                removed.append(job_number)
+
+        return jsonify({'cursor': cursor, 'jobs': jobs, 'removed': removed})
+
+    except Exception as e:
+        print(f'[Hub API] Error fetching job changes: {e}')
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/job/<job_number>')
+@serve_stale
 def get_job(job_number):
     """Get a single job by job number"""
+    if not _job_in_scope(job_number, _request_scope()):
+        return jsonify({'error': 'Job not found'}), 404
     try:
-        url = get_airtable_url('Projects')
-        params = {
-            'filterByFormula': f"{{Job Number}} = '{job_number}'",
-            'maxRecords': 1
-        }
-        
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        
-        records = response.json().get('records', [])
-        if not records:
+        record = _find_project(job_number)
+        if not record:
             return jsonify({'error': 'Job not found'}), 404
         
-        job = transform_project(records[0])
+        job = transform_project(record)
         
         # Fetch full client name from Clients table
-        client_links = records[0].get('fields', {}).get('Client', [])
+        client_links = record.get('fields', {}).get('Client', [])
         if client_links:
             client_record_id = client_links[0]
             try:
                 client_url = f"{get_airtable_url('Clients')}/{client_record_id}"
-                client_response = requests.get(client_url, headers=HEADERS)
+                client_response = airtable_get(client_url, headers=HEADERS)
                 if client_response.ok:
                     client_fields = client_response.json().get('fields', {})
                     job['clientName'] = client_fields.get('Clients', job['clientCode'])
@@ -1209,18 +1935,10 @@ def update_job(job_number):
         
         # Find the record
         url = get_airtable_url('Projects')
-        params = {
-            'filterByFormula': f"{{Job Number}} = '{job_number}'",
-            'maxRecords': 1
-        }
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        
-        records = response.json().get('records', [])
-        if not records:
+        record = _find_project(job_number)
+        if not record:
             return jsonify({'error': 'Job not found'}), 404
         
-        record = records[0]
         record_id = record.get('id')
         
         # Extract message for Updates table (separate from Projects fields)
@@ -1262,9 +1980,13 @@ def update_job(job_number):
             'update_record': None
         }
         
-        # 1. Update Projects table
+        # 1. Update Projects table — only fields that differ from the cached record
+        requested = list(airtable_fields.keys())
+        airtable_fields = _unchanged_write('Projects', record, airtable_fields)
+        if requested and not airtable_fields:
+            results['project_update'] = {'success': True, 'skipped': True, 'updated': []}
         if airtable_fields:
-            update_response = requests.patch(
+            update_response = airtable_patch(
                 f"{url}/{record_id}",
                 headers=HEADERS,
                 json={'fields': airtable_fields}
@@ -1272,6 +1994,10 @@ def update_job(job_number):
             update_response.raise_for_status()
             results['project_update'] = {'success': True, 'updated': list(airtable_fields.keys())}
             print(f'[Hub API] Updated project {job_number}: {list(airtable_fields.keys())}')
+            _write_through('Projects', update_response.json())
+            updated_job = transform_project(update_response.json())
+            publish_event('job', action='updated', jobNumber=job_number,
+                          clientCode=extract_client_code(job_number), job=updated_job)
         
         # 2. Create Updates record (if message provided)
         if message:
@@ -1286,7 +2012,7 @@ def update_job(job_number):
             if update_due:
                 update_fields['Update Due'] = update_due
             
-            updates_response = requests.post(
+            updates_response = airtable_post(
                 updates_url,
                 headers=HEADERS,
                 json={'fields': update_fields}
@@ -1294,10 +2020,15 @@ def update_job(job_number):
             updates_response.raise_for_status()
             
             new_record = updates_response.json()
+            _write_through('Updates', new_record)
             results['update_record'] = {'success': True, 'record_id': new_record.get('id')}
             print(f'[Hub API] Created update record for {job_number}: {new_record.get("id")}')
+            publish_event('update', action='created', id=new_record.get('id'), text=message,
+                          jobNumber=job_number, clientCode=extract_client_code(job_number))
         
-        return jsonify({'success': True, 'results': results})
+        # Nothing differed and no message: nothing was written
+        skipped = not airtable_fields and not message
+        return jsonify({'success': True, 'skipped': skipped, 'results': results})
     
     except Exception as e:
         print(f'[Hub API] Error updating job: {e}')
@@ -1312,25 +2043,22 @@ def update_job_story(job_number):
         story = data.get('story', '').strip()
 
         url = get_airtable_url('Projects')
-        params = {
-            'filterByFormula': f"{{Job Number}} = '{job_number}'",
-            'maxRecords': 1
-        }
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-
-        records = response.json().get('records', [])
-        if not records:
+        record = _find_project(job_number)
+        if not record:
             return jsonify({'error': 'Job not found'}), 404
 
-        record_id = records[0].get('id')
+        record_id = record.get('id')
 
-        patch_response = requests.patch(
+        patch_response = airtable_patch(
             f"{url}/{record_id}",
             headers=HEADERS,
             json={'fields': {'The Story': story}}
         )
         patch_response.raise_for_status()
+        _write_through('Projects', patch_response.json())
+        publish_event('job', action='updated', jobNumber=job_number,
+                      clientCode=extract_client_code(job_number),
+                      job=transform_project(patch_response.json()))
 
         return jsonify({'success': True, 'story': story})
 
@@ -1339,98 +2067,406 @@ def update_job_story(job_number):
         return jsonify({'error': str(e)}), 500
 
 
-# ===== TRACKER =====
-@app.route('/api/tracker/clients')
-def get_tracker_clients():
-    """Get clients with tracker/budget info, including rollover and chart data.
+# ===== SEARCH =====
+# Server-side index over Projects and Updates, so the browser doesn't need
+# every job's text just to search it. Fed from the Projects and Updates
+# caches: built from them on first use, then patched with each change in
+# their journals (Hub writes, cache top-ups, the webhook — including records
+# deleted in Airtable). Rebuilt only if a journal no longer reaches back.
+SEARCH_FIELD_WEIGHTS = {
+    'jobNumber': 5.0,
+    'jobName': 3.0,
+    'description': 1.5,
+    'theStory': 1.0,
+    'update': 1.0,
+    'updateText': 1.0,
+}
+_search_index = search.SearchIndex(SEARCH_FIELD_WEIGHTS)
+_search_refresh_lock = threading.Lock()  # one refresh at a time; searches use the index's own lock
+_search_state = {'versions': None}  # (Projects, Updates) cache versions the index reflects
+
+
+def _index_job(index, job):
+    """Upsert a universal-schema job into the search index."""
+    index.upsert(f"job:{job['jobNumber']}", {
+        'jobNumber': job['jobNumber'],
+        'jobName': job['jobName'],
+        'description': job['description'],
+        'theStory': job['theStory'],
+        'update': job['update'],
+    }, {
+        'type': 'job',
+        'jobNumber': job['jobNumber'],
+        'jobName': job['jobName'],
+        'clientCode': job['clientCode'],
+        'status': job['status'],
+        'stage': job['stage'],
+    })
 
-    Phase 2: returns `rolloverObject` and `chartMonths` additively.
-    Existing fields (rollover, rolloverUseIn, committed, yearEnd, currentQuarter)
-    are preserved unchanged so the frontend's old display path still works.
+
+def _index_update(index, record_id, job_number, text):
+    """Upsert one Updates record into the search index."""
+    index.upsert(f'update:{record_id}', {'updateText': text}, {
+        'type': 'update',
+        'id': record_id,
+        'jobNumber': job_number,
+        'clientCode': extract_client_code(job_number),
+        'update': text,
+    })
+
+
+def _index_update_record(index, record):
+    _index_update(index, record.get('id'), _update_job_number(record), record.get('fields', {}).get('Update', ''))
+
+
+def _index_project_change(index, old, new):
+    """Apply one Projects cache change (old / new record, None if absent)."""
+    old_number = old.get('fields', {}).get('Job Number', '') if old else ''
+    if old_number and (new is None or new.get('fields', {}).get('Job Number', '') != old_number):
+        index.remove(f'job:{old_number}')  # deleted or renumbered
+    if new is not None:
+        _index_job(index, transform_project(new))
+
+
+def _index_update_change(index, old, new):
+    """Apply one Updates cache change (old / new record, None if absent)."""
+    if new is None:
+        index.remove(f"update:{old.get('id')}")
+    else:
+        _index_update_record(index, new)
+
+
+def _refresh_search_index():
+    """Bring the index up to date with the Projects and Updates caches (which
+    load or top themselves up first, as due). A failed first load raises."""
+    global _search_index
+    projects, updates = _cached_table('Projects'), _cached_table('Updates')
+    with _search_refresh_lock:
+        project_changes = update_changes = None
+        if _search_state['versions'] is not None:
+            projects_version, project_changes = projects.changes_after(_search_state['versions'][0])
+            updates_version, update_changes = updates.changes_after(_search_state['versions'][1])
+        if project_changes is None or update_changes is None:
+            # Versions read before the records: a racing write is re-applied next time
+            projects_version, updates_version = projects.version, updates.version
+            index = search.SearchIndex(SEARCH_FIELD_WEIGHTS)
+            for record in projects.records():
+                _index_job(index, transform_project(record))
+            for record in updates.records():
+                _index_update_record(index, record)
+            _search_index = index  # swap, so searches never see a half-built index
+            print(f'[Search] Built index: {len(index)} docs')
+        else:
+            for old, new in project_changes:
+                _index_project_change(_search_index, old, new)
+            for old, new in update_changes:
+                _index_update_change(_search_index, old, new)
+        _search_state['versions'] = (projects_version, updates_version)
+
+
+@app.route('/api/search')
+def search_hub():
     """
-    def parse_currency(val):
-        if isinstance(val, (int, float)):
-            return val
-        if isinstance(val, str):
-            return int(val.replace('$', '').replace(',', '') or 0)
-        return 0
+    Ranked, prefix-matching search over jobs and their Updates.
+
+    Query params:
+        q: search text (required). Every word must match; words match by prefix.
+        client: only results for this client code
+        limit: max results (default 20, max 100)
+
+    Returns a list, best first, of
+        {'type': 'job', 'score', 'jobNumber', 'jobName', 'clientCode', 'status', 'stage'}
+        {'type': 'update', 'score', 'id', 'jobNumber', 'clientCode', 'update'}
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Search text required'}), 400
+    client_filter = _request_scope() or request.args.get('client')
+    try:
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+    except ValueError:
+        limit = 20
 
     try:
-        # ===== Fetch Clients =====
-        clients_url = get_airtable_url('Clients')
-        clients_response = requests.get(clients_url, headers=HEADERS)
-        clients_response.raise_for_status()
-        clients_records = clients_response.json().get('records', [])
-
-        # ===== Fetch Budget History =====
-        # Defensive: if table is missing or fetch fails, fall through to
-        # Clients.Monthly Committed for everything.
-        budget_history = []
+        _refresh_search_index()
+    except Exception as e:
+        print(f'[Hub API] Error building search index: {e}')
+        return jsonify({'error': str(e)}), 500
+
+    predicate = (lambda p: p['clientCode'] == client_filter) if client_filter else None
+    return jsonify(_search_index.search(query, limit=limit, predicate=predicate))
+
+
+# ===== TRACKER =====
+# Access levels that can't see tracker data at all (app.js hides the view too).
+TRACKER_DENIED_ACCESS = ('Client WIP',)
+
+
+def _tracker_access_denied(user):
+    return bool(user) and user['access_level'] in TRACKER_DENIED_ACCESS
+
+
+# A closed quarter's rollover only changes if its Tracker / Budget History rows
+# are back-edited, so results are memoised (memostore.py) against a fingerprint
+# of those rows (tracker.rollover_fingerprint) and recomputed only when it
+# changes. Kept in HUB_STATE_DB if set, so restarts start warm.
+ROLLOVER_MEMO_MAX_ENTRIES = 5000
+if HUB_STATE_DB:
+    _rollover_memo = memostore.SqliteMemoStore(
+        HUB_STATE_DB, table='rollover_memo', max_entries=ROLLOVER_MEMO_MAX_ENTRIES)
+else:
+    _rollover_memo = memostore.MemoStore(max_entries=ROLLOVER_MEMO_MAX_ENTRIES)
+
+
+# Tracker entries for the rollover math, as one columnar frame
+# (trackerframe.py). Built once from the Tracker cache, then patched with the
+# records each cache change touched (tracker writes, top-ups, the webhook),
+# so a spend edit updates one client's running month totals instead of
+# rebuilding. Rebuilt only if the cache's journal no longer reaches back.
+_tracker_frame_state = {'version': None, 'frame': trackerframe.TrackerFrame()}
+_tracker_frame_lock = threading.Lock()
+
+
+def _tracker_frame():
+    """TrackerFrame of every cached Tracker record (shared; don't append to it)."""
+    cache = _cached_table('Tracker')
+    with _tracker_frame_lock:
+        changes = None
+        if _tracker_frame_state['version'] is not None:
+            version, changes = cache.changes_after(_tracker_frame_state['version'])
+        if changes is None:
+            version = cache.version  # read before the records: a racing write is re-applied next time
+            _tracker_frame_state['frame'] = trackerframe.TrackerFrame.from_records(cache.records())
+        else:
+            frame = _tracker_frame_state['frame']
+            for old, new in changes:
+                if new is not None:
+                    frame.upsert_record(new)
+                else:
+                    frame.remove_record(old.get('id'))
+        _tracker_frame_state['version'] = version
+        return _tracker_frame_state['frame']
+
+
+def _closed_rollover_keys(code, today, year_end_month, budget_history, clients_fallback, tracker_entries,
+                          n_quarters=3):
+    """(memo key, fingerprint) for each of the n_quarters closed quarters
+    before today, oldest first."""
+    historic = reversed(tracker.get_historic_quarter_dates(year_end_month, today, n_quarters))
+    return [(f'{code}|{quarter_first.isoformat()}',
+             tracker.rollover_fingerprint(code, quarter_first, year_end_month,
+                                          budget_history, clients_fallback, tracker_entries))
+            for quarter_first in historic]
+
+
+def _memoised_rollovers(code, today, year_end_month, budget_history, clients_fallback, tracker_entries, keys):
+    """Closed quarters from the memo plus the live quarter, oldest first — or
+    None if any closed quarter's inputs have changed since it was stored."""
+    closed = [_rollover_memo.get(key, fingerprint) for key, fingerprint in keys]
+    if any(result is None for result in closed):
+        return None
+    live = tracker.get_rollover(code, today, year_end_month,
+                                budget_history, clients_fallback, tracker_entries)
+    return closed + [live]
+
+
+# Optional process pool for the rollovers behind /api/tracker/clients (pure
+# CPU once inputs are loaded). TRACKER_WORKERS=0 (default) computes
+# in-process, as does a single-CPU host, where workers only add pickling and
+# IPC. Clients whose closed quarters are all in the rollover memo never reach
+# the pool; each worker gets a shard of the rest with only their Tracker rows
+# (a TrackerFrame subset) and Budget History rows, so the data sent across
+# all shards is one frame's worth, not a copy per task. Results come back to
+# be memoised here. Workers are spawned (not forked from a threaded server)
+# and run only tracker.compute_client_rollovers; each pays the import cost once.
+TRACKER_WORKERS = int(os.environ.get('TRACKER_WORKERS', '0')) if (os.cpu_count() or 1) > 1 else 0
+TRACKER_POOL_MIN_CLIENTS = 8  # fewer memo misses than this aren't worth the round trip
+_tracker_pool = None
+_tracker_pool_lock = threading.Lock()
+
+
+def _tracker_process_pool():
+    global _tracker_pool
+    with _tracker_pool_lock:
+        if _tracker_pool is None:
+            _tracker_pool = ProcessPoolExecutor(max_workers=TRACKER_WORKERS,
+                                                mp_context=multiprocessing.get_context('spawn'))
+        return _tracker_pool
+
+
+def _tracker_rollovers_parallel(clients, today, budget_history, clients_fallback, frame):
+    """tracker.compute_client_rollovers sharded across the process pool, merged in client order."""
+    size = math.ceil(len(clients) / TRACKER_WORKERS)
+    futures = []
+    for start in range(0, len(clients), size):
+        shard = clients[start:start + size]
+        codes = {code for code, _ in shard}
+        futures.append(_tracker_process_pool().submit(
+            tracker.compute_client_rollovers, shard, today,
+            [row for row in budget_history if row.get('Client') in codes],
+            {code: amount for code, amount in clients_fallback.items() if code in codes},
+            frame.subset(codes),
+        ))
+    return [rollovers for future in futures for rollovers in future.result()]
+
+
+def _tracker_client_fields(clients, today, budget_history, clients_fallback, tracker_entries):
+    """tracker.client_fields for each (code, year_end_month) in clients, in order
+    ({'error': message} for a client whose math failed).
+
+    Closed quarters come through the rollover memo. Clients with a memo miss
+    are walked afresh — on the process pool when TRACKER_WORKERS is set and
+    there are enough of them (a pool failure falls back to in-process) — and
+    their closed quarters stored.
+    """
+    out = [None] * len(clients)
+    misses = []  # (position, memo keys) of clients to walk
+    for i, (code, year_end_month) in enumerate(clients):
         try:
-            bh_url = get_airtable_url('Budget History')
-            bh_response = requests.get(bh_url, headers=HEADERS)
-            bh_response.raise_for_status()
-            for record in bh_response.json().get('records', []):
-                fields = record.get('fields', {})
-                budget_history.append({
-                    'Client': fields.get('Client', ''),
-                    'Effective From': fields.get('Effective From', ''),
-                    'Monthly Committed': parse_currency(fields.get('Monthly Committed', 0)),
-                })
+            keys = _closed_rollover_keys(code, today, year_end_month,
+                                         budget_history, clients_fallback, tracker_entries)
+            rollovers = _memoised_rollovers(code, today, year_end_month,
+                                            budget_history, clients_fallback, tracker_entries, keys)
+            if rollovers is None:
+                misses.append((i, keys))
+            else:
+                out[i] = tracker.client_fields(code, today, year_end_month,
+                                               budget_history, clients_fallback, rollovers)
         except Exception as e:
-            print(f'[Hub API] Budget History fetch failed (falling back to Clients): {e}')
+            out[i] = {'error': str(e)}
 
-        # ===== Fetch all Tracker entries (paginated) =====
-        # Used for in-quarter variance computation across all retainer clients.
-        tracker_entries = []
+    to_walk = [clients[i] for i, _ in misses]
+    walked = None
+    if TRACKER_WORKERS > 0 and len(to_walk) >= TRACKER_POOL_MIN_CLIENTS:
         try:
-            tracker_url = get_airtable_url('Tracker')
-            offset = None
-            while True:
-                params = {}
-                if offset:
-                    params['offset'] = offset
-                tr_response = requests.get(tracker_url, headers=HEADERS, params=params)
-                tr_response.raise_for_status()
-                data = tr_response.json()
-                for record in data.get('records', []):
-                    fields = record.get('fields', {})
-                    client_code = fields.get('Client Code', '')
-                    if isinstance(client_code, list):
-                        client_code = client_code[0] if client_code else ''
-                    spend = fields.get('Spend', 0)
-                    if isinstance(spend, str):
-                        spend = float(spend.replace('$', '').replace(',', '') or 0)
-                    tracker_entries.append({
-                        'client': client_code,
-                        'month': fields.get('Month', ''),
-                        'spendType': fields.get('Spend type', 'Project budget'),
-                        'ballpark': bool(fields.get('Ballpark', False)),
-                        'spend': spend,
-                    })
-                offset = data.get('offset')
-                if not offset:
-                    break
+            walked = _tracker_rollovers_parallel(to_walk, today, budget_history, clients_fallback,
+                                                 tracker_entries)
         except Exception as e:
-            print(f'[Hub API] Tracker fetch failed (rollover/chart will be empty): {e}')
+            print(f'[Hub API] Tracker process pool failed, computing in-process: {e}')
+    if walked is None:
+        walked = tracker.compute_client_rollovers(to_walk, today, budget_history, clients_fallback,
+                                                  tracker_entries)
+
+    for (i, keys), (code, year_end_month), rollovers in zip(misses, to_walk, walked):
+        if isinstance(rollovers, dict):
+            out[i] = rollovers  # {'error': ...}
+            continue
+        try:
+            for (key, fingerprint), result in zip(keys, rollovers):
+                _rollover_memo.put(key, fingerprint, result)
+            out[i] = tracker.client_fields(code, today, year_end_month,
+                                           budget_history, clients_fallback, rollovers)
+        except Exception as e:
+            out[i] = {'error': str(e)}
+    return out
 
-        # ===== Build clients_fallback dict =====
-        # Used by tracker.get_committed when no Budget History entry applies.
-        clients_fallback = {}
-        for record in clients_records:
+
+def _parse_currency(val):
+    if isinstance(val, (int, float)):
+        return val
+    if isinstance(val, str):
+        return int(val.replace('$', '').replace(',', '') or 0)
+    return 0
+
+
+def _fetch_tracker_clients(scope=None):
+    """Raw Clients records — only scope's (a client code) if given."""
+    clients_url = get_airtable_url('Clients')
+    clients_params = {'filterByFormula': f"{{Client code}} = '{scope}'"} if scope else {}
+    clients_response = airtable_get(clients_url, headers=HEADERS, params=clients_params)
+    clients_response.raise_for_status()
+    return clients_response.json().get('records', [])
+
+
+def _load_tracker_inputs(scope=None):
+    """Everything the rollover math reads, limited to scope (a client code) if given.
+
+    Returns (clients_records, budget_history, clients_fallback, tracker_entries):
+    raw Clients records, Budget History rows in tracker.get_committed's shape,
+    {client code: Monthly Committed} and the shared TrackerFrame.
+    """
+    clients_records = _fetch_tracker_clients(scope)
+
+    # ===== Fetch Budget History =====
+    # Defensive: if table is missing or fetch fails, fall through to
+    # Clients.Monthly Committed for everything.
+    budget_history = []
+    try:
+        bh_url = get_airtable_url('Budget History')
+        bh_params = {'filterByFormula': f"{{Client}} = '{scope}'"} if scope else {}
+        bh_response = airtable_get(bh_url, headers=HEADERS, params=bh_params)
+        bh_response.raise_for_status()
+        for record in bh_response.json().get('records', []):
             fields = record.get('fields', {})
-            code = fields.get('Client code', '')
-            committed = parse_currency(fields.get('Monthly Committed', 0))
-            if code:
-                clients_fallback[code] = committed
+            if scope and fields.get('Client', '') != scope:
+                continue
+            budget_history.append({
+                'Client': fields.get('Client', ''),
+                'Effective From': fields.get('Effective From', ''),
+                'Monthly Committed': _parse_currency(fields.get('Monthly Committed', 0)),
+            })
+    except Exception as e:
+        print(f'[Hub API] Budget History fetch failed (falling back to Clients): {e}')
+
+    # ===== All Tracker entries (from the record cache) =====
+    # Used for in-quarter variance computation across all retainer clients.
+    # A columnar frame with a per-client index, so each client's math only
+    # reads its own rows.
+    try:
+        tracker_entries = _tracker_frame()
+    except Exception as e:
+        print(f'[Hub API] Tracker fetch failed (rollover/chart will be empty): {e}')
+        tracker_entries = trackerframe.TrackerFrame()
+
+    # ===== Build clients_fallback dict =====
+    # Used by tracker.get_committed when no Budget History entry applies.
+    clients_fallback = {}
+    for record in clients_records:
+        fields = record.get('fields', {})
+        code = fields.get('Client code', '')
+        committed = _parse_currency(fields.get('Monthly Committed', 0))
+        if code:
+            clients_fallback[code] = committed
+
+    return clients_records, budget_history, clients_fallback, tracker_entries
+
+
+@app.route('/api/tracker/clients')
+@serve_stale
+def get_tracker_clients():
+    """Get clients with tracker/budget info, including rollover and chart data.
+
+    Phase 2: returns `rolloverObject` and `chartMonths` additively.
+    Existing fields (rollover, rolloverUseIn, committed, yearEnd, currentQuarter)
+    are preserved unchanged so the frontend's old display path still works.
+
+    ?client=CODE (and a client-scoped session, which always gets its own
+    client) computes one client: only that client's Clients row and Budget
+    History are fetched, and only its Tracker rows are read.
+
+    ?view=list is the lightweight list for the client dropdown: the existing
+    fields only, from the Clients table alone (no rollover / chart data).
+    """
+    user = _session_user()
+    if _tracker_access_denied(user):
+        return jsonify({'error': 'No tracker access'}), 403
+    scope = _user_client_scope(user) or request.args.get('client')
+    list_only = request.args.get('view') == 'list'
+
+    try:
+        if list_only:
+            clients_records = _fetch_tracker_clients(scope)
+        else:
+            clients_records, budget_history, clients_fallback, tracker_entries = _load_tracker_inputs(scope)
 
         # ===== Build response =====
         today = date.today()
         clients = []
+        pending = []  # (client_data, code, year_end_month) still to get rollover / chart fields
         for record in clients_records:
             fields = record.get('fields', {})
 
-            monthly = parse_currency(fields.get('Monthly Committed', 0))
+            monthly = _parse_currency(fields.get('Monthly Committed', 0))
             if monthly <= 0:
                 continue  # skip non-retainer clients
 
@@ -1455,46 +2491,21 @@ def get_tracker_clients():
                 'currentQuarter': fields.get('Current Quarter', ''),
             }
 
-            # New fields — additive. If tracker.py errors for any reason,
-            # the client gets the existing fields and frontend uses fallback.
-            if year_end_month and code:
-                try:
-                    client_data['rolloverObject'] = tracker.get_rollover(
-                        code, today, year_end_month,
-                        budget_history, clients_fallback, tracker_entries,
-                    )
-                    client_data['chartMonths'] = tracker.get_chart_months(
-                        year_end_month, today, code,
-                        budget_history, clients_fallback,
-                    )
-                    client_data['committedByMonth'] = tracker.get_committed_by_month(
-                        code, today, budget_history, clients_fallback,
-                    )
-
-                    # rolloverByQuarter: keyed by JAN-MAR style quarter key.
-                    # Includes current quarter (live) + 3 historic (is_closed=True).
-                    # Frontend looks up the quarter being viewed and renders
-                    # appropriate template based on the isClosed flag.
-                    rollover_by_quarter = {}
-                    current_obj = client_data['rolloverObject']
-                    if current_obj.get('quarterKey'):
-                        rollover_by_quarter[current_obj['quarterKey']] = current_obj
-                    for historic_today in tracker.get_historic_quarter_dates(
-                        year_end_month, today, n_quarters=3,
-                    ):
-                        historic_obj = tracker.get_rollover(
-                            code, historic_today, year_end_month,
-                            budget_history, clients_fallback, tracker_entries,
-                            is_closed=True,
-                        )
-                        if historic_obj.get('quarterKey'):
-                            rollover_by_quarter[historic_obj['quarterKey']] = historic_obj
-                    client_data['rolloverByQuarter'] = rollover_by_quarter
-                except Exception as e:
-                    print(f'[Hub API] tracker.py error for {code}: {e}')
-
+            if year_end_month and code and not list_only:
+                pending.append((client_data, code, year_end_month))
             clients.append(client_data)
 
+        # New fields — additive. If tracker.py errors for any reason,
+        # the client gets the existing fields and frontend uses fallback.
+        if pending:
+            derived = _tracker_client_fields([(code, year_end_month) for _, code, year_end_month in pending],
+                                             today, budget_history, clients_fallback, tracker_entries)
+            for (client_data, code, _), fields in zip(pending, derived):
+                if 'error' in fields:
+                    print(f"[Hub API] tracker.py error for {code}: {fields['error']}")
+                else:
+                    client_data.update(fields)
+
         clients.sort(key=lambda x: x['name'])
         return jsonify(clients)
 
@@ -1503,99 +2514,299 @@ def get_tracker_clients():
         return jsonify({'error': str(e)}), 500
 
 
+# Whole retainer book for leadership. Cached per day and Tracker cache
+# version (every tracker write, ours or via the webhook, moves it); Clients
+# and Budget History edits show within PORTFOLIO_CACHE_SECONDS.
+PORTFOLIO_CACHE_SECONDS = 5 * 60
+_portfolio_cache = {'key': None, 'at': 0.0, 'body': None}
+_portfolio_lock = threading.Lock()
+
+
+@app.route('/api/tracker/portfolio')
+@serve_stale
+def get_tracker_portfolio():
+    """Committed / spent / variance and rollover across every retainer client.
+
+    Agency-wide, so Full access only. Returns
+        {'asOf': 'YYYY-MM-DD',
+         'clients': [{'code', 'name', 'previousQuarter', 'currentQuarter',
+                      'yearToDate', 'rollover'}],
+         'totals': {'previousQuarter', 'currentQuarter', 'yearToDate', 'rollover'}}
+    (shapes: tracker.get_client_summary / tracker.get_portfolio).
+    """
+    user = _session_user()
+    if _tracker_access_denied(user) or _user_client_scope(user):
+        return jsonify({'error': 'Portfolio is agency-wide (Full access only)'}), 403
+
+    try:
+        today = date.today()
+        with _portfolio_lock:
+            key = (today.isoformat(), _cached_table('Tracker').version)
+            if (_portfolio_cache['key'] == key
+                    and time.time() - _portfolio_cache['at'] <= PORTFOLIO_CACHE_SECONDS):
+                return jsonify(_portfolio_cache['body'])
+
+            clients_records, budget_history, clients_fallback, tracker_entries = _load_tracker_inputs()
+            clients = []
+            for record in clients_records:
+                fields = record.get('fields', {})
+                code = fields.get('Client code', '')
+                year_end_month = parse_year_end_month(fields.get('Year end', ''))
+                if _parse_currency(fields.get('Monthly Committed', 0)) <= 0 or not (code and year_end_month):
+                    continue  # non-retainer, or no fiscal calendar to summarise by
+                clients.append({'code': code, 'name': fields.get('Clients', ''), 'yearEnd': year_end_month})
+            clients.sort(key=lambda x: x['name'])
+
+            body = {'asOf': today.isoformat(),
+                    **tracker.get_portfolio(clients, today, budget_history, clients_fallback, tracker_entries)}
+            _portfolio_cache.update(key=key, at=time.time(), body=body)
+        return jsonify(body)
+
+    except Exception as e:
+        print(f'[Hub API] Error building tracker portfolio: {e}')
+        return jsonify({'error': str(e)}), 500
+
+
+# One client's Clients / Budget History inputs to the tracker math, for the
+# per-client endpoints below. Refetched after CLIENT_INPUTS_CACHE_SECONDS, so
+# Clients / Budget History edits show within that; Tracker rows come from the
+# shared frame, which is always current. Only codes found in Clients are
+# cached, and at most CLIENT_CACHE_ENTRIES of them (oldest dropped), so
+# arbitrary ?client= values can't grow the caches.
+CLIENT_INPUTS_CACHE_SECONDS = 5 * 60
+CLIENT_CACHE_ENTRIES = 200
+_client_inputs_cache = resilience.StaleCache(CLIENT_CACHE_ENTRIES)  # client code -> inputs
+
+
+def _client_tracker_inputs(client_code):
+    """(year_end_month, budget_history, clients_fallback, fetched_at) for
+    client_code (cached), or None if there's no such client. year_end_month
+    is None if the client has no year end."""
+    cached = _client_inputs_cache.get(client_code)
+    if cached and cached[1] <= CLIENT_INPUTS_CACHE_SECONDS:
+        return cached[0]
+
+    clients_records, budget_history, clients_fallback, _ = _load_tracker_inputs(client_code)
+    if not clients_records:
+        return None
+    fields = clients_records[0].get('fields', {})
+    inputs = (parse_year_end_month(fields.get('Year end', '')), budget_history, clients_fallback, time.time())
+    _client_inputs_cache.put(client_code, inputs)
+    return inputs
+
+
+# Per-client cumulative committed / spend (tracker.build_range_index), so any
+# from..to window is two subtractions. Rebuilt when the day, the Tracker cache
+# version or the client's inputs move. Keyed like _client_inputs_cache.
+_range_index_cache = resilience.StaleCache(CLIENT_CACHE_ENTRIES)  # client code -> (key, index)
+
+
+def _range_index(client_code, inputs):
+    """build_range_index for client_code (cached), from its _client_tracker_inputs
+    (which must have a year end)."""
+    year_end_month, budget_history, clients_fallback, fetched_at = inputs
+    today = date.today()
+    key = (today.isoformat(), _cached_table('Tracker').version, fetched_at)
+    cached = _range_index_cache.get(client_code)
+    if cached and cached[0][0] == key:
+        return cached[0][1]
+
+    index = tracker.build_range_index(client_code, today, year_end_month,
+                                      budget_history, clients_fallback, _tracker_frame())
+    _range_index_cache.put(client_code, (key, index))
+    return index
+
+
+@app.route('/api/tracker/range')
+@serve_stale
+def get_tracker_range():
+    """Committed / spent / variance for a client between two months (YYYY-MM, inclusive).
+
+    Both months must fall in the tracker year (spendFrom..spendTo): Tracker
+    months carry no year, so spend outside it can't be placed and the window
+    is refused (400) rather than counting committed against no spend.
+    """
+    user = _session_user()
+    if _tracker_access_denied(user):
+        return jsonify({'error': 'No tracker access'}), 403
+    client_code = _user_client_scope(user) or request.args.get('client')
+    from_month = request.args.get('from')
+    to_month = request.args.get('to')
+    if not client_code:
+        return jsonify({'error': 'Client code required'}), 400
+    if not (from_month and to_month):
+        return jsonify({'error': 'from and to required (YYYY-MM)'}), 400
+
+    try:
+        inputs = _client_tracker_inputs(client_code)
+        if inputs is None:
+            return jsonify({'error': f'Client {client_code} not found'}), 404
+        if not inputs[0]:
+            return jsonify({'error': f'No year end for client {client_code}'}), 400
+        index = _range_index(client_code, inputs)
+        try:
+            totals = tracker.range_totals(index, from_month, to_month)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify({'client': client_code, 'spendFrom': index['spendFrom'], 'spendTo': index['end'],
+                        **totals})
+
+    except Exception as e:
+        print(f'[Hub API] Error fetching tracker range: {e}')
+        return jsonify({'error': str(e)}), 500
+
+
+SIMULATE_MAX_SCENARIOS = 50
+SIMULATE_MAX_QUARTERS = tracker.SIMULATE_MAX_QUARTERS
+
+
+def _finite_spend(spend):
+    """True if a what-if spend is a number or money text ('$1,500'), and not inf / nan."""
+    if spend is None:
+        return True
+    if isinstance(spend, bool) or not isinstance(spend, (int, float, str)):
+        return False
+    try:
+        return math.isfinite(trackerframe.spend_value(spend))
+    except (ValueError, OverflowError):
+        return False
+
+
+@app.route('/api/tracker/simulate', methods=['POST'])
+def simulate_tracker():
+    """Projected rollover / banking / chipped for a client under what-if spend.
+
+    Body: {'client', 'quarters' (default 2), 'scenarios': [{'name', 'entries':
+    [{'month', 'spend', 'spendType'}]}]} — see tracker.simulate_rollovers. The
+    response carries the no-change baseline alongside each scenario.
+    """
+    user = _session_user()
+    if _tracker_access_denied(user):
+        return jsonify({'error': 'No tracker access'}), 403
+    data = request.get_json(silent=True) or {}
+    client_code = _user_client_scope(user) or data.get('client')
+    scenarios = data.get('scenarios')
+    if not client_code:
+        return jsonify({'error': 'Client code required'}), 400
+    if not isinstance(scenarios, list) or not scenarios:
+        return jsonify({'error': 'scenarios must be a non-empty list'}), 400
+    if len(scenarios) > SIMULATE_MAX_SCENARIOS:
+        return jsonify({'error': f'At most {SIMULATE_MAX_SCENARIOS} scenarios'}), 400
+    try:
+        quarters = int(data.get('quarters', 2))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'quarters must be a number'}), 400
+    if not 1 <= quarters <= SIMULATE_MAX_QUARTERS:
+        return jsonify({'error': f'quarters must be 1-{SIMULATE_MAX_QUARTERS}'}), 400
+    entries = []
+    for scenario in scenarios:
+        scenario_entries = scenario.get('entries') if isinstance(scenario, dict) else None
+        if not isinstance(scenario_entries, list) or not all(isinstance(e, dict) for e in scenario_entries):
+            return jsonify({'error': 'Each scenario needs an entries list'}), 400
+        if not all(_finite_spend(e.get('spend', 0)) for e in scenario_entries):
+            return jsonify({'error': 'spend must be a finite number'}), 400
+        entries.append(scenario_entries)
+
+    try:
+        inputs = _client_tracker_inputs(client_code)
+        if inputs is None:
+            return jsonify({'error': f'Client {client_code} not found'}), 404
+        year_end_month, budget_history, clients_fallback, _ = inputs
+        if not year_end_month:
+            return jsonify({'error': f'No year end for client {client_code}'}), 400
+        today = date.today()
+        try:
+            baseline, *results = tracker.simulate_rollovers(
+                client_code, today, year_end_month, budget_history, clients_fallback,
+                _tracker_frame(), [[]] + entries, quarters,
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify({
+            'client': client_code,
+            'asOf': today.isoformat(),
+            'baseline': baseline,
+            'scenarios': [{'name': scenario.get('name', f'Scenario {i + 1}'), 'quarters': result}
+                          for i, (scenario, result) in enumerate(zip(scenarios, results))],
+        })
+
+    except Exception as e:
+        print(f'[Hub API] Error simulating tracker rollover: {e}')
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/tracker/data')
+@serve_stale
 def get_tracker_data():
-    """Get tracker spend data for a client"""
-    client_code = request.args.get('client')
+    """Get tracker spend data for a client (always the session's own client if scoped)
+
+    ?view=quarter returns the same rows grouped quarter -> job -> month over the
+    client's financial year (tracker.group_by_quarter), with subtotals.
+    """
+    user = _session_user()
+    if _tracker_access_denied(user):
+        return jsonify({'error': 'No tracker access'}), 403
+    client_code = _user_client_scope(user) or request.args.get('client')
     if not client_code:
         return jsonify({'error': 'Client code required'}), 400
     
     try:
-        url = get_airtable_url('Tracker')
-        params = {'filterByFormula': f"{{Client Code}} = '{client_code}'"}
-        
         all_records = []
-        offset = None
-        
-        while True:
-            if offset:
-                params['offset'] = offset
+        for record in _cached_table('Tracker').records():
+            fields = record.get('fields', {})
+            if tablecache.field_value(fields, 'Client Code') != client_code:
+                continue
             
-            response = requests.get(url, headers=HEADERS, params=params)
-            response.raise_for_status()
-            data = response.json()
+            # Handle lookup fields that may return as lists
+            job_number = tablecache.field_value(fields, 'Job Number')
+            project_name = tablecache.field_value(fields, 'Project Name')
+            owner = tablecache.field_value(fields, 'Owner')
             
-            for record in data.get('records', []):
-                fields = record.get('fields', {})
-                
-                # Handle lookup fields that may return as lists
-                job_number = fields.get('Job Number', '')
-                if isinstance(job_number, list):
-                    job_number = job_number[0] if job_number else ''
-                
-                project_name = fields.get('Project Name', '')
-                if isinstance(project_name, list):
-                    project_name = project_name[0] if project_name else ''
-                
-                owner = fields.get('Owner', '')
-                if isinstance(owner, list):
-                    owner = owner[0] if owner else ''
-                
-                spend = fields.get('Spend', 0)
-                if isinstance(spend, str):
-                    spend = float(spend.replace('$', '').replace(',', '') or 0)
-                
-                # Skip zero spend records
-                if spend == 0:
-                    continue
-                
-                all_records.append({
-                    'id': record.get('id'),
-                    'client': client_code,
-                    'jobNumber': job_number,
-                    'projectName': project_name,
-                    'owner': owner,
-                    'description': fields.get('Tracker notes', ''),
-                    'jobDescription': '',  # filled below from Projects.Description
-                    'spend': spend,
-                    'month': fields.get('Month', ''),
-                    'spendType': fields.get('Spend type', 'Project budget'),
-                    'ballpark': bool(fields.get('Ballpark', False)),
-                })
+            spend = fields.get('Spend', 0)
+            if isinstance(spend, str):
+                spend = float(spend.replace('$', '').replace(',', '') or 0)
+            
+            # Skip zero spend records
+            if spend == 0:
+                continue
             
-            offset = data.get('offset')
-            if not offset:
-                break
+            all_records.append({
+                'id': record.get('id'),
+                'client': client_code,
+                'jobNumber': job_number,
+                'projectName': project_name,
+                'owner': owner,
+                'description': fields.get('Tracker notes', ''),
+                'jobDescription': '',  # filled below from Projects.Description
+                'spend': spend,
+                'month': fields.get('Month', ''),
+                'spendType': fields.get('Spend type', 'Project budget'),
+                'ballpark': bool(fields.get('Ballpark', False)),
+            })
         
         # ===== Attach job-level Description (for grouped quarter-view parent rows) =====
         # Each Tracker row carries its own per-month 'Tracker notes' (-> description),
         # which the quarter view collapses by job. Picking one month's note as the
         # parent line is misleading, so the parent uses the job's canonical
         # Projects.Description instead. Blank stays blank (prompts a backfill).
-        job_numbers = sorted({r['jobNumber'] for r in all_records if r.get('jobNumber')})
-        if job_numbers:
-            desc_by_job = {}
-            projects_url = get_airtable_url('Projects')
-            # Chunk the OR() filter so a job-heavy client never blows the
-            # Airtable formula-length ceiling.
-            for i in range(0, len(job_numbers), 40):
-                chunk = job_numbers[i:i + 40]
-                clauses = ','.join(f"{{Job Number}} = '{jn}'" for jn in chunk)
-                formula = f'OR({clauses})' if len(chunk) > 1 else clauses
-                proj_resp = requests.get(
-                    projects_url,
-                    headers=HEADERS,
-                    params={'filterByFormula': formula,
-                            'fields[]': ['Job Number', 'Description']},
-                )
-                proj_resp.raise_for_status()
-                for prec in proj_resp.json().get('records', []):
-                    pf = prec.get('fields', {})
-                    jn = pf.get('Job Number', '')
-                    if jn:
-                        desc_by_job[jn] = pf.get('Description', '')
+        if all_records:
+            projects = _cached_table('Projects')
             for r in all_records:
-                r['jobDescription'] = desc_by_job.get(r['jobNumber'], '')
+                project = projects.get_by_key(r['jobNumber']) if r['jobNumber'] else None
+                r['jobDescription'] = project.get('fields', {}).get('Description', '') if project else ''
+        
+        if request.args.get('view') == 'quarter':
+            client = _get_client_record(client_code)
+            year_end_month = parse_year_end_month(client.get('fields', {}).get('Year end', '')) if client else None
+            if not year_end_month:
+                return jsonify({'error': f'No year end for client {client_code}'}), 400
+            today = date.today()
+            return jsonify({
+                'client': client_code,
+                'yearEnd': year_end_month,
+                'asOf': today.isoformat(),
+                **tracker.group_by_quarter(all_records, year_end_month, today),
+            })
         
         return jsonify(all_records)
     
@@ -1604,6 +2815,23 @@ def get_tracker_data():
         return jsonify({'error': str(e)}), 500
 
 
+def _tracker_event_fields(record):
+    """Compact event payload for a Tracker record returned by Airtable."""
+    fields = record.get('fields', {})
+    job_number = fields.get('Job Number', '')
+    if isinstance(job_number, list):
+        job_number = job_number[0] if job_number else ''
+    client_code = fields.get('Client Code', '')
+    if isinstance(client_code, list):
+        client_code = client_code[0] if client_code else ''
+    return {
+        'id': record.get('id'),
+        'jobNumber': job_number,
+        'clientCode': client_code or extract_client_code(job_number),
+        'month': fields.get('Month', ''),
+    }
+
+
 @app.route('/api/tracker/update', methods=['POST'])
 def update_tracker():
     """Update a tracker record, and optionally Stage on the linked Project"""
@@ -1632,36 +2860,44 @@ def update_tracker():
         if not airtable_fields:
             return jsonify({'error': 'No valid fields to update'}), 400
 
-        url = get_airtable_url('Tracker')
-        response = requests.patch(
-            f"{url}/{record_id}",
-            headers=HEADERS,
-            json={'fields': airtable_fields}
-        )
-        response.raise_for_status()
+        # Only send what differs from the cached record
+        airtable_fields = _unchanged_write('Tracker', _cached_table('Tracker').get(record_id), airtable_fields)
+        wrote = bool(airtable_fields)
+        if airtable_fields:
+            url = get_airtable_url('Tracker')
+            response = airtable_patch(
+                f"{url}/{record_id}",
+                headers=HEADERS,
+                json={'fields': airtable_fields}
+            )
+            response.raise_for_status()
+            _write_through('Tracker', response.json())
 
         # If stage provided, also patch the Projects record
         stage = data.get('stage')
         job_number = data.get('jobNumber')
         if stage and job_number:
             projects_url = get_airtable_url('Projects')
-            params = {
-                'filterByFormula': f"{{Job Number}} = '{job_number}'",
-                'maxRecords': 1
-            }
-            proj_response = requests.get(projects_url, headers=HEADERS, params=params)
-            proj_response.raise_for_status()
-            records = proj_response.json().get('records', [])
-            if records:
-                proj_id = records[0].get('id')
-                requests.patch(
+            project = _find_project(job_number)
+            if project and not _unchanged_write('Projects', project, {'Stage': stage}):
+                project = None  # already at that stage
+            if project:
+                wrote = True
+                proj_id = project.get('id')
+                stage_response = airtable_patch(
                     f"{projects_url}/{proj_id}",
                     headers=HEADERS,
                     json={'fields': {'Stage': stage}}
                 )
+                if stage_response.ok:
+                    _write_through('Projects', stage_response.json())
                 print(f'[Hub API] Updated Stage to {stage} for {job_number}')
 
-        return jsonify({'success': True})
+        if not wrote:
+            return jsonify({'success': True, 'skipped': True})
+        if airtable_fields:
+            publish_event('tracker', action='updated', **_tracker_event_fields(response.json()))
+        return jsonify({'success': True, 'skipped': False})
 
     except Exception as e:
         print(f'[Hub API] Error updating tracker: {e}')
@@ -1682,18 +2918,12 @@ def create_tracker():
 
         # Look up the Project record to get its ID
         projects_url = get_airtable_url('Projects')
-        params = {
-            'filterByFormula': f"{{Job Number}} = '{job_number}'",
-            'maxRecords': 1
-        }
-        proj_response = requests.get(projects_url, headers=HEADERS, params=params)
-        proj_response.raise_for_status()
-        records = proj_response.json().get('records', [])
+        project = _find_project(job_number)
         
-        if not records:
+        if not project:
             return jsonify({'error': f'Project not found: {job_number}'}), 404
         
-        project_record_id = records[0].get('id')
+        project_record_id = project.get('id')
         
         # Create the Tracker record
         tracker_url = get_airtable_url('Tracker')
@@ -1706,25 +2936,29 @@ def create_tracker():
             'Tracker notes': data.get('description', '')
         }
         
-        tracker_response = requests.post(
+        tracker_response = airtable_post(
             tracker_url,
             headers=HEADERS,
             json={'fields': tracker_fields}
         )
         tracker_response.raise_for_status()
+        _write_through('Tracker', tracker_response.json())
         
         print(f'[Hub API] Created Tracker record for {job_number}')
         
         # If stage provided, also patch the Projects record
         stage = data.get('stage')
         if stage:
-            requests.patch(
+            stage_response = airtable_patch(
                 f"{projects_url}/{project_record_id}",
                 headers=HEADERS,
                 json={'fields': {'Stage': stage}}
             )
+            if stage_response.ok:
+                _write_through('Projects', stage_response.json())
             print(f'[Hub API] Updated Stage to {stage} for {job_number}')
 
+        publish_event('tracker', action='created', **_tracker_event_fields(tracker_response.json()))
         return jsonify({'success': True})
 
     except Exception as e:
@@ -1735,20 +2969,18 @@ def create_tracker():
 # ===== JOB BAG =====
 
 @app.route('/api/job/<job_number>/updates', methods=['GET'])
+@serve_stale
 def get_job_updates(job_number):
     """Get all Updates records for a job, ordered by Created Time asc"""
+    if not _job_in_scope(job_number, _request_scope()):
+        return jsonify({'error': 'Job not found'}), 404
     try:
-        updates_url = get_airtable_url('Updates')
-        params = {
-            'filterByFormula': f"{{Job Number}} = '{job_number}'",
-            'sort[0][field]': 'Created Time',
-            'sort[0][direction]': 'asc'
-        }
-        response = requests.get(updates_url, headers=HEADERS, params=params)
-        response.raise_for_status()
+        records = _cached_table('Updates').records(
+            lambda r: tablecache.field_value(r.get('fields', {}), 'Job Number') == job_number)
+        records.sort(key=lambda r: r.get('fields', {}).get('Created Time', ''))
 
         updates = []
-        for record in response.json().get('records', []):
+        for record in records:
             fields = record.get('fields', {})
             updates.append({
                 'id': record.get('id'),
@@ -1779,17 +3011,11 @@ def post_job_update(job_number):
 
         # Find project record
         projects_url = get_airtable_url('Projects')
-        params = {
-            'filterByFormula': f"{{Job Number}} = '{job_number}'",
-            'maxRecords': 1
-        }
-        response = requests.get(projects_url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        records = response.json().get('records', [])
-        if not records:
+        project = _find_project(job_number)
+        if not project:
             return jsonify({'error': 'Job not found'}), 404
 
-        project_record_id = records[0].get('id')
+        project_record_id = project.get('id')
 
         # Create the update record
         updates_url = get_airtable_url('Updates')
@@ -1802,11 +3028,11 @@ def post_job_update(job_number):
             new_fields['Backdate'] = backdate
 
         new_record = {'fields': new_fields}
-        create_response = requests.post(updates_url, headers=HEADERS, json=new_record)
+        create_response = airtable_post(updates_url, headers=HEADERS, json=new_record)
         create_response.raise_for_status()
 
         # Also patch the Project's Update field so WIP cards stay current
-        patch_response = requests.patch(
+        patch_response = airtable_patch(
             f"{projects_url}/{project_record_id}",
             headers=HEADERS,
             json={'fields': {'Update': text}}
@@ -1816,6 +3042,13 @@ def post_job_update(job_number):
 
         created = create_response.json()
         fields = created.get('fields', {})
+        _write_through('Updates', created)
+        _write_through('Projects', patch_response.json())
+        publish_event('update', action='created', id=created.get('id'), text=text,
+                      jobNumber=job_number, clientCode=extract_client_code(job_number))
+        publish_event('job', action='updated', jobNumber=job_number,
+                      clientCode=extract_client_code(job_number),
+                      job=transform_project(patch_response.json()))
 
         return jsonify({
             'id': created.get('id'),
@@ -1845,12 +3078,15 @@ def patch_job_update(job_number, record_id):
             fields['Backdate'] = backdate
 
         updates_url = get_airtable_url('Updates')
-        patch_response = requests.patch(
+        patch_response = airtable_patch(
             f"{updates_url}/{record_id}",
             headers=HEADERS,
             json={'fields': fields}
         )
         patch_response.raise_for_status()
+        _write_through('Updates', patch_response.json())
+        publish_event('update', action='updated', id=record_id, text=text,
+                      jobNumber=job_number, clientCode=extract_client_code(job_number))
         return jsonify({'success': True})
 
     except Exception as e:
@@ -1863,11 +3099,14 @@ def delete_job_update(job_number, record_id):
     """Delete an update record"""
     try:
         updates_url = get_airtable_url('Updates')
-        del_response = requests.delete(
+        del_response = airtable_delete(
             f"{updates_url}/{record_id}",
             headers=HEADERS
         )
         del_response.raise_for_status()
+        _write_through_removed('Updates', record_id)
+        publish_event('update', action='deleted', id=record_id, jobNumber=job_number,
+                      clientCode=extract_client_code(job_number))
         return jsonify({'success': True})
 
     except Exception as e:
@@ -1876,41 +3115,29 @@ def delete_job_update(job_number, record_id):
 
 
 @app.route('/api/job/<job_number>/budget')
+@serve_stale
 def get_job_budget(job_number):
     """Get total spend for a job from Tracker table"""
+    if not _job_in_scope(job_number, _request_scope()):
+        return jsonify({'error': 'Job not found'}), 404
     try:
-        url = get_airtable_url('Tracker')
-        params = {
-            'filterByFormula': f"{{Job Number}} = '{job_number}'"
-        }
+        records = _cached_table('Tracker').records(
+            lambda r: tablecache.field_value(r.get('fields', {}), 'Job Number') == job_number)
 
         all_records = []
-        offset = None
-
-        while True:
-            if offset:
-                params['offset'] = offset
-            response = requests.get(url, headers=HEADERS, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            for record in data.get('records', []):
-                fields = record.get('fields', {})
-                spend = fields.get('This month', 0) or fields.get('Spend', 0)
-                if isinstance(spend, str):
-                    spend = float(spend.replace('$', '').replace(',', '') or 0)
-                all_records.append({
-                    'id': record.get('id'),
-                    'month': fields.get('Month', ''),
-                    'spendType': fields.get('Spend type', ''),
-                    'notes': fields.get('Tracker notes', ''),
-                    'spend': float(spend),
-                    'ballpark': bool(fields.get('Ballpark', False))
-                })
-
-            offset = data.get('offset')
-            if not offset:
-                break
+        for record in records:
+            fields = record.get('fields', {})
+            spend = fields.get('This month', 0) or fields.get('Spend', 0)
+            if isinstance(spend, str):
+                spend = float(spend.replace('$', '').replace(',', '') or 0)
+            all_records.append({
+                'id': record.get('id'),
+                'month': fields.get('Month', ''),
+                'spendType': fields.get('Spend type', ''),
+                'notes': fields.get('Tracker notes', ''),
+                'spend': float(spend),
+                'ballpark': bool(fields.get('Ballpark', False))
+            })
 
         total = sum(r['spend'] for r in all_records)
 
@@ -1950,32 +3177,25 @@ def _resolve_client_record_id(client_code_or_name):
         return None
     url = get_airtable_url('Clients')
     formula = f"OR({{Client code}} = '{client_code_or_name}', {{Clients}} = '{client_code_or_name}')"
-    response = requests.get(url, headers=HEADERS, params={'filterByFormula': formula, 'maxRecords': 1})
+    response = airtable_get(url, headers=HEADERS, params={'filterByFormula': formula, 'maxRecords': 1})
     response.raise_for_status()
     records = response.json().get('records', [])
     return records[0]['id'] if records else None
 
 
+def _load_todos():
+    """All todos in API shape, newest first."""
+    records = _cached_table('Todo').records()
+    records.sort(key=lambda r: r.get('fields', {}).get('Created', ''), reverse=True)
+    return [_todo_record_to_dict(r) for r in records]
+
+
 @app.route('/api/todos', methods=['GET'])
+@serve_stale
 def get_todos():
     """Get all todos, sorted newest first."""
     try:
-        url = get_airtable_url('Todo')
-        all_records = []
-        offset = None
-        while True:
-            params = {'sort[0][field]': 'Created', 'sort[0][direction]': 'desc'}
-            if offset:
-                params['offset'] = offset
-            response = requests.get(url, headers=HEADERS, params=params)
-            response.raise_for_status()
-            data = response.json()
-            for record in data.get('records', []):
-                all_records.append(_todo_record_to_dict(record))
-            offset = data.get('offset')
-            if not offset:
-                break
-        return jsonify(all_records)
+        return jsonify(_load_todos())
     except Exception as e:
         print(f'[Hub API] Error fetching todos: {e}')
         return jsonify({'error': str(e)}), 500
@@ -2015,10 +3235,13 @@ def create_todo():
                 print(f"[Hub API] Could not resolve client '{client_input}' - creating without link")
 
         url = get_airtable_url('Todo')
-        response = requests.post(url, headers=HEADERS, json={'fields': fields})
+        response = airtable_post(url, headers=HEADERS, json={'fields': fields})
         response.raise_for_status()
         print(f"[Hub API] Created todo: {title} ({bucket})")
-        return jsonify(_todo_record_to_dict(response.json()))
+        _write_through('Todo', response.json())
+        todo = _todo_record_to_dict(response.json())
+        publish_event('todo', action='created', todo=todo)
+        return jsonify(todo)
     except Exception as e:
         print(f'[Hub API] Error creating todo: {e}')
         return jsonify({'error': str(e)}), 500
@@ -2050,10 +3273,19 @@ def update_todo(record_id):
         if not airtable_fields:
             return jsonify({'error': 'No valid fields to update'}), 400
 
+        # Only send what differs from the cached record; nothing differs = no write
+        cached = _cached_table('Todo').get(record_id)
+        airtable_fields = _unchanged_write('Todo', cached, airtable_fields)
+        if not airtable_fields:
+            return jsonify({**_todo_record_to_dict(cached), 'skipped': True})
+
         url = get_airtable_url('Todo')
-        response = requests.patch(f"{url}/{record_id}", headers=HEADERS, json={'fields': airtable_fields})
+        response = airtable_patch(f"{url}/{record_id}", headers=HEADERS, json={'fields': airtable_fields})
         response.raise_for_status()
-        return jsonify(_todo_record_to_dict(response.json()))
+        _write_through('Todo', response.json())
+        todo = _todo_record_to_dict(response.json())
+        publish_event('todo', action='updated', todo=todo)
+        return jsonify(todo)
     except Exception as e:
         print(f'[Hub API] Error updating todo {record_id}: {e}')
         return jsonify({'error': str(e)}), 500
@@ -2064,15 +3296,456 @@ def delete_todo(record_id):
     """Delete a todo permanently."""
     try:
         url = get_airtable_url('Todo')
-        response = requests.delete(f"{url}/{record_id}", headers=HEADERS)
+        response = airtable_delete(f"{url}/{record_id}", headers=HEADERS)
         response.raise_for_status()
         print(f'[Hub API] Deleted todo {record_id}')
+        _write_through_removed('Todo', record_id)
+        publish_event('todo', action='deleted', id=record_id)
         return jsonify({'success': True})
     except Exception as e:
         print(f'[Hub API] Error deleting todo {record_id}: {e}')
         return jsonify({'error': str(e)}), 500
 
 
+# ===== AIRTABLE WEBHOOK =====
+# Airtable pings /api/airtable-webhook whenever the base changes — including
+# edits made directly in Airtable or by Traffic / Ask Dot. We then pull the
+# webhook's payloads from our cursor, refetch just the touched records, patch
+# them into the record cache and People directory, and feed them through
+# publish_event so everything listening there (search index, first-paint
+# data, open tabs) catches up without waiting for refresh timers. Setup: create a webhook on the base
+# pointing here and set AIRTABLE_WEBHOOK_ID and AIRTABLE_WEBHOOK_SECRET (its
+# macSecretBase64). Point AIRTABLE_API_URL at a local stand-in to test.
+# The payload cursor is kept in HUB_STATE_DB if set, so a restart resumes
+# instead of replaying every payload Airtable still holds. Airtable disables
+# a webhook 7 days after it was last refreshed, so a background thread
+# refreshes it every WEBHOOK_REFRESH_SECONDS.
+AIRTABLE_WEBHOOK_ID = os.environ.get('AIRTABLE_WEBHOOK_ID', '')
+AIRTABLE_WEBHOOK_SECRET = os.environ.get('AIRTABLE_WEBHOOK_SECRET', '')
+WEBHOOK_FETCH_CHUNK = 40   # record ids per RECORD_ID() formula (keeps the URL short)
+WEBHOOK_REFRESH_SECONDS = 24 * 60 * 60
+WEBHOOK_REFRESH_RETRY_SECONDS = 5 * 60
+_webhook_lock = threading.Lock()   # one payload drain at a time
+_airtable_table_names = {}         # table id -> name, from the metadata API
+if HUB_STATE_DB:
+    _webhook_cursors = webhooks.SqlitePayloadCursors(HUB_STATE_DB)
+else:
+    _webhook_cursors = webhooks.PayloadCursors()
+
+
+def _load_table_names():
+    """Refresh the table id -> name map from Airtable's metadata API."""
+    response = airtable_get(f'{AIRTABLE_API_URL}/v0/meta/bases/{AIRTABLE_BASE_ID}/tables')
+    response.raise_for_status()
+    _airtable_table_names.clear()
+    _airtable_table_names.update({t['id']: t['name'] for t in response.json().get('tables', [])})
+
+
+def _fetch_webhook_payloads(cursor):
+    """All payloads from cursor on. Returns (payloads, next_cursor)."""
+    url = f'{AIRTABLE_API_URL}/v0/bases/{AIRTABLE_BASE_ID}/webhooks/{AIRTABLE_WEBHOOK_ID}/payloads'
+    payloads = []
+    while True:
+        response = airtable_get(url, params={'cursor': cursor})
+        response.raise_for_status()
+        data = response.json()
+        payloads.extend(data.get('payloads', []))
+        cursor = data.get('cursor', cursor)
+        if not data.get('mightHaveMore'):
+            return payloads, cursor
+
+
+def _refresh_webhook():
+    """Push the webhook's expiry out another 7 days. Returns the new expiry time."""
+    response = airtable_post(
+        f'{AIRTABLE_API_URL}/v0/bases/{AIRTABLE_BASE_ID}/webhooks/{AIRTABLE_WEBHOOK_ID}/refresh')
+    response.raise_for_status()
+    return response.json().get('expirationTime')
+
+
+def _webhook_refresh_loop():
+    """Background: refresh the webhook now and then every WEBHOOK_REFRESH_SECONDS."""
+    while True:
+        try:
+            print(f'[Hub API] Webhook refreshed, expires {_refresh_webhook()}')
+            time.sleep(WEBHOOK_REFRESH_SECONDS)
+        except Exception as e:
+            print(f'[Hub API] Webhook refresh failed (retrying): {e}')
+            time.sleep(WEBHOOK_REFRESH_RETRY_SECONDS)
+
+
+def _fetch_records_by_id(table, record_ids):
+    """Current version of each record in record_ids (missing ones are skipped)."""
+    record_ids = sorted(record_ids)
+    records = []
+    for i in range(0, len(record_ids), WEBHOOK_FETCH_CHUNK):
+        chunk = record_ids[i:i + WEBHOOK_FETCH_CHUNK]
+        formula = 'OR(' + ', '.join(f"RECORD_ID() = '{r}'" for r in chunk) + ')'
+        records.extend(_fetch_records(table, formula))
+    return records
+
+
+# Handlers get the refetched records, and {record id: last cached record or
+# None} for the destroyed ones, so delete events can say whose record it was
+# (scoped streams filter on clientCode).
+def _webhook_projects(records, destroyed):
+    for record in records:
+        job = transform_project(record)
+        publish_event('job', action='updated', jobNumber=job['jobNumber'],
+                      clientCode=job['clientCode'], job=job)
+    for record_id, record in destroyed.items():
+        job_number = (record or {}).get('fields', {}).get('Job Number', '')
+        publish_event('job', action='deleted', id=record_id, jobNumber=job_number,
+                      clientCode=extract_client_code(job_number))
+
+
+def _update_job_number(record):
+    job_number = (record or {}).get('fields', {}).get('Job Number', '')
+    if isinstance(job_number, list):
+        job_number = job_number[0] if job_number else ''
+    return job_number
+
+
+def _webhook_updates(records, destroyed):
+    for record in records:
+        job_number = _update_job_number(record)
+        publish_event('update', action='updated', id=record.get('id'),
+                      text=record.get('fields', {}).get('Update', ''),
+                      jobNumber=job_number, clientCode=extract_client_code(job_number))
+    for record_id, record in destroyed.items():
+        job_number = _update_job_number(record)
+        publish_event('update', action='deleted', id=record_id,
+                      jobNumber=job_number, clientCode=extract_client_code(job_number))
+
+
+def _webhook_tracker(records, destroyed):
+    for record in records:
+        publish_event('tracker', action='updated', **_tracker_event_fields(record))
+    for record_id, record in destroyed.items():
+        fields = _tracker_event_fields(record) if record else {'id': record_id}
+        publish_event('tracker', action='deleted', **fields)
+
+
+def _webhook_todos(records, destroyed):
+    for record in records:
+        publish_event('todo', action='updated', todo=_todo_record_to_dict(record))
+    for record_id in destroyed:
+        publish_event('todo', action='deleted', id=record_id)
+
+
+def _webhook_people(records, destroyed):
+    # The records are already in the People cache; bring the directory along now
+    # so a PIN or access change applies to the very next login
+    _refresh_people_directory()
+
+
+WEBHOOK_TABLE_HANDLERS = {
+    'Projects': _webhook_projects,
+    'Updates': _webhook_updates,
+    'Tracker': _webhook_tracker,
+    'Todo': _webhook_todos,
+    'People': _webhook_people,
+}
+
+
+def _apply_airtable_changes(changes):
+    """Refetch changed records and hand them to their table's handler.
+    Returns {table: {'changed': n, 'destroyed': n}} for the tables handled."""
+    applied = {}
+    for table, ids in changes.items():
+        handler = WEBHOOK_TABLE_HANDLERS.get(table)
+        if handler is None:
+            continue
+        fetched_at = time.time()
+        records = _fetch_records_by_id(table, ids['changed']) if ids['changed'] else []
+        cache = _table_caches.get(table)
+        destroyed = {record_id: cache.get(record_id) if cache is not None and cache.loaded else None
+                     for record_id in ids['destroyed']}
+        for record in records:
+            _write_through(table, record, as_of=fetched_at)
+        for record_id in destroyed:
+            _write_through_removed(table, record_id)
+        handler(records, destroyed)
+        applied[table] = {'changed': len(records), 'destroyed': len(ids['destroyed'])}
+    return applied
+
+
+@app.route('/api/airtable-webhook', methods=['POST'])
+def airtable_webhook():
+    """
+    Airtable webhook notification receiver.
+
+    Expects the notification body Airtable sends ({'base', 'webhook', 'timestamp'})
+    signed in X-Airtable-Content-MAC. Drains pending payloads and refreshes the
+    affected records. Returns {'success': True, 'tables': {table: {'changed', 'destroyed'}}}.
+    """
+    if not AIRTABLE_WEBHOOK_ID or not AIRTABLE_WEBHOOK_SECRET:
+        return jsonify({'error': 'Webhook not configured'}), 503
+
+    body = request.get_data()
+    if not webhooks.verify_mac(AIRTABLE_WEBHOOK_SECRET, body, request.headers.get(webhooks.MAC_HEADER, '')):
+        return jsonify({'error': 'Bad signature'}), 401
+
+    note = request.get_json(silent=True) or {}
+    if (note.get('webhook') or {}).get('id') != AIRTABLE_WEBHOOK_ID:
+        return jsonify({'error': 'Unknown webhook'}), 400
+
+    try:
+        with _webhook_lock:
+            payloads, next_cursor = _fetch_webhook_payloads(_webhook_cursors.get(AIRTABLE_WEBHOOK_ID))
+            table_ids = {t for p in payloads for t in (p.get('changedTablesById') or {})}
+            if table_ids - set(_airtable_table_names):
+                _load_table_names()
+            changes = webhooks.collect_changes(payloads, _airtable_table_names)
+            applied = _apply_airtable_changes(changes)
+            # Only move past these payloads once they've been applied
+            _webhook_cursors.advance(AIRTABLE_WEBHOOK_ID, next_cursor)
+
+        print(f'[Hub API] Webhook: {len(payloads)} payloads, {applied}')
+        return jsonify({'success': True, 'tables': applied})
+
+    except Exception as e:
+        print(f'[Hub API] Error handling webhook: {e}')
+        return jsonify({'error': str(e)}), 500
+
+
+# Not in spawned tracker pool workers, which import this module too
+if AIRTABLE_WEBHOOK_ID and multiprocessing.parent_process() is None:
+    threading.Thread(target=_webhook_refresh_loop, name='webhook-refresh', daemon=True).start()
+
+
+# ===== BATCH =====
+# Several API calls in one round-trip. Sub-requests go through the normal
+# Flask routes in-process (same cookies, same auth and error handling); reads
+# with nothing pending ahead of them run concurrently.
+BATCH_MAX_OPS = 20
+BATCH_WORKERS = 4
+BATCH_METHODS = {'GET', 'POST', 'PATCH', 'DELETE'}
+# No recursion, no streams, and no logins: a batch can't hand back their
+# session cookies, and concurrent PIN tries would race the attempt limiter.
+# Matched by endpoint, so encoded spellings of a path (/api/event%73) are
+# caught too; any other streamed response is refused after dispatch.
+BATCH_EXCLUDED_ENDPOINTS = {'post_batch', 'stream_events', 'handle_verify_pin',
+                            'handle_request_login', 'handle_logout'}
+
+
+def _batch_endpoint(method, path):
+    """Endpoint name path resolves to (as a sub-request would route it) —
+    under another method if method isn't allowed there — or None."""
+    adapter = app.url_map.bind('')
+    path = unquote(urlsplit(path).path)
+    try:
+        return adapter.match(path, method)[0]
+    except MethodNotAllowed as e:
+        return adapter.match(path, e.valid_methods[0])[0] if e.valid_methods else None
+    except HTTPException:
+        return None
+
+
+def _parse_batch(ops):
+    """Validate a batch body and resolve dependencies.
+
+    Each op is {'id'?, 'method', 'path', 'body'?, 'dependsOn'?: [ids]}.
+    Without dependsOn, a GET waits for every earlier write and a write waits
+    for every earlier op, so the list runs as written. dependsOn replaces
+    that default and also means "only if these succeeded"; ids must name
+    earlier ops (so there are no cycles).
+
+    Returns ops as {'id', 'method', 'path', 'body', 'after': set of op
+    indexes, 'strict': bool}; raises ValueError.
+    """
+    if not isinstance(ops, list) or not ops:
+        raise ValueError('ops must be a non-empty list')
+    if len(ops) > BATCH_MAX_OPS:
+        raise ValueError(f'At most {BATCH_MAX_OPS} ops per batch')
+
+    parsed, index_of = [], {}
+    for i, op in enumerate(ops):
+        if not isinstance(op, dict):
+            raise ValueError(f'op {i} must be an object')
+        op_id = str(op.get('id', i))
+        method = str(op.get('method', 'GET')).upper()
+        path = op.get('path')
+        if op_id in index_of:
+            raise ValueError(f'Duplicate op id: {op_id}')
+        if method not in BATCH_METHODS:
+            raise ValueError(f'op {op_id}: unsupported method {method}')
+        if (not isinstance(path, str) or not path.startswith('/api/')
+                or _batch_endpoint(method, path) in BATCH_EXCLUDED_ENDPOINTS):
+            raise ValueError(f'op {op_id}: path not allowed: {path}')
+
+        hint = op.get('dependsOn')
+        if hint is not None:
+            if not isinstance(hint, list):
+                raise ValueError(f'op {op_id}: dependsOn must be a list')
+            unknown = [d for d in hint if str(d) not in index_of]
+            if unknown:
+                raise ValueError(f'op {op_id}: dependsOn must name earlier ops: {unknown}')
+            after = {index_of[str(d)] for d in hint}
+        elif method == 'GET':
+            after = {j for j, prev in enumerate(parsed) if prev['method'] != 'GET'}
+        else:
+            after = set(range(i))
+
+        index_of[op_id] = i
+        parsed.append({'id': op_id, 'method': method, 'path': path, 'body': op.get('body'),
+                       'after': after, 'strict': hint is not None})
+    return parsed
+
+
+def _dispatch_subrequest(op, headers, remote_addr):
+    """Run one op through the app's routes. Returns {'id', 'status', 'body', 'headers'}."""
+    kwargs = {'method': op['method'], 'headers': headers,
+              'environ_base': {'REMOTE_ADDR': remote_addr}}
+    if op['body'] is not None:
+        kwargs['json'] = op['body']
+    try:
+        with app.test_request_context(op['path'], **kwargs):
+            if request.endpoint in BATCH_EXCLUDED_ENDPOINTS:
+                return {'id': op['id'], 'status': 400, 'body': {'error': f"path not allowed: {op['path']}"}}
+            response = app.full_dispatch_request()
+    except Exception as e:
+        print(f"[Hub API] Batch op {op['id']} failed: {e}")
+        return {'id': op['id'], 'status': 500, 'body': {'error': str(e)}}
+    if response.is_streamed:
+        response.close()  # never read: a stream would hold the batch worker
+        return {'id': op['id'], 'status': 400, 'body': {'error': f"streamed responses can't be batched: {op['path']}"}}
+
+    body = response.get_json(silent=True)
+    result = {
+        'id': op['id'],
+        'status': response.status_code,
+        'body': body if body is not None else response.get_data(as_text=True),
+    }
+    # Response headers the frontend reads (X-Jobs-Cursor, X-Hub-Stale, ...)
+    extra = {k: v for k, v in response.headers.items() if k.startswith('X-')}
+    if extra:
+        result['headers'] = extra
+    return result
+
+
+def run_batch(ops, headers, remote_addr):
+    """Run parsed ops, each once the ops it comes after have finished.
+
+    An op with explicit dependencies is not run if one of them failed
+    (status >= 400); it gets 424. Returns results in op order.
+    """
+    results = {}
+    started = set()
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as pool:
+        running = {}
+        while len(results) < len(ops):
+            # Dependencies always come earlier, so one pass settles any 424 chain
+            for i, op in enumerate(ops):
+                if i in started or not op['after'] <= results.keys():
+                    continue
+                started.add(i)
+                failed = [ops[j]['id'] for j in sorted(op['after'])
+                          if op['strict'] and results[j]['status'] >= 400]
+                if failed:
+                    results[i] = {'id': op['id'], 'status': 424,
+                                  'body': {'error': f"Not run: {', '.join(failed)} failed"}}
+                else:
+                    running[pool.submit(_dispatch_subrequest, op, headers, remote_addr)] = i
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results[running.pop(future)] = future.result()
+    return [results[i] for i in range(len(ops))]
+
+
+@app.route('/api/batch', methods=['POST'])
+def post_batch():
+    """
+    Run several API calls in one request.
+
+    Body: {'ops': [{'id': str, 'method': 'GET'|'POST'|'PATCH'|'DELETE',
+                    'path': '/api/...', 'body': {...}, 'dependsOn': [ids]}]}
+    'id' defaults to the op's index. By default ops run in list order, with
+    reads between writes running concurrently; 'dependsOn' replaces that
+    (see _parse_batch) — e.g. [] lets a write run alongside the others.
+
+    Returns {'results': [{'id', 'status', 'body', 'headers'?}]} in op order.
+    Each op keeps its own status; the batch itself is 200 unless malformed.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            ops = _parse_batch(data.get('ops'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        headers = {k: v for k, v in request.headers.items()
+                   if k in ('Cookie', 'X-Forwarded-For', 'User-Agent')}
+        return jsonify({'results': run_batch(ops, headers, request.remote_addr)})
+
+    except Exception as e:
+        print(f'[Hub API] Error running batch: {e}')
+        return jsonify({'error': str(e)}), 500
+
+
+# ===== BOOTSTRAP =====
+# First paint in one round-trip: session check plus clients, jobs and
+# (optionally) todos, fetched from Airtable concurrently. Replaces the
+# check-session -> clients -> jobs/all chain app.js used to run on load.
+BOOTSTRAP_WORKERS = 3
+
+
+def _first_paint_data(scope, include_todos=False):
+    """Fetch clients, active jobs (limited to scope) and optionally todos concurrently.
+
+    Returns (data, errors): data has 'clients', 'jobs', 'jobsCursor' (+ 'todos'),
+    with None for any section that failed; errors maps section -> message.
+    """
+    loaders = {
+        'clients': _load_clients,
+        'jobs': lambda: _load_jobs(JOB_STATUSES['active'], scope),
+    }
+    if include_todos:
+        loaders['todos'] = _load_todos
+
+    data = {'jobsCursor': _new_jobs_cursor()}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=BOOTSTRAP_WORKERS) as pool:
+        futures = {name: pool.submit(fn) for name, fn in loaders.items()}
+        for name, future in futures.items():
+            try:
+                data[name] = future.result()
+            except Exception as e:
+                print(f'[Hub API] Bootstrap {name} failed: {e}')
+                data[name] = None
+                errors[name] = str(e)
+    return data, errors
+
+
+@app.route('/api/bootstrap')
+def get_bootstrap():
+    """
+    Everything the Hub needs to render after login.
+
+    Query params:
+        todos: '1' to include todos (Full access only — todos are Hunch-internal)
+
+    Returns {'authenticated': False} without a valid session, else
+        {'authenticated': True, 'user': {...}, 'clients': [...],
+         'jobs': [...], 'jobsCursor': str, 'todos': [...] (if asked),
+         'errors': {section: message} (only if a section failed)}
+    A failed section comes back as null so the frontend can fetch it alone.
+    """
+    user = _session_user()
+    if not user:
+        return jsonify({'authenticated': False})
+
+    include_todos = request.args.get('todos') == '1' and user['access_level'] == 'Full'
+    data, errors = _first_paint_data(_user_client_scope(user), include_todos)
+
+    result = {'authenticated': True, 'user': _session_json(user), **data}
+    if errors:
+        result['errors'] = errors
+    return jsonify(result)
+
+
 # ===== STATIC FILES CATCH-ALL (must be last) =====
 @app.route('/<path:path>')
 def serve_static(path):
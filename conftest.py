@@ -0,0 +1,27 @@
+"""
+conftest.py — fixtures shared by the test modules: a settable fake clock, and the
+memory / SQLite switch the state stores (PIN limiter, job number leases, rollover
+memo) are each tested under
+"""
+
+import pytest
+
+
+class Clock:
+    """Fake time source: returns .t, moving it on by step first (0 = frozen)."""
+
+    def __init__(self, t=1000.0, step=0.0):
+        self.t = t
+        self.step = step
+
+    def __call__(self):
+        self.t += self.step
+        return self.t
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def state_db(request, tmp_path):
+    """None for the in-memory store; else a fresh HUB_STATE_DB path for the SQLite one."""
+    if request.param == 'memory':
+        return None
+    return str(tmp_path / 'state.db')
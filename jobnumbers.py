@@ -0,0 +1,180 @@
+"""
+jobnumbers.py — Job numbers handed out from pre-reserved blocks.
+
+Owns:
+- Per-client leases: a block of numbers already reserved in Airtable
+  (the client's 'Next #' moved past it), handed out one at a time
+- Reading the job number format ('HUN 059' -> prefix 'HUN ', 3 digits)
+  off the client's formatted 'Next Job #'
+- Refilling an empty lease through a caller-supplied function, one refill
+  per client at a time
+- SqliteJobNumberLeases (a statedb twin): leases survive restarts (no
+  numbers skipped) and worker processes take turns refilling (a claim row,
+  not a held lock)
+
+No Flask, no Airtable. Caller does the reserving (refill) and formatting is
+done here, so a handed-out number always matches Airtable's own format.
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from statedb import SqliteStore
+
+
+def job_number_format(formatted: str, number) -> Optional[tuple]:
+    """(prefix, width) such that formatted == prefix + number zero-padded to
+    width, or None if formatted doesn't end in number."""
+    match = re.fullmatch(r'(.*?)(\d+)', (formatted or '').strip())
+    try:
+        if not match or int(match.group(2)) != int(number):
+            return None
+    except (ValueError, TypeError):
+        return None
+    return match.group(1), len(match.group(2))
+
+
+def format_job_number(prefix: str, width: int, number: int) -> str:
+    return f'{prefix}{number:0{width}d}'
+
+
+# refill() -> (prefix, width, start, end): numbers start..end-1 are now reserved
+# for this caller. None = couldn't reserve; take() returns None.
+Refill = Callable[[], Optional[tuple]]
+
+
+class JobNumberLeases:
+    """In-memory leases. Thread-safe; a refill for one client doesn't block
+    another client's numbers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client_locks = {}
+        self._leases = {}  # client_code -> [prefix, width, next, end]
+
+    def _client_lock(self, client_code):
+        with self._lock:
+            return self._client_locks.setdefault(client_code, threading.Lock())
+
+    def peek(self, client_code: str) -> Optional[str]:
+        """The number take() would hand out next, or None if the lease is empty."""
+        with self._lock:
+            lease = self._leases.get(client_code)
+            if not lease or lease[2] >= lease[3]:
+                return None
+            return format_job_number(lease[0], lease[1], lease[2])
+
+    def take(self, client_code: str, refill: Refill) -> Optional[str]:
+        """Next number from the client's lease, refilling it first if empty."""
+        with self._client_lock(client_code):
+            with self._lock:
+                lease = self._leases.get(client_code)
+                if lease and lease[2] < lease[3]:
+                    lease[2] += 1
+                    return format_job_number(lease[0], lease[1], lease[2] - 1)
+            block = refill()
+            if not block:
+                return None
+            prefix, width, start, end = block
+            with self._lock:
+                self._leases[client_code] = [prefix, width, start + 1, end]
+            return format_job_number(prefix, width, start)
+
+    def remaining(self, client_code: str) -> int:
+        with self._lock:
+            lease = self._leases.get(client_code)
+            return max(0, lease[3] - lease[2]) if lease else 0
+
+
+class SqliteJobNumberLeases(SqliteStore):
+    """SQLite twin of JobNumberLeases.
+
+    Taking a number is one conditional UPDATE. A refill calls refill() with
+    no SQLite lock held (the file is shared with other state stores, whose
+    writes mustn't wait on Airtable): the process that empties a lease first
+    claims the client's refill in one statement, and everyone else polls
+    until the new block lands or the claim lapses (its holder died).
+
+    Args:
+      path: SQLite database file (created if missing)
+      timeout: seconds to wait for another process's refill
+      claim_seconds: how long a refill claim holds before others may take over
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(self, path: str, timeout: float = 30, claim_seconds: float = 60):
+        super().__init__(path)
+        self.timeout = timeout
+        self.claim_seconds = claim_seconds
+        conn = self._conn()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS job_number_leases ('
+            ' client_code TEXT PRIMARY KEY, prefix TEXT NOT NULL, width INTEGER NOT NULL,'
+            ' next INTEGER NOT NULL, end INTEGER NOT NULL, refill_until REAL NOT NULL DEFAULT 0)'
+        )
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(job_number_leases)')}
+        if 'refill_until' not in columns:  # file from before refill claims
+            conn.execute('ALTER TABLE job_number_leases ADD COLUMN refill_until REAL NOT NULL DEFAULT 0')
+
+    def peek(self, client_code: str) -> Optional[str]:
+        row = self._conn().execute(
+            'SELECT prefix, width, next FROM job_number_leases WHERE client_code = ? AND next < end',
+            (client_code,)
+        ).fetchone()
+        return format_job_number(*row) if row else None
+
+    def _take_leased(self, conn, client_code):
+        row = conn.execute(
+            'UPDATE job_number_leases SET next = next + 1 WHERE client_code = ? AND next < end'
+            ' RETURNING prefix, width, next - 1', (client_code,)
+        ).fetchone()
+        return format_job_number(*row) if row else None
+
+    def _claim_refill(self, conn, client_code):
+        """True if this caller now owns client_code's refill."""
+        now = time.time()
+        row = conn.execute(
+            'INSERT INTO job_number_leases (client_code, prefix, width, next, end, refill_until)'
+            " VALUES (?, '', 0, 0, 0, ?)"
+            ' ON CONFLICT (client_code) DO UPDATE SET refill_until = excluded.refill_until'
+            ' WHERE next >= end AND refill_until < ?'
+            ' RETURNING client_code', (client_code, now + self.claim_seconds, now)
+        ).fetchone()
+        return row is not None
+
+    def take(self, client_code: str, refill: Refill) -> Optional[str]:
+        conn = self._conn()
+        deadline = time.time() + self.timeout
+        while True:
+            number = self._take_leased(conn, client_code)
+            if number:
+                return number
+            if self._claim_refill(conn, client_code):
+                break
+            if time.time() > deadline:
+                raise TimeoutError(f'Timed out waiting for another job number refill for {client_code}')
+            time.sleep(self.POLL_SECONDS)
+
+        try:
+            block = refill()
+        except Exception:
+            conn.execute('UPDATE job_number_leases SET refill_until = 0 WHERE client_code = ?', (client_code,))
+            raise
+        if not block:
+            conn.execute('UPDATE job_number_leases SET refill_until = 0 WHERE client_code = ?', (client_code,))
+            return None
+        prefix, width, start, end = block
+        conn.execute(
+            'UPDATE job_number_leases SET prefix = ?, width = ?, next = ?, end = ?, refill_until = 0'
+            ' WHERE client_code = ?', (prefix, width, start + 1, end, client_code)
+        )
+        return format_job_number(prefix, width, start)
+
+    def remaining(self, client_code: str) -> int:
+        row = self._conn().execute(
+            'SELECT MAX(0, end - next) FROM job_number_leases WHERE client_code = ?', (client_code,)
+        ).fetchone()
+        return row[0] if row else 0
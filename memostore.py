@@ -0,0 +1,107 @@
+"""
+memostore.py — Computed results stored against a fingerprint of their inputs.
+
+Owns:
+- get(key, fingerprint): the stored value, only if it was stored with the
+  same fingerprint (inputs changed = miss, caller recomputes and puts)
+- One value per key; a put replaces whatever the key held
+- A bounded in-memory store (least recently used evicted), and
+  SqliteMemoStore (a statedb twin) so results survive restarts
+
+Values must be JSON-serialisable; both stores hand back a fresh copy, so a
+caller can't mutate what's stored. No Flask, no Airtable.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from statedb import SqliteStore
+
+
+class MemoStore:
+    """In-memory memo store.
+
+    Args:
+      max_entries: keys kept (least recently used evicted beyond)
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (fingerprint, json text)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str, fingerprint: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                return None
+            self._entries.move_to_end(key)
+        return json.loads(entry[1])
+
+    def put(self, key: str, fingerprint: str, value) -> None:
+        text = json.dumps(value)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (fingerprint, text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteMemoStore(SqliteStore):
+    """SQLite twin of MemoStore.
+
+    Args:
+      path: SQLite database file (created if missing)
+      table: table to keep entries in (one per kind of result)
+      max_entries: keys kept (least recently written deleted beyond;
+        checked every CAP_CHECK_EVERY puts)
+      clock: time source (seconds), injectable for tests
+    """
+
+    CAP_CHECK_EVERY = 100
+
+    def __init__(self, path: str, table: str = 'memo', max_entries: int = 10000,
+                 clock: Callable[[], float] = time.time):
+        if not table.isidentifier():
+            raise ValueError(f'Bad table name: {table!r}')
+        super().__init__(path)
+        self.table = table
+        self.max_entries = max_entries
+        self.clock = clock
+        self._puts_since_cap_check = 0
+        self._conn().execute(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            ' key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL,'
+            ' value TEXT NOT NULL, written_at REAL NOT NULL)'
+        )
+
+    def __len__(self):
+        return self._conn().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def get(self, key: str, fingerprint: str):
+        row = self._conn().execute(
+            f'SELECT value FROM {self.table} WHERE key = ? AND fingerprint = ?', (key, fingerprint)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, fingerprint: str, value) -> None:
+        conn = self._conn()
+        conn.execute(
+            f'INSERT OR REPLACE INTO {self.table} (key, fingerprint, value, written_at)'
+            ' VALUES (?, ?, ?, ?)', (key, fingerprint, json.dumps(value), self.clock())
+        )
+        self._puts_since_cap_check += 1
+        if self._puts_since_cap_check >= self.CAP_CHECK_EVERY:
+            self._puts_since_cap_check = 0
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    f'DELETE FROM {self.table} WHERE key IN'
+                    f' (SELECT key FROM {self.table} ORDER BY written_at LIMIT ?)', (excess,)
+                )
@@ -0,0 +1,111 @@
+"""
+people.py — In-memory People directory with lookup indexes.
+
+Owns:
+- Email index (lowercase email -> person, and its record id) for magic-link /
+  PIN login and the duplicate-email check on create
+- Client index (client code -> active people) for contact pickers
+- PIN lookup for the owner login
+
+No Flask, no Airtable. Caller fetches People records (raw Airtable shape:
+{'id', 'fields'}) and feeds them in; results are the raw fields dicts.
+"""
+
+import threading
+from typing import Iterable, Optional
+
+
+def _client_codes(fields: dict) -> list:
+    """Client codes a person is linked to (the clientCode lookup, list or str)."""
+    codes = fields.get('clientCode') or []
+    if isinstance(codes, str):
+        codes = [codes]
+    return [c for c in codes if c]
+
+
+class PeopleDirectory:
+    """People records indexed by email and by client.
+
+    Records are upserted / removed individually so writes and incremental
+    refreshes patch the indexes in place. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id = {}        # record id -> fields
+        self._by_email = {}     # lowercase email -> record id
+        self._by_client = {}    # client code -> set of record ids (active people only)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def replace_all(self, records: Iterable[dict]) -> None:
+        """Drop everything and index records (a full reload)."""
+        with self._lock:
+            self._by_id.clear()
+            self._by_email.clear()
+            self._by_client.clear()
+            for record in records:
+                self._upsert_locked(record)
+
+    def upsert(self, record: dict) -> None:
+        with self._lock:
+            self._upsert_locked(record)
+
+    def remove(self, record_id: str) -> None:
+        with self._lock:
+            self._remove_locked(record_id)
+
+    def _upsert_locked(self, record):
+        record_id = record.get('id')
+        if not record_id:
+            return
+        self._remove_locked(record_id)
+        fields = record.get('fields', {})
+        self._by_id[record_id] = fields
+        email = (fields.get('Email Address') or '').strip().lower()
+        if email:
+            self._by_email[email] = record_id
+        if fields.get('Active'):
+            for code in _client_codes(fields):
+                self._by_client.setdefault(code, set()).add(record_id)
+
+    def _remove_locked(self, record_id):
+        fields = self._by_id.pop(record_id, None)
+        if fields is None:
+            return
+        email = (fields.get('Email Address') or '').strip().lower()
+        if email and self._by_email.get(email) == record_id:
+            del self._by_email[email]
+        for code in _client_codes(fields):
+            ids = self._by_client.get(code)
+            if ids is not None:
+                ids.discard(record_id)
+                if not ids:
+                    del self._by_client[code]
+
+    def by_email(self, email: str) -> Optional[dict]:
+        """Fields for the person with this email (case-insensitive), or None."""
+        with self._lock:
+            record_id = self._by_email.get((email or '').strip().lower())
+            return self._by_id.get(record_id) if record_id else None
+
+    def id_for(self, email: str) -> Optional[str]:
+        """Airtable record id of the person with this email (case-insensitive), or None."""
+        with self._lock:
+            return self._by_email.get((email or '').strip().lower())
+
+    def pin_for(self, email: str) -> Optional[str]:
+        """Stored PIN for email as a stripped string, or None if unset / unknown."""
+        fields = self.by_email(email)
+        if not fields or fields.get('Pin') is None:
+            return None
+        return str(fields['Pin']).strip()
+
+    def active_for_clients(self, client_codes: Iterable[str]) -> list:
+        """Fields of every active person linked to any of client_codes (no duplicates)."""
+        with self._lock:
+            ids = set()
+            for code in client_codes:
+                ids |= self._by_client.get(code, set())
+            return [self._by_id[i] for i in ids]
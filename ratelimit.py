@@ -0,0 +1,211 @@
+"""
+ratelimit.py — Bounded, expiring failed-attempt counters for brute-force guards.
+
+Owns:
+- Per-key fail counting and lockout (N fails -> locked for lockout_seconds)
+- Expiry: entries live lockout_seconds past their last fail / lock, swept by
+  a time wheel (one bucket per second), so idle keys cost nothing to expire
+- A hard size cap with least-recently-failed eviction, so memory stays flat
+  no matter how many distinct keys (IPs) an attacker rotates through
+- Sharded locks, so concurrent callers rarely contend
+- SqliteAttemptLimiter (a statedb twin), so a lockout holds across worker
+  processes and restarts
+
+No Flask, no Airtable. Caller picks the key (e.g. client IP).
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from statedb import SqliteStore
+
+
+class _Shard:
+    __slots__ = ('lock', 'entries', 'wheel', 'last_slot')
+
+    def __init__(self, wheel_size, now_slot):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> [fails, locked_until, expires_at, wheel slot], oldest first
+        self.wheel = [set() for _ in range(wheel_size)]  # each key sits in its entry's slot only
+        self.last_slot = now_slot
+
+
+class AttemptLimiter:
+    """In-memory attempt limiter.
+
+    Args:
+      max_fails: fails within the window that trigger a lockout
+      lockout_seconds: lockout length, and how long a fail is remembered
+      max_keys: total entries kept across all shards (oldest evicted beyond)
+      shards: number of independently locked shards
+      clock: time source (seconds), injectable for tests
+    """
+
+    def __init__(self, max_fails: int, lockout_seconds: float, max_keys: int = 10000,
+                 shards: int = 16, clock: Callable[[], float] = time.time):
+        self.max_fails = max_fails
+        self.lockout_seconds = lockout_seconds
+        self.clock = clock
+        self._shard_cap = max(1, math.ceil(max_keys / shards))
+        # Every entry expires within lockout_seconds, so one lap of the wheel
+        # covers the longest-lived entry.
+        self._wheel_size = int(math.ceil(lockout_seconds)) + 2
+        now_slot = int(clock())
+        self._shards = [_Shard(self._wheel_size, now_slot) for _ in range(shards)]
+
+    def __len__(self):
+        now = self.clock()
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                self._advance(shard, now)
+                total += len(shard.entries)
+        return total
+
+    def _shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _advance(self, shard, now):
+        """Drop entries whose wheel slot has come round. Caller holds shard.lock."""
+        now_slot = int(now)
+        start = max(shard.last_slot + 1, now_slot - self._wheel_size + 1)
+        for slot in range(start, now_slot + 1):
+            bucket = shard.wheel[slot % self._wheel_size]
+            for key in list(bucket):
+                if shard.entries[key][2] <= now:
+                    del shard.entries[key]
+                    bucket.discard(key)
+        shard.last_slot = max(shard.last_slot, now_slot)
+
+    def locked_for(self, key: str) -> float:
+        """Seconds until key may try again (0 if not locked)."""
+        now = self.clock()
+        shard = self._shard(key)
+        with shard.lock:
+            self._advance(shard, now)
+            entry = shard.entries.get(key)
+            if entry is None or entry[1] <= now:
+                return 0
+            return entry[1] - now
+
+    def fail(self, key: str) -> bool:
+        """Record a failed attempt. Returns True if key is now locked out."""
+        now = self.clock()
+        shard = self._shard(key)
+        with shard.lock:
+            self._advance(shard, now)
+            entry = shard.entries.pop(key, None)
+            if entry is None:
+                entry = [0, 0.0, 0.0, None]
+            else:
+                shard.wheel[entry[3]].discard(key)
+            entry[0] += 1
+            locked = entry[0] >= self.max_fails
+            if locked:
+                entry[0] = 0
+                entry[1] = now + self.lockout_seconds
+            entry[2] = max(entry[1], now + self.lockout_seconds)
+            entry[3] = int(math.ceil(entry[2])) % self._wheel_size
+            shard.entries[key] = entry  # re-inserted at the newest end
+            shard.wheel[entry[3]].add(key)
+            while len(shard.entries) > self._shard_cap:
+                evicted, old = shard.entries.popitem(last=False)
+                shard.wheel[old[3]].discard(evicted)
+            return locked
+
+    def reset(self, key: str) -> None:
+        """Forget key (e.g. after a successful attempt)."""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.pop(key, None)
+            if entry is not None:
+                shard.wheel[entry[3]].discard(key)
+
+
+class SqliteAttemptLimiter(SqliteStore):
+    """SQLite twin of AttemptLimiter. Writes run in an IMMEDIATE transaction
+    so concurrent fails for a key can't be lost.
+
+    Args:
+      path: SQLite database file (created if missing)
+      (others as AttemptLimiter)
+    """
+
+    # Expired rows are swept on every fail; the size cap (a COUNT) is checked
+    # every this many fails.
+    CAP_CHECK_EVERY = 100
+
+    def __init__(self, path: str, max_fails: int, lockout_seconds: float,
+                 max_keys: int = 10000, clock: Callable[[], float] = time.time):
+        super().__init__(path)
+        self.max_fails = max_fails
+        self.lockout_seconds = lockout_seconds
+        self.max_keys = max_keys
+        self.clock = clock
+        self._fails_since_cap_check = 0
+        conn = self._conn()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS pin_attempts ('
+            ' key TEXT PRIMARY KEY, fails INTEGER NOT NULL,'
+            ' locked_until REAL NOT NULL, expires_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS pin_attempts_expiry ON pin_attempts (expires_at)')
+
+    def __len__(self):
+        return self._conn().execute(
+            'SELECT COUNT(*) FROM pin_attempts WHERE expires_at > ?', (self.clock(),)
+        ).fetchone()[0]
+
+    def locked_for(self, key: str) -> float:
+        now = self.clock()
+        row = self._conn().execute(
+            'SELECT locked_until FROM pin_attempts WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        if row is None or row[0] <= now:
+            return 0
+        return row[0] - now
+
+    def fail(self, key: str) -> bool:
+        now = self.clock()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM pin_attempts WHERE expires_at <= ?', (now,))
+            row = conn.execute(
+                'SELECT fails, locked_until FROM pin_attempts WHERE key = ?', (key,)
+            ).fetchone()
+            fails, locked_until = row if row else (0, 0.0)
+            fails += 1
+            locked = fails >= self.max_fails
+            if locked:
+                fails = 0
+                locked_until = now + self.lockout_seconds
+            expires_at = max(locked_until, now + self.lockout_seconds)
+            conn.execute(
+                'INSERT OR REPLACE INTO pin_attempts (key, fails, locked_until, expires_at)'
+                ' VALUES (?, ?, ?, ?)', (key, fails, locked_until, expires_at)
+            )
+            self._fails_since_cap_check += 1
+            if self._fails_since_cap_check >= self.CAP_CHECK_EVERY:
+                self._fails_since_cap_check = 0
+                self._enforce_cap(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return locked
+
+    def _enforce_cap(self, conn):
+        """Delete the soonest-expiring (least recently failed) rows beyond max_keys."""
+        excess = conn.execute('SELECT COUNT(*) FROM pin_attempts').fetchone()[0] - self.max_keys
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM pin_attempts WHERE key IN'
+                ' (SELECT key FROM pin_attempts ORDER BY expires_at LIMIT ?)', (excess,)
+            )
+
+    def reset(self, key: str) -> None:
+        self._conn().execute('DELETE FROM pin_attempts WHERE key = ?', (key,))
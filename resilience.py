@@ -0,0 +1,180 @@
+"""
+resilience.py — Keeping the Hub readable through an Airtable incident.
+
+Owns:
+- CircuitBreaker: per-key (Airtable table) failure counting. After N
+  consecutive failures the key is open and calls are refused outright for a
+  cooldown, then one trial call at a time is let through until one succeeds.
+- StaleCache: last good payload per key with its age, bounded (oldest
+  evicted), served when the live read fails.
+- LatencyTracker: recent call latencies per key, for percentile-based
+  (adaptive) hedge delays.
+- RateBudget: token bucket shared by all calls; optional extra calls
+  (hedges) only go out when it has spare tokens.
+
+No Flask, no Airtable. Caller decides what a failure is and what a key is.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+
+class CircuitBreaker:
+    """Per-key closed / open / half-open breaker.
+
+    Args:
+      failure_threshold: consecutive failures that open a key
+      cooldown_seconds: how long an open key refuses calls before a trial
+      clock: time source (seconds), injectable for tests
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown_seconds: float = 30,
+                 clock: Callable[[], float] = time.time):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = {}  # key -> {'failures': int, 'opened_at': float|None, 'trial': bool}
+
+    def allow(self, key: str) -> bool:
+        """True if a call for key may go ahead. While open, False until the
+        cooldown passes; then True for a single trial call at a time."""
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or state['opened_at'] is None:
+                return True
+            if self.clock() - state['opened_at'] < self.cooldown_seconds or state['trial']:
+                return False
+            state['trial'] = True
+            return True
+
+    def success(self, key: str) -> None:
+        with self._lock:
+            self._state.pop(key, None)
+
+    def failure(self, key: str) -> bool:
+        """Record a failed call. Returns True if this failure opened the key."""
+        with self._lock:
+            state = self._state.setdefault(key, {'failures': 0, 'opened_at': None, 'trial': False})
+            state['failures'] += 1
+            was_open = state['opened_at'] is not None
+            if was_open or state['failures'] >= self.failure_threshold:
+                state['opened_at'] = self.clock()  # a failed trial restarts the cooldown
+                state['trial'] = False
+            return not was_open and state['opened_at'] is not None
+
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            state = self._state.get(key)
+            return bool(state and state['opened_at'] is not None)
+
+    def open_keys(self) -> list:
+        with self._lock:
+            return sorted(k for k, s in self._state.items() if s['opened_at'] is not None)
+
+
+class StaleCache:
+    """Last good payload per key. Thread-safe, at most max_entries kept.
+
+    Args:
+      max_entries: oldest-stored entries are evicted beyond this
+      clock: time source (seconds), injectable for tests
+    """
+
+    def __init__(self, max_entries: int = 500, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (stored_at, payload)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, key: str, payload) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self.clock(), payload)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[tuple]:
+        """(payload, age_seconds) for key, or None if never stored."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, payload = entry
+        return payload, max(0.0, self.clock() - stored_at)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies per key. Thread-safe.
+
+    Args:
+      window: latencies kept per key
+      min_samples: percentile() returns None until a key has this many
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = {}  # key -> deque of seconds
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, key: str, pct: float = 95) -> Optional[float]:
+        """pct-th percentile latency for key (nearest rank), or None if too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+        return samples[rank]
+
+
+class RateBudget:
+    """Token bucket: rate_per_second tokens, holding at most `burst`.
+
+    Required calls spend() unconditionally (the bucket may go into debt, down
+    to -burst); optional calls try_spend() and only go ahead with a whole
+    token to spare, so they never push the caller over its rate.
+    """
+
+    def __init__(self, rate_per_second: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_per_second
+        self.burst = burst if burst is not None else rate_per_second
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _refill_locked(self):
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def spend(self) -> None:
+        with self._lock:
+            self._refill_locked()
+            self._tokens = max(-self.burst, self._tokens - 1)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill_locked()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
@@ -0,0 +1,177 @@
+"""
+search.py — In-memory inverted index for Hub full-text search.
+
+Owns:
+- Tokenising (lowercase alphanumeric runs, plus a squashed job-number token
+  so 'SKY017' finds 'SKY 017')
+- Per-field weighted postings, updated one document at a time
+- Prefix matching over a sorted term list (bisect, no full scan)
+- Ranking (field weight x tf x idf, exact terms beat prefix-only matches)
+
+No Flask, no Airtable. Caller decides what a document is and feeds it in.
+"""
+
+import bisect
+import math
+import re
+import threading
+from typing import Callable, Optional
+
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+JOB_NUMBER_RE = re.compile(r'\b([a-z]{2,4})\s+(\d{2,4})\b')
+
+# A prefix-only hit scores this fraction of an exact term hit, so 'sky'
+# ranks the SKY jobs above a job that merely mentions 'skyline'.
+PREFIX_PENALTY = 0.6
+
+
+def tokenize(text: str) -> list:
+    """Return lowercase search tokens for text.
+
+    Job numbers also produce a squashed token: 'SKY 017' -> ['sky', '017', 'sky017'].
+    """
+    if not text:
+        return []
+    lowered = str(text).lower()
+    tokens = TOKEN_RE.findall(lowered)
+    tokens.extend(a + b for a, b in JOB_NUMBER_RE.findall(lowered))
+    return tokens
+
+
+class SearchIndex:
+    """Inverted index over small text documents with weighted fields.
+
+    Documents are upserted / removed individually, so writes update the index
+    incrementally. Thread-safe: one lock guards all structures (searches are
+    sub-millisecond at Hub scale, so there's nothing to gain from finer locks).
+
+    Args:
+      field_weights: {field_name: weight}. Fields not listed weigh 1.0.
+    """
+
+    def __init__(self, field_weights: Optional[dict] = None):
+        self.field_weights = dict(field_weights or {})
+        self._lock = threading.Lock()
+        self._postings = {}      # term -> {doc_id: weighted term frequency}
+        self._doc_terms = {}     # doc_id -> set of terms (for removal)
+        self._payloads = {}      # doc_id -> caller payload returned in results
+        self._sorted_terms = []  # sorted list of every term, for prefix lookup
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._payloads
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._payloads.clear()
+            self._sorted_terms = []
+
+    def upsert(self, doc_id: str, fields: dict, payload) -> None:
+        """Index (or re-index) a document.
+
+        Args:
+          doc_id: caller's stable id, e.g. 'job:SKY 017'
+          fields: {field_name: text}
+          payload: returned as-is in search results
+        """
+        weighted = {}
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for term in tokenize(text):
+                weighted[term] = weighted.get(term, 0.0) + weight
+
+        with self._lock:
+            self._remove_locked(doc_id)
+            for term, tf in weighted.items():
+                docs = self._postings.get(term)
+                if docs is None:
+                    docs = self._postings[term] = {}
+                    bisect.insort(self._sorted_terms, term)
+                docs[doc_id] = tf
+            self._doc_terms[doc_id] = set(weighted)
+            self._payloads[doc_id] = payload
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id):
+        for term in self._doc_terms.pop(doc_id, ()):
+            docs = self._postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self._postings[term]
+                i = bisect.bisect_left(self._sorted_terms, term)
+                if i < len(self._sorted_terms) and self._sorted_terms[i] == term:
+                    del self._sorted_terms[i]
+        self._payloads.pop(doc_id, None)
+
+    def _expand_prefix(self, prefix):
+        """Every indexed term starting with prefix (includes prefix itself)."""
+        i = bisect.bisect_left(self._sorted_terms, prefix)
+        out = []
+        while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(prefix):
+            out.append(self._sorted_terms[i])
+            i += 1
+        return out
+
+    def search(self, query: str, limit: int = 20,
+               predicate: Optional[Callable] = None) -> list:
+        """Return up to `limit` payloads matching every query token, best first.
+
+        Each query token matches indexed terms by prefix ('camp' finds
+        'campaign'). Documents must match all tokens.
+
+        Args:
+          predicate: optional payload -> bool filter applied before ranking
+            (e.g. restrict to one client's jobs).
+
+        Returns: [{'score': float, **payload}] when payload is a dict,
+          else [{'score': float, 'payload': payload}].
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            n_docs = len(self._payloads) or 1
+            scores = None
+            for token in tokens:
+                token_scores = {}
+                for term in self._expand_prefix(token):
+                    docs = self._postings[term]
+                    idf = math.log(1 + n_docs / len(docs))
+                    factor = idf if term == token else idf * PREFIX_PENALTY
+                    for doc_id, tf in docs.items():
+                        s = tf * factor
+                        if s > token_scores.get(doc_id, 0.0):
+                            token_scores[doc_id] = s
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {d: scores[d] + s for d, s in token_scores.items() if d in scores}
+                if not scores:
+                    return []
+
+            ranked = []
+            for doc_id, score in scores.items():
+                payload = self._payloads[doc_id]
+                if predicate is not None and not predicate(payload):
+                    continue
+                ranked.append((score, doc_id, payload))
+
+        ranked.sort(key=lambda x: (-x[0], x[1]))
+        out = []
+        for score, _, payload in ranked[:limit]:
+            if isinstance(payload, dict):
+                out.append({'score': round(score, 3), **payload})
+            else:
+                out.append({'score': round(score, 3), 'payload': payload})
+        return out
@@ -0,0 +1,39 @@
+"""
+statedb.py — The SQLite file (HUB_STATE_DB) behind the Hub's persistent stores.
+
+Owns:
+- SqliteStore: base for the SQLite twin of each in-memory store (PIN
+  attempts, webhook cursors, job number leases, memoised results). A twin
+  keeps its in-memory counterpart's interface, in a file shared by every
+  process that opens it, so state holds across workers and restarts
+- One connection per thread: autocommit (each store opens its own
+  transactions where it needs them), WAL so readers don't wait on the
+  writer, and a short busy timeout
+
+No Flask, no Airtable.
+"""
+
+import sqlite3
+import threading
+
+
+class SqliteStore:
+    """Per-thread connections to one SQLite file.
+
+    Args:
+      path: SQLite database file (created if missing)
+    """
+
+    BUSY_TIMEOUT_SECONDS = 5
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
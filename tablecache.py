@@ -0,0 +1,205 @@
+"""
+tablecache.py — In-memory copy of an Airtable table, patched record by record.
+
+Owns:
+- Every record of one table by id, in Airtable's order (new records last)
+- A change stamp per record, and tombstones for removed records, so
+  "what changed since T" is a dict scan instead of an Airtable query
+- An optional key-field index (e.g. Projects by Job Number)
+- A version counter that ticks on every real change, for derived caches,
+  and a bounded journal of those changes so a derived cache can patch
+  itself instead of rebuilding
+- Field-level diffs of a pending write against a cached record
+
+No Flask, no Airtable. Caller loads, tops up and writes through records
+(raw Airtable shape: {'id', 'fields', ...}).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+def field_value(fields: dict, name: str):
+    """fields[name], unwrapping single-value lookup lists ('' if empty)."""
+    value = fields.get(name, '')
+    if isinstance(value, list):
+        return value[0] if value else ''
+    return value
+
+
+def _blank(value):
+    """Airtable omits empty fields, so None / '' / [] / False all read back as missing."""
+    return value is None or value == '' or value == [] or value is False
+
+
+def changed_fields(current: dict, updates: dict) -> dict:
+    """The subset of updates (Airtable field -> new value) that differs from current.
+
+    Blank values match each other (clearing an already-empty field is a no-op);
+    anything else must be equal. Empty result = the write would change nothing.
+    """
+    changed = {}
+    for name, value in updates.items():
+        old = current.get(name)
+        if _blank(old) and _blank(value):
+            continue
+        if old != value:
+            changed[name] = value
+    return changed
+
+
+class TableCache:
+    """Records of one table, by id. Thread-safe.
+
+    Args:
+      key_field: optional field to index (unique values, e.g. 'Job Number')
+      tombstone_seconds: how long removed ids are reported by changed_since
+      journal_size: changes kept for changes_after (older ones = rebuild)
+      clock: time source (seconds), injectable for tests
+    """
+
+    def __init__(self, key_field: Optional[str] = None, tombstone_seconds: float = 24 * 60 * 60,
+                 journal_size: int = 1000, clock: Callable[[], float] = time.time):
+        self.key_field = key_field
+        self.tombstone_seconds = tombstone_seconds
+        self.clock = clock
+        self.loaded = False
+        self.version = 0
+        self._lock = threading.Lock()
+        self._records = {}     # id -> record
+        self._stamps = {}      # id -> time the cache saw it change
+        self._by_key = {}      # key_field value -> id
+        self._tombstones = {}  # id -> (time removed, last record)
+        self._journal = deque(maxlen=journal_size)  # (version, old record | None, new record | None)
+
+    def __len__(self):
+        return len(self._records)
+
+    def replace_all(self, records: list, as_of: Optional[float] = None) -> None:
+        """Swap in a full reload. Only records that are new or differ get a
+        fresh stamp; ids missing from records become tombstones.
+
+        as_of is when the reload's fetch started (same clock). Records
+        written or removed through the cache after that are newer than the
+        reload's copy, so they're left as they are.
+        """
+        now = self.clock()
+        with self._lock:
+            seen = set()
+            for record in records:
+                seen.add(record.get('id'))
+                if not self._newer_locked(record.get('id'), as_of):
+                    self._upsert_locked(record, now)
+            for record_id in [r for r in self._records if r not in seen]:
+                if not self._newer_locked(record_id, as_of):
+                    self._remove_locked(record_id, now)
+            # Keep Airtable's order for the reloaded set (records added since the fetch go last)
+            order = [r['id'] for r in records if r.get('id') in self._records]
+            order += [r for r in self._records if r not in seen]
+            self._records = {r: self._records[r] for r in order}
+            self._prune_tombstones_locked(now)
+            self.loaded = True
+
+    def upsert(self, record: dict, as_of: Optional[float] = None) -> bool:
+        """Add or replace a record. Returns True if anything changed.
+
+        as_of: when the record was fetched, for a record read from Airtable
+        (a top-up); skipped if the cache has seen it change since.
+        """
+        with self._lock:
+            if self._newer_locked(record.get('id'), as_of):
+                return False
+            return self._upsert_locked(record, self.clock())
+
+    def remove(self, record_id: str) -> bool:
+        """Drop a record. Returns True if it was cached."""
+        with self._lock:
+            return self._remove_locked(record_id, self.clock())
+
+    def _newer_locked(self, record_id, as_of):
+        """True if record_id was written or removed here after as_of."""
+        if as_of is None:
+            return False
+        stamp = self._stamps.get(record_id)
+        if stamp is None and record_id in self._tombstones:
+            stamp = self._tombstones[record_id][0]
+        return stamp is not None and stamp > as_of
+
+    def _upsert_locked(self, record, now):
+        record_id = record.get('id')
+        if not record_id:
+            return False
+        old = self._records.get(record_id)
+        if old is not None and old.get('fields') == record.get('fields'):
+            return False
+        if old is not None and self.key_field:
+            old_key = field_value(old.get('fields', {}), self.key_field)
+            if self._by_key.get(old_key) == record_id:
+                del self._by_key[old_key]
+        self._records[record_id] = record
+        self._stamps[record_id] = now
+        self._tombstones.pop(record_id, None)
+        if self.key_field:
+            key = field_value(record.get('fields', {}), self.key_field)
+            if key:
+                self._by_key[key] = record_id
+        self.version += 1
+        self._journal.append((self.version, old, record))
+        return True
+
+    def _remove_locked(self, record_id, now):
+        record = self._records.pop(record_id, None)
+        if record is None:
+            return False
+        self._stamps.pop(record_id, None)
+        if self.key_field:
+            key = field_value(record.get('fields', {}), self.key_field)
+            if self._by_key.get(key) == record_id:
+                del self._by_key[key]
+        self._tombstones[record_id] = (now, record)
+        self.version += 1
+        self._journal.append((self.version, record, None))
+        return True
+
+    def _prune_tombstones_locked(self, now):
+        cutoff = now - self.tombstone_seconds
+        for record_id in [r for r, (t, _) in self._tombstones.items() if t < cutoff]:
+            del self._tombstones[record_id]
+
+    def get(self, record_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._records.get(record_id)
+
+    def get_by_key(self, key: str) -> Optional[dict]:
+        """Record whose key_field equals key, or None."""
+        with self._lock:
+            record_id = self._by_key.get(key)
+            return self._records.get(record_id) if record_id else None
+
+    def records(self, predicate: Optional[Callable[[dict], bool]] = None) -> list:
+        """Snapshot of the records (optionally only those matching predicate), in order."""
+        with self._lock:
+            records = list(self._records.values())
+        if predicate is None:
+            return records
+        return [r for r in records if predicate(r)]
+
+    def changed_since(self, since: float) -> tuple:
+        """(records changed at or after since, records removed at or after since)."""
+        with self._lock:
+            changed = [self._records[r] for r, t in self._stamps.items() if t >= since]
+            removed = [rec for t, rec in self._tombstones.values() if t >= since]
+        return changed, removed
+
+    def changes_after(self, version: int) -> tuple:
+        """(current version, [(old record | None, new record | None)] for each
+        change after version, oldest first). The list is None if the journal
+        no longer reaches back to version — the caller should rebuild."""
+        with self._lock:
+            if version == self.version:
+                return self.version, []
+            if not self._journal or self._journal[0][0] > version + 1:
+                return self.version, None
+            return self.version, [(old, new) for v, old, new in self._journal if v > version]
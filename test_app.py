@@ -0,0 +1,850 @@
+"""
+test_app.py — API routes end to end through app.test_client(), with Airtable
+replaced by an in-memory fake underneath airtable_request (so the breaker,
+stale cache, table caches and write-through paths all run as in production)
+
+Run: pytest test_app.py -v
+"""
+
+import base64
+import copy
+import functools
+import importlib
+import json
+import re
+import time
+from datetime import date
+
+import pytest
+import requests
+
+import jobnumbers
+import tracker
+import webhooks
+
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self._data = copy.deepcopy(data)  # callers must not share the fake's own records
+        self.status_code = status
+        self.ok = status < 400
+        self.text = json.dumps(data)
+        self.content = self.text.encode()
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f'HTTP {self.status_code}')
+
+
+def _first(value):
+    if isinstance(value, list):
+        return value[0] if value else ''
+    return value
+
+
+def _matches(formula, record):
+    """The few filterByFormula shapes app.py sends: OR'd {Field} = 'x' and
+    RECORD_ID() = 'x' terms. LAST_MODIFIED_TIME() top-ups match nothing."""
+    if 'LAST_MODIFIED_TIME()' in formula:
+        return False
+    terms = re.findall(r"(\{[^}]+\}|RECORD_ID\(\))\s*=\s*'([^']*)'", formula)
+    fields = record['fields']
+    return any(value == (record['id'] if ref == 'RECORD_ID()' else str(_first(fields.get(ref[1:-1], ''))))
+               for ref, value in terms)
+
+
+class FakeAirtable:
+    """Stands in for Airtable behind airtable_request: tables of records in memory.
+
+    Lists (with filterByFormula / maxRecords), single-record GETs, creates,
+    PATCHes and deletes. Other URLs (metadata, webhook payloads, a failing
+    table) are answered from .routes: {url fragment: callable(method, url,
+    **kwargs) -> data or FakeResponse}; anything else off Airtable gets {}.
+    Every call is logged in .calls as (method, table or url, kwargs).
+    """
+
+    def __init__(self, base_url, tables):
+        self.base_url = base_url
+        self.tables = {name: [dict(r) for r in records] for name, records in tables.items()}
+        self.routes = {}
+        self.calls = []
+        self._next_id = 1
+
+    def __call__(self, method, url, **kwargs):
+        for fragment, handler in self.routes.items():
+            if fragment in url:
+                self.calls.append((method, url, kwargs))
+                result = handler(method, url, **kwargs)
+                return result if isinstance(result, FakeResponse) else FakeResponse(result)
+        if not url.startswith(self.base_url):
+            self.calls.append((method, url, kwargs))
+            return FakeResponse({})
+        table, _, record_id = url[len(self.base_url):].partition('/')
+        self.calls.append((method, table, kwargs))
+        records = self.tables.setdefault(table, [])
+        body = kwargs.get('json') or {}
+
+        if method == 'get' and not record_id:
+            params = kwargs.get('params') or {}
+            found = [r for r in records
+                     if not params.get('filterByFormula') or _matches(params['filterByFormula'], r)]
+            if params.get('maxRecords'):
+                found = found[:params['maxRecords']]
+            return FakeResponse({'records': found})
+        if method == 'post':
+            self._next_id += 1
+            record = {'id': f'recNew{self._next_id}', 'fields': dict(body.get('fields', {}))}
+            records.append(record)
+            return FakeResponse(record)
+
+        record = next((r for r in records if r['id'] == record_id), None)
+        if record is None:
+            return FakeResponse({'error': 'NOT_FOUND'}, 404)
+        if method == 'patch':
+            record['fields'] = {**record['fields'], **body.get('fields', {})}
+            record['fields'] = {k: v for k, v in record['fields'].items() if v not in (None, '')}
+        elif method == 'delete':
+            records.remove(record)
+            return FakeResponse({'id': record_id, 'deleted': True})
+        return FakeResponse(record)
+
+    def writes(self, table=None):
+        return [c for c in self.calls if c[0] != 'get' and (table is None or c[1] == table)]
+
+
+def project(record_id, number, name, status='In Progress', **fields):
+    return {'id': record_id, 'fields': {'Job Number': number, 'Project Name': name, 'Status': status,
+                                        'Client': [f'rec{number[:3]}'], **fields}}
+
+
+def tables():
+    """A small base: two clients, a few jobs each, their tracker rows."""
+    return {
+        'Clients': [
+            {'id': 'recSKY', 'fields': {'Client code': 'SKY', 'Clients': 'Sky', 'Year end': 'June',
+                                        'Monthly Committed': 10000, 'Next Job #': 'SKY 020', 'Next #': 20}},
+            {'id': 'recTOW', 'fields': {'Client code': 'TOW', 'Clients': 'Tower', 'Year end': 'March',
+                                        'Monthly Committed': '$8,000', 'Next Job #': 'TOW 070', 'Next #': 70}},
+        ],
+        'Projects': [
+            project('recP1', 'SKY 017', 'Winter campaign', Stage='Craft', Description='Hoardings for the winter sale'),
+            project('recP2', 'SKY 018', 'Sport launch'),
+            project('recP3', 'TOW 066', 'Claims explainer', Description='Winter storm claims video'),
+            project('recP4', 'TOW 060', 'Old brochure', status='Completed'),
+        ],
+        'Updates': [
+            {'id': 'recU1', 'fields': {'Update': 'Hoarding proofs approved', 'Job Number': ['SKY 017'],
+                                       'Project Link': ['recP1']}},
+        ],
+        'Todo': [
+            {'id': 'recT1', 'fields': {'Item': 'Chase Sky PO'}},
+        ],
+        'People': [
+            {'id': 'recM', 'fields': {'Email Address': 'michael@hunch.co.nz', 'First Name': 'Michael',
+                                      'Access': 'Full', 'clientCode': ['HUN'], 'Pin': '4821', 'Active': True}},
+            {'id': 'recA', 'fields': {'Email Address': 'ana@sky.co.nz', 'First Name': 'Ana', 'Name': 'Ana Rewi',
+                                      'Access': 'Client WIP', 'clientCode': ['SKY'], 'Active': True}},
+        ],
+        'Tracker': [
+            {'id': f'recK{i}', 'fields': {'Client Code': [['SKY', 'TOW'][i % 2]], 'Month': MONTHS[i % 12],
+                                          'Spend': 1000 + i * 37, 'Spend type': 'Project budget',
+                                          'Job Number': [['SKY 017', 'TOW 066'][i % 2]]}}
+            for i in range(24)
+        ],
+        'Budget History': [],
+    }
+
+
+@pytest.fixture
+def airtable():
+    return FakeAirtable('', tables())
+
+
+@pytest.fixture
+def hub(monkeypatch, airtable):
+    """app.py freshly imported (no state left from another test), its outbound
+    requests answered by the fake."""
+    monkeypatch.delenv('HUB_STATE_DB', raising=False)
+    monkeypatch.delenv('AIRTABLE_WEBHOOK_ID', raising=False)
+    monkeypatch.delenv('TRACKER_WORKERS', raising=False)
+    import app
+    module = importlib.reload(app)
+    airtable.base_url = module.get_airtable_url('')
+    for method in ('get', 'post', 'patch', 'delete'):
+        monkeypatch.setattr(module.requests, method, functools.partial(airtable, method))
+    return module
+
+
+@pytest.fixture
+def client(hub):
+    return hub.app.test_client()
+
+
+def login(client, hub, access_level='Full', client_code='ALL', email='michael@hunch.co.nz'):
+    token = hub.generate_token(email, client_code, 'Michael', access_level)
+    client.set_cookie('dot_session', token)
+
+
+def read_events(response, count):
+    """The next count SSE frames from a streamed /api/events response, as dicts."""
+    events = []
+    for chunk in response.response:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if text.startswith('id:'):
+            events.append(json.loads(text.split('data: ', 1)[1]))
+            if len(events) == count:
+                return events
+    return events
+
+
+class TestEvents:
+
+    def test_job_update_reaches_stream(self, client):
+        stream = client.get('/api/events')
+        assert stream.mimetype == 'text/event-stream'
+        assert next(iter(stream.response)).startswith(b'retry:')
+        assert client.post('/api/job/SKY 017/update', json={'stage': 'Refine'}).status_code == 200
+        [event] = read_events(stream, 1)
+        assert event['type'] == 'job'
+        assert event['jobNumber'] == 'SKY 017'
+        assert event['job']['stage'] == 'Refine'
+        stream.close()
+
+    def test_scoped_stream_sees_only_its_client(self, client, hub):
+        login(client, hub, 'Client WIP', 'TOW')
+        stream = client.get('/api/events')
+        hub.publish_event('todo', action='created', todo={'id': 'recT9'})
+        hub.publish_event('job', action='updated', jobNumber='SKY 017', clientCode='SKY', job={})
+        hub.publish_event('job', action='updated', jobNumber='TOW 066', clientCode='TOW', job={})
+        [event] = read_events(stream, 1)
+        assert event['jobNumber'] == 'TOW 066'
+        stream.close()
+
+
+class TestJobChanges:
+
+    def test_needs_cursor(self, client):
+        assert client.get('/api/jobs/changes').status_code == 400
+        assert client.get('/api/jobs/changes?since=nonsense').status_code == 400
+
+    def test_changes_since_cursor(self, client):
+        listing = client.get('/api/jobs/all')
+        assert sorted(j['jobNumber'] for j in listing.get_json()) == ['SKY 017', 'SKY 018', 'TOW 066']
+        cursor = listing.headers['X-Jobs-Cursor']
+
+        client.post('/api/job/SKY 017/update', json={'stage': 'Refine'})
+        client.post('/api/job/TOW 066/update', json={'status': 'Completed'})
+        changes = client.get(f'/api/jobs/changes?since={cursor}').get_json()
+        # The cursor overlaps the load by a few seconds, so untouched jobs may ride along
+        jobs = {j['jobNumber']: j for j in changes['jobs']}
+        assert jobs['SKY 017']['stage'] == 'Refine'
+        assert 'TOW 066' not in jobs
+        assert 'TOW 066' in changes['removed']  # moved out of 'active'
+        assert changes['cursor']
+
+    def test_scoped_session_only_gets_its_client(self, client, hub):
+        cursor = client.get('/api/jobs/all').headers['X-Jobs-Cursor']
+        client.post('/api/job/SKY 017/update', json={'stage': 'Refine'})
+        client.post('/api/job/TOW 066/update', json={'stage': 'Refine'})
+        login(client, hub, 'Client WIP', 'TOW')
+        changes = client.get(f'/api/jobs/changes?since={cursor}&client=SKY').get_json()
+        assert {j['clientCode'] for j in changes['jobs']} == {'TOW'}
+
+
+class TestSearch:
+
+    def test_needs_query(self, client):
+        assert client.get('/api/search').status_code == 400
+
+    def test_finds_jobs_and_updates(self, client):
+        results = client.get('/api/search?q=wint').get_json()
+        assert {r['jobNumber'] for r in results} == {'SKY 017', 'TOW 066'}
+        [update] = client.get('/api/search?q=proofs').get_json()
+        assert update['type'] == 'update'
+        assert update['jobNumber'] == 'SKY 017'
+
+    def test_client_filter_and_scope(self, client, hub):
+        assert [r['jobNumber'] for r in client.get('/api/search?q=winter&client=TOW').get_json()] == ['TOW 066']
+        login(client, hub, 'Client WIP', 'SKY')
+        assert [r['jobNumber'] for r in client.get('/api/search?q=winter&client=TOW').get_json()] == ['SKY 017']
+
+    def test_reads_come_from_the_table_caches(self, client, hub, airtable):
+        client.get('/api/search?q=winter')
+        client.get('/api/jobs/all')
+        client.get('/api/search?q=claims')
+        assert [c[1] for c in airtable.calls if c[0] == 'get'] == ['Projects', 'Updates']
+
+    def test_follows_cache_deletes_and_renumbers(self, client, hub):
+        client.get('/api/search?q=winter')
+        hub._write_through_removed('Projects', 'recP3')
+        renumbered = hub._table_caches['Projects'].get('recP1')
+        hub._write_through('Projects', {**renumbered, 'fields': {**renumbered['fields'], 'Job Number': 'SKY 021'}})
+        assert [r['jobNumber'] for r in client.get('/api/search?q=winter').get_json()] == ['SKY 021']
+
+    def test_hub_writes_are_searchable(self, client):
+        client.get('/api/search?q=winter')
+        client.post('/api/job/SKY 018/update', json={'description': 'Rugby sponsorship', 'message': 'Kit samples in'})
+        assert [r['jobNumber'] for r in client.get('/api/search?q=rugby').get_json()] == ['SKY 018']
+        assert sorted(r['type'] for r in client.get('/api/search?q=kit').get_json()) == ['job', 'update']
+
+
+def unreachable(method, url, **kwargs):
+    """FakeAirtable route for a table whose requests fail."""
+    raise requests.ConnectionError('Airtable unreachable')
+
+
+def bootstrap_island(html):
+    match = re.search(r'<script id="hub-bootstrap" type="application/json">(.*?)</script>', html)
+    return json.loads(match.group(1)) if match else None
+
+
+class TestBootstrap:
+
+    def test_logged_out(self, client):
+        assert client.get('/api/bootstrap').get_json() == {'authenticated': False}
+
+    def test_full_access(self, client, hub):
+        login(client, hub)
+        data = client.get('/api/bootstrap?todos=1').get_json()
+        assert data['user']['accessLevel'] == 'Full'
+        assert [c['code'] for c in data['clients']] == ['SKY', 'TOW']
+        assert sorted(j['jobNumber'] for j in data['jobs']) == ['SKY 017', 'SKY 018', 'TOW 066']
+        assert len(data['todos']) == 1
+        assert data['jobsCursor']
+        assert 'errors' not in data
+
+    def test_scoped_session(self, client, hub):
+        login(client, hub, 'Client WIP', 'TOW')
+        data = client.get('/api/bootstrap?todos=1').get_json()
+        assert [j['jobNumber'] for j in data['jobs']] == ['TOW 066']
+        assert 'todos' not in data
+
+    def test_failed_section_is_null(self, client, hub, airtable):
+        login(client, hub)
+        airtable.routes['/Clients'] = unreachable
+        data = client.get('/api/bootstrap').get_json()
+        assert data['clients'] is None
+        assert 'clients' in data['errors']
+        assert len(data['jobs']) == 3
+
+
+class TestIndexIsland:
+
+    def test_logged_out_gets_plain_page(self, client):
+        assert bootstrap_island(client.get('/').get_data(as_text=True)) is None
+
+    def test_logged_in_gets_island(self, client, hub):
+        login(client, hub)
+        response = client.get('/')
+        assert response.headers['Cache-Control'] == 'no-store'
+        data = bootstrap_island(response.get_data(as_text=True))
+        assert data['authenticated'] is True
+        assert sorted(j['jobNumber'] for j in data['jobs']) == ['SKY 017', 'SKY 018', 'TOW 066']
+
+    def test_island_is_scoped(self, client, hub):
+        login(client, hub)
+        client.get('/')  # warm the agency-wide entry
+        login(client, hub, 'Client WIP', 'SKY')
+        data = bootstrap_island(client.get('/').get_data(as_text=True))
+        assert sorted(j['jobNumber'] for j in data['jobs']) == ['SKY 017', 'SKY 018']
+
+    def test_values_cannot_close_the_script(self, client, hub, airtable):
+        airtable.tables['Projects'][0]['fields']['Project Name'] = '</script><script>alert(1)</script>'
+        login(client, hub)
+        html = client.get('/').get_data(as_text=True)
+        assert '<script>alert(1)' not in html
+        assert bootstrap_island(html)['jobs'][0]['jobName'] == '</script><script>alert(1)</script>'
+
+
+class TestAirtableOutage:
+
+    def test_serves_last_good_response(self, client, airtable):
+        fresh = client.get('/api/clients')
+        airtable.routes['/Clients'] = unreachable
+        stale = client.get('/api/clients')
+        assert stale.status_code == 200
+        assert stale.get_json() == fresh.get_json()
+        assert stale.headers['X-Hub-Stale'] == 'true'
+
+    def test_breaker_opens_and_fails_fast(self, client, hub, airtable):
+        airtable.routes['/Clients'] = unreachable
+        for _ in range(hub.AIRTABLE_BREAKER_FAILURES):
+            assert client.get('/api/clients').status_code == 500
+        assert client.get('/api/health').get_json()['airtableOpenCircuits'] == ['Clients']
+
+        calls = len(airtable.calls)
+        response = client.get('/api/clients')
+        assert response.status_code == 500
+        assert 'unavailable' in response.get_json()['error']
+        assert len(airtable.calls) == calls  # not sent
+        assert client.get('/api/jobs/all').status_code == 200  # other tables unaffected
+
+    def test_client_errors_are_not_failures(self, client, hub, airtable):
+        airtable.routes['/Clients'] = lambda method, url, **kwargs: FakeResponse({'error': 'INVALID'}, 422)
+        for _ in range(hub.AIRTABLE_BREAKER_FAILURES + 1):
+            client.get('/api/clients')
+        assert client.get('/api/health').get_json()['airtableOpenCircuits'] == []
+
+
+class TestHedgedReads:
+
+    @pytest.fixture
+    def slow(self, hub, monkeypatch):
+        """Make requests.get answer the i-th call after delays[i] with statuses[i]."""
+        monkeypatch.setattr(hub, '_hedge_delay', lambda table: 0.05)
+        calls = []
+
+        def setup(*answers):
+            def get(url, **kwargs):
+                delay, status = answers[len(calls)]
+                calls.append(url)
+                time.sleep(delay)
+                return FakeResponse({'records': []}, status)
+            monkeypatch.setattr(hub.requests, 'get', get)
+            return calls
+        return setup
+
+    def test_fast_5xx_does_not_beat_a_hedge_in_flight(self, hub, slow):
+        calls = slow((0.1, 503), (0.2, 200))
+        assert hub._hedged_get('Clients', 'https://x/Clients', {}).status_code == 200
+        assert len(calls) == 2
+
+    def test_429_does_not_win(self, hub, slow):
+        slow((0.1, 429), (0.2, 200))
+        assert hub._hedged_get('Clients', 'https://x/Clients', {}).status_code == 200
+
+    def test_both_failing_returns_the_error_response(self, hub, slow):
+        slow((0.1, 503), (0.05, 502))
+        assert hub._hedged_get('Clients', 'https://x/Clients', {}).status_code in (502, 503)
+
+
+class TestUnchangedWrites:
+
+    def test_resubmitted_form_is_not_sent(self, client, airtable):
+        result = client.post('/api/job/SKY 017/update', json={'stage': 'Craft', 'projectName': 'Winter campaign'})
+        assert result.get_json()['skipped'] is True
+        assert airtable.writes('Projects') == []
+
+    def test_revert_of_an_airtable_edit_is_sent(self, client, airtable):
+        client.get('/api/jobs/all')
+        airtable.tables['Projects'][0]['fields']['Stage'] = 'Refine'  # edited in Airtable; cache still says Craft
+        result = client.post('/api/job/SKY 017/update', json={'stage': 'Craft', 'projectName': 'Winter campaign'})
+        assert result.get_json()['skipped'] is False
+        [(_, _, patch)] = airtable.writes('Projects')
+        assert patch['json']['fields'] == {'Stage': 'Craft'}
+        assert airtable.tables['Projects'][0]['fields']['Stage'] == 'Craft'
+
+    def test_only_rereads_when_something_would_be_skipped(self, client, airtable):
+        client.get('/api/jobs/all')
+        reads = len(airtable.calls)
+        client.post('/api/job/SKY 017/update', json={'stage': 'Refine'})
+        assert [c[0] for c in airtable.calls[reads:]] == ['patch']
+
+
+class TestPeopleDirectory:
+
+    def test_reads_come_from_the_people_cache(self, client, airtable):
+        assert [p['name'] for p in client.get('/api/people/SKY').get_json()] == ['Ana Rewi']
+        client.get('/api/people/SKY')
+        assert [c[1] for c in airtable.calls if c[0] == 'get'] == ['People']
+
+    def test_follows_cache_changes(self, client, hub):
+        client.get('/api/people/SKY')
+        hub._write_through_removed('People', 'recA')  # e.g. deleted in Airtable, via the webhook
+        assert client.get('/api/people/SKY').get_json() == []
+
+    def test_created_person_is_known_straight_away(self, client, airtable):
+        person = {'firstName': 'Tui', 'lastName': 'Moana', 'email': 'tui@hunch.co.nz', 'access': 'Full'}
+        assert client.post('/api/people', json=person).status_code == 200
+        assert client.post('/api/people', json=person).status_code == 409
+        assert len(airtable.writes('People')) == 1
+
+
+class TestLoginConfirmsPeople:
+
+    @pytest.fixture(autouse=True)
+    def configured(self, hub, monkeypatch):
+        monkeypatch.setattr(hub, 'AIRTABLE_API_KEY', 'keyTest')
+
+    def delete_in_airtable(self, airtable, record_id):
+        airtable.tables['People'] = [r for r in airtable.tables['People'] if r['id'] != record_id]
+
+    def test_pin_login(self, client):
+        assert client.post('/api/verify-pin', json={'pin': '4821'}).status_code == 200
+
+    def test_deleted_owner_cannot_use_the_pin(self, client, airtable):
+        client.get('/api/people/SKY')  # People cached before the delete
+        self.delete_in_airtable(airtable, 'recM')
+        assert client.post('/api/verify-pin', json={'pin': '4821'}).status_code == 401
+
+    def test_deleted_person_cannot_use_a_magic_link(self, client, hub, airtable):
+        client.get('/api/people/SKY')
+        token = hub.generate_token('ana@sky.co.nz', 'SKY', 'Ana', 'Client WIP')
+        assert 'error' not in client.get(f'/verify?token={token}').headers['Location']
+        self.delete_in_airtable(airtable, 'recA')
+        assert client.get(f'/verify?token={token}').headers['Location'] == '/?error=invalid'
+        assert client.get('/api/people/SKY').get_json() == []  # and the cache has caught up
+
+    def test_deleted_person_cannot_request_a_link(self, client, airtable):
+        client.get('/api/people/SKY')
+        self.delete_in_airtable(airtable, 'recA')
+        assert client.post('/api/request-login', json={'email': 'ana@sky.co.nz'}).status_code == 404
+
+    def test_airtable_down_keeps_the_cached_person(self, client, hub, monkeypatch):
+        client.get('/api/people/SKY')
+        monkeypatch.setattr(hub.requests, 'get', unreachable)
+        assert client.post('/api/verify-pin', json={'pin': '4821'}).status_code == 200
+
+
+WEBHOOK_SECRET = base64.b64encode(b'0123456789abcdef0123456789abcdef').decode()
+
+
+class TestAirtableWebhook:
+
+    @pytest.fixture
+    def webhook(self, hub, airtable, monkeypatch):
+        """Configures webhook 'ach1'; returns the list its payloads are served from."""
+        monkeypatch.setattr(hub, 'AIRTABLE_WEBHOOK_ID', 'ach1')
+        monkeypatch.setattr(hub, 'AIRTABLE_WEBHOOK_SECRET', WEBHOOK_SECRET)
+        payloads = []
+
+        def list_payloads(method, url, params=None, **kwargs):
+            start = params['cursor'] - 1
+            return {'payloads': payloads[start:], 'cursor': len(payloads) + 1, 'mightHaveMore': False}
+
+        airtable.routes['/meta/bases/'] = lambda method, url, **kwargs: {
+            'tables': [{'id': 'tblProjects', 'name': 'Projects'}, {'id': 'tblUpdates', 'name': 'Updates'}]}
+        airtable.routes['/webhooks/ach1/payloads'] = list_payloads
+        airtable.routes['/webhooks/ach1/refresh'] = lambda method, url, **kwargs: {
+            'expirationTime': '2026-10-26T00:00:00.000Z'}
+        return payloads
+
+    def notify(self, client, webhook_id='ach1', secret=WEBHOOK_SECRET):
+        body = json.dumps({'base': {'id': 'app1'}, 'webhook': {'id': webhook_id},
+                           'timestamp': '2026-10-19T00:00:00.000Z'}).encode()
+        return client.post('/api/airtable-webhook', data=body, content_type='application/json',
+                           headers={webhooks.MAC_HEADER: webhooks.content_mac(secret, body)})
+
+    def test_not_configured(self, client):
+        assert self.notify(client).status_code == 503
+
+    def test_rejects_bad_mac_and_unknown_webhook(self, client, webhook):
+        other = base64.b64encode(b'x' * 32).decode()
+        assert self.notify(client, secret=other).status_code == 401
+        assert self.notify(client, webhook_id='ach2').status_code == 400
+
+    def test_applies_changes_and_advances_cursor(self, client, hub, airtable, webhook):
+        client.get('/api/jobs/all')  # load the Projects cache
+        airtable.tables['Projects'][0]['fields']['Stage'] = 'Refine'  # edited in Airtable
+        webhook.append({'changedTablesById': {'tblProjects': {'changedRecordsById': {'recP1': {}}}}})
+        response = self.notify(client)
+        assert response.get_json()['tables'] == {'Projects': {'changed': 1, 'destroyed': 0}}
+        assert client.get('/api/job/SKY 017').get_json()['stage'] == 'Refine'
+        assert hub._webhook_cursors.get('ach1') == 2
+
+        assert self.notify(client).get_json()['tables'] == {}  # nothing new past the cursor
+
+    def test_delete_reaches_scoped_stream(self, client, hub, airtable, webhook):
+        client.get('/api/search?q=sport')
+        client.get('/api/jobs/all')
+        airtable.tables['Projects'] = [r for r in airtable.tables['Projects'] if r['id'] != 'recP2']
+        webhook.append({'changedTablesById': {'tblProjects': {'destroyedRecordIds': ['recP2']}}})
+        login(client, hub, 'Client WIP', 'SKY')
+        stream = client.get('/api/events')
+        self.notify(client)
+        [event] = read_events(stream, 1)
+        assert (event['action'], event['jobNumber'], event['clientCode']) == ('deleted', 'SKY 018', 'SKY')
+        stream.close()
+        assert client.get('/api/search?q=sport').get_json() == []
+
+    def test_refresh_extends_expiry(self, hub, airtable, webhook):
+        assert hub._refresh_webhook() == '2026-10-26T00:00:00.000Z'
+        assert airtable.calls[-1][0] == 'post'
+
+
+class TestBatch:
+
+    def test_reads_wait_for_earlier_writes(self, client):
+        results = client.post('/api/batch', json={'ops': [
+            {'id': 'save', 'method': 'POST', 'path': '/api/job/SKY 017/update', 'body': {'stage': 'Refine'}},
+            {'id': 'job', 'path': '/api/job/SKY 017'},
+            {'id': 'jobs', 'path': '/api/jobs/all'},
+        ]}).get_json()['results']
+        assert [r['status'] for r in results] == [200, 200, 200]
+        assert results[1]['body']['stage'] == 'Refine'
+        assert 'X-Jobs-Cursor' in results[2]['headers']
+
+    def test_failed_dependency_is_not_run(self, client, airtable):
+        results = client.post('/api/batch', json={'ops': [
+            {'id': 'a', 'method': 'POST', 'path': '/api/job/SKY 999/update', 'body': {'stage': 'Refine'}},
+            {'id': 'b', 'method': 'POST', 'path': '/api/job/SKY 017/update', 'body': {'stage': 'Refine'},
+             'dependsOn': ['a']},
+            {'id': 'c', 'path': '/api/clients', 'dependsOn': []},
+        ]}).get_json()['results']
+        assert [r['status'] for r in results] == [404, 424, 200]
+        assert airtable.writes() == []
+
+    def test_sub_requests_keep_the_session(self, client, hub):
+        login(client, hub, 'Client WIP', 'TOW')
+        [result] = client.post('/api/batch', json={'ops': [{'path': '/api/jobs/all?client=SKY'}]}).get_json()['results']
+        assert [j['jobNumber'] for j in result['body']] == ['TOW 066']
+
+    @pytest.mark.parametrize('path', ['/api/verify-pin', '/api/request-login', '/api/batch', '/api/events'])
+    def test_rejects_excluded_paths(self, client, path):
+        ops = [{'method': 'POST', 'path': path, 'body': {'pin': '0000'}, 'dependsOn': []}] * 5
+        assert client.post('/api/batch', json={'ops': [dict(op, id=str(i)) for i, op in enumerate(ops)]}).status_code == 400
+
+    @pytest.mark.parametrize('method,path', [
+        ('GET', '/api/event%73'), ('POST', '/api/verify%2Dpin'), ('POST', '/api/%62atch'),
+        ('GET', '/api/events?x=1'), ('POST', '/api/%6cogout'),
+    ])
+    def test_rejects_encoded_excluded_paths(self, client, method, path):
+        assert client.post('/api/batch', json={'ops': [{'method': method, 'path': path}]}).status_code == 400
+
+    def test_refuses_streamed_responses(self, client, hub, monkeypatch):
+        monkeypatch.setattr(hub, 'BATCH_EXCLUDED_ENDPOINTS', set())  # as if a new stream route slipped the list
+        [result] = client.post('/api/batch', json={'ops': [{'path': '/api/events'}]}).get_json()['results']
+        assert result['status'] == 400
+
+    def test_rejects_malformed(self, client):
+        assert client.post('/api/batch', json={}).status_code == 400
+        assert client.post('/api/batch', json={'ops': [{'path': '/api/clients', 'dependsOn': ['later']},
+                                                       {'id': 'later', 'path': '/api/clients'}]}).status_code == 400
+
+
+class TestNewJob:
+
+    def test_numbers_come_from_one_reserved_block(self, client, hub, airtable):
+        hub.JOB_NUMBER_BLOCK = 5
+        first = client.post('/api/new-job', json={'clientCode': 'SKY', 'jobName': 'Spring sale'}).get_json()
+        assert first['jobNumber'] == 'SKY 020'
+        assert [c[2]['json'] for c in airtable.writes('Clients')] == [{'fields': {'Next #': 25}}]
+        second = client.post('/api/new-job', json={'clientCode': 'SKY', 'jobName': 'Summer sale'}).get_json()
+        assert second['jobNumber'] == 'SKY 021'
+        assert len(airtable.writes('Clients')) == 1
+        assert client.get('/api/preview-job-number/SKY').get_json()['previewJobNumber'] == 'SKY 022'
+
+    def test_skips_numbers_already_in_projects(self, client, hub, airtable):
+        airtable.tables['Clients'][0]['fields'].update({'Next Job #': 'SKY 017', 'Next #': 17})
+        client.get('/api/jobs/all')  # loads the Projects cache
+        created = client.post('/api/new-job', json={'clientCode': 'SKY', 'jobName': 'Spring sale'}).get_json()
+        assert created['jobNumber'] == 'SKY 019'
+
+    def test_leases_in_memory_without_state_db(self, hub):
+        assert type(hub._job_number_leases) is jobnumbers.JobNumberLeases  # no file created at import
+
+    def test_unknown_client(self, client, airtable):
+        assert client.post('/api/new-job', json={'clientCode': 'ZZZ', 'jobName': 'X'}).status_code == 404
+        assert airtable.writes() == []
+
+
+class TestTrackerPortfolio:
+
+    def test_totals_sum_the_clients(self, client, hub):
+        login(client, hub)
+        body = client.get('/api/tracker/portfolio').get_json()
+        assert [c['code'] for c in body['clients']] == ['SKY', 'TOW']
+        for window in ('previousQuarter', 'currentQuarter', 'yearToDate'):
+            assert body['totals'][window]['spent'] == sum(c[window]['spent'] for c in body['clients'])
+        assert body['clients'][0]['currentQuarter']['committed'] == 30000
+
+    def test_cached_until_the_tracker_moves(self, client, hub, airtable):
+        login(client, hub)
+        client.get('/api/tracker/portfolio')
+        reads = len([c for c in airtable.calls if c[1] == 'Clients'])
+        client.get('/api/tracker/portfolio')
+        assert len([c for c in airtable.calls if c[1] == 'Clients']) == reads
+        hub._table_caches['Tracker'].upsert(dict(airtable.tables['Tracker'][0], fields={
+            **airtable.tables['Tracker'][0]['fields'], 'Spend': 99999}))
+        client.get('/api/tracker/portfolio')
+        assert len([c for c in airtable.calls if c[1] == 'Clients']) == reads + 1
+
+    def test_client_scoped_sessions_are_refused(self, client, hub):
+        login(client, hub, 'Client WIP', 'SKY')
+        assert client.get('/api/tracker/portfolio').status_code == 403
+
+
+class TestTrackerQuarterView:
+
+    def test_rows_grouped_into_the_financial_year(self, client, hub):
+        flat = client.get('/api/tracker/data?client=SKY').get_json()
+        body = client.get('/api/tracker/data?client=SKY&view=quarter').get_json()
+        assert body['yearEnd'] == 'June'
+        assert [q['months'][0] for q in body['quarters']] == ['July', 'October', 'January', 'April']
+        assert sum(q['isCurrent'] for q in body['quarters']) == 1
+        assert body['unplaced'] == []
+        assert sum(q['spend'] for q in body['quarters']) == sum(r['spend'] for r in flat)
+        for quarter in body['quarters']:
+            for job in quarter['jobs']:
+                assert job['jobNumber'] == 'SKY 017'
+                assert job['jobDescription'] == 'Hoardings for the winter sale'
+                assert all(m['month'] in quarter['months'] for m in job['months'])
+
+    def test_scoped_session_gets_its_own_client(self, client, hub):
+        login(client, hub, 'Client Tracker', 'TOW')
+        body = client.get('/api/tracker/data?client=SKY&view=quarter').get_json()
+        assert body['client'] == 'TOW'
+        assert body['quarters'][0]['months'][0] == 'April'
+
+    def test_wip_only_sessions_are_refused(self, client, hub):
+        login(client, hub, 'Client WIP', 'TOW')
+        assert client.get('/api/tracker/data?client=TOW&view=quarter').status_code == 403
+
+    def test_client_without_year_end(self, client, airtable):
+        airtable.tables['Clients'][0]['fields']['Year end'] = ''
+        response = client.get('/api/tracker/data?client=SKY&view=quarter')
+        assert response.status_code == 400
+        assert client.get('/api/tracker/data?client=SKY').status_code == 200
+
+
+class TestTrackerClients:
+
+    def test_all_clients(self, client):
+        body = client.get('/api/tracker/clients').get_json()
+        assert [c['code'] for c in body] == ['SKY', 'TOW']
+        assert all('rolloverObject' in c and 'chartMonths' in c for c in body)
+
+    def test_one_client(self, client, airtable):
+        [sky] = client.get('/api/tracker/clients?client=SKY').get_json()
+        assert sky['code'] == 'SKY'
+        assert sky == client.get('/api/tracker/clients').get_json()[0]
+        scoped = [c[2]['params'] for c in airtable.calls if c[1] in ('Clients', 'Budget History')][:2]
+        assert [p.get('filterByFormula') for p in scoped] == ["{Client code} = 'SKY'", "{Client} = 'SKY'"]
+
+    def test_scoped_session_gets_its_own_client(self, client, hub):
+        login(client, hub, 'Client Tracker', 'TOW')
+        assert [c['code'] for c in client.get('/api/tracker/clients?client=SKY').get_json()] == ['TOW']
+
+    def test_list_view(self, client, airtable):
+        body = client.get('/api/tracker/clients?view=list').get_json()
+        assert [c['code'] for c in body] == ['SKY', 'TOW']
+        assert set(body[0]) == {'code', 'name', 'committed', 'rollover', 'rolloverUseIn', 'yearEnd', 'currentQuarter'}
+        assert {c[1] for c in airtable.calls} == {'Clients'}
+
+
+class TestTrackerRange:
+
+    @staticmethod
+    def tracker_year(year_end='June'):
+        """(first, last) month of the year the tracker shows today, as YYYY-MM."""
+        index = tracker.build_range_index('SKY', date.today(), year_end, [], {}, [])
+        return index['start'], index['end']
+
+    def test_window_within_tracker_year(self, client):
+        first, last = self.tracker_year()
+        year = client.get(f'/api/tracker/range?client=SKY&from={first}&to={last}').get_json()
+        assert (year['spendFrom'], year['spendTo'], year['months']) == (first, last, 12)
+        assert year['committed'] == 120000
+        assert year['spent'] == sum(1000 + i * 37 for i in range(0, 24, 2))
+        assert year['variance'] == year['committed'] - year['spent']
+
+    def test_window_before_tracker_year_is_refused(self, client):
+        first, _ = self.tracker_year()
+        before = f'{int(first[:4]) - 1}{first[4:]}'
+        response = client.get(f'/api/tracker/range?client=SKY&from={before}&to={first}')
+        assert response.status_code == 400
+        assert 'tracker year' in response.get_json()['error']
+
+    def test_unknown_clients_are_not_cached(self, client, hub):
+        for i in range(3):
+            assert client.get(f'/api/tracker/range?client=NO{i}&from=2026-01&to=2026-01').status_code == 404
+        assert len(hub._client_inputs_cache) == 0
+        assert len(hub._range_index_cache) == 0
+
+    def test_caches_are_bounded(self, client, hub, airtable):
+        first, _ = self.tracker_year()
+        hub._client_inputs_cache.max_entries = hub._range_index_cache.max_entries = 1
+        for code in ('SKY', 'TOW'):
+            client.get(f'/api/tracker/range?client={code}&from={first}&to={first}')
+        assert len(hub._client_inputs_cache) == len(hub._range_index_cache) == 1
+
+    def test_inputs_are_reused(self, client, airtable):
+        first, last = self.tracker_year()
+        client.get(f'/api/tracker/range?client=SKY&from={first}&to={first}')
+        reads = len([c for c in airtable.calls if c[1] == 'Clients'])
+        client.get(f'/api/tracker/range?client=SKY&from={last}&to={last}')
+        assert len([c for c in airtable.calls if c[1] == 'Clients']) == reads
+
+
+class TestTrackerSimulate:
+
+    def simulate(self, test_client, **body):
+        return test_client.post('/api/tracker/simulate', json={'client': 'SKY', **body})
+
+    def test_scenario_against_baseline(self, client):
+        this_month = MONTHS[date.today().month - 1]
+        body = self.simulate(client, quarters=3, scenarios=[
+            {'name': 'Extra shoot', 'entries': [{'month': this_month, 'spend': 5000}]}]).get_json()
+        [scenario] = body['scenarios']
+        assert scenario['name'] == 'Extra shoot'
+        assert len(body['baseline']) == len(scenario['quarters']) == 3
+        assert (scenario['quarters'][0]['nextQuarter']['banking']
+                == body['baseline'][0]['nextQuarter']['banking'] - 5000)
+
+    def test_at_most_three_quarters(self, client):
+        assert self.simulate(client, quarters=4, scenarios=[{'entries': []}]).status_code == 400
+
+    def test_bad_requests(self, client):
+        assert self.simulate(client, scenarios=[]).status_code == 400
+        assert self.simulate(client, scenarios=[{'entries': [{'month': 'Someday', 'spend': 1}]}]).status_code == 400
+        assert self.simulate(client, client='ZZZ', scenarios=[{'entries': []}]).status_code == 404
+
+    @pytest.mark.parametrize('spend', [{'amount': 1}, [1], True, 'inf', 'nan', '-Infinity', 'lots',
+                                       pytest.param(10 ** 400, id='huge')])
+    def test_rejects_spend_that_isnt_a_finite_number(self, client, spend):
+        this_month = MONTHS[date.today().month - 1]
+        response = self.simulate(client, scenarios=[{'entries': [{'month': this_month, 'spend': spend}]}])
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'spend must be a finite number'
+
+    def test_accepts_money_text(self, client):
+        this_month = MONTHS[date.today().month - 1]
+        response = self.simulate(client, scenarios=[{'entries': [{'month': this_month, 'spend': '$1,500'}]}])
+        assert response.status_code == 200
+
+
+class TestTrackerPool:
+
+    @pytest.fixture
+    def sent(self, hub, monkeypatch):
+        """Clients handed to the (real, spawned) process pool, one list per fan-out."""
+        monkeypatch.setattr(hub, 'TRACKER_WORKERS', 2)
+        monkeypatch.setattr(hub, 'TRACKER_POOL_MIN_CLIENTS', 1)
+        calls = []
+        parallel = hub._tracker_rollovers_parallel
+
+        def recording(clients, *args):
+            calls.append([code for code, _ in clients])
+            return parallel(clients, *args)
+        monkeypatch.setattr(hub, '_tracker_rollovers_parallel', recording)
+        yield calls
+        if hub._tracker_pool is not None:
+            hub._tracker_pool.shutdown()
+
+    def test_matches_in_process(self, client, hub, sent, monkeypatch):
+        pooled = client.get('/api/tracker/clients').get_json()
+        assert sent == [['SKY', 'TOW']]
+        monkeypatch.setattr(hub, 'TRACKER_WORKERS', 0)
+        monkeypatch.setattr(hub, '_rollover_memo', hub.memostore.MemoStore())
+        assert client.get('/api/tracker/clients').get_json() == pooled
+
+    def test_only_memo_misses_are_sent(self, client, hub, airtable, sent):
+        client.get('/api/tracker/clients')
+        client.get('/api/tracker/clients')
+        assert sent == [['SKY', 'TOW']]  # second request: every closed quarter memoised
+        closed_month = MONTHS[(date.today().month - 4) % 12]  # in the quarter before today's
+        hub._table_caches['Tracker'].upsert({'id': 'recKnew', 'fields': {
+            'Client Code': ['SKY'], 'Month': closed_month, 'Spend': 500, 'Spend type': 'Project budget'}})
+        client.get('/api/tracker/clients')
+        assert sent == [['SKY', 'TOW'], ['SKY']]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,193 @@
+"""
+test_jobnumbers.py — job number format parsing, lease hand-out and refills,
+concurrent takes, SQLite persistence
+
+Run: pytest test_jobnumbers.py -v
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from jobnumbers import JobNumberLeases, SqliteJobNumberLeases, format_job_number, job_number_format
+from ratelimit import SqliteAttemptLimiter
+
+
+class FakeClient:
+    """Stands in for the Clients record: reserves blocks by moving Next #."""
+
+    def __init__(self, next_num=59, block=3, prefix='HUN '):
+        self.prefix = prefix
+        self.next_num = next_num
+        self.block = block
+        self.refills = 0
+
+    def refill(self):
+        self.refills += 1
+        start = self.next_num
+        self.next_num += self.block
+        return self.prefix, 3, start, start + self.block
+
+
+@pytest.fixture
+def make_leases(state_db):
+    def make():
+        if state_db is None:
+            return JobNumberLeases()
+        return SqliteJobNumberLeases(state_db)
+    return make
+
+
+class TestFormat:
+
+    def test_parse(self):
+        assert job_number_format('HUN 059', 59) == ('HUN ', 3)
+        assert job_number_format('ONE 1002', '1002') == ('ONE ', 4)
+
+    def test_mismatch(self):
+        assert job_number_format('HUN 059', 60) is None
+        assert job_number_format('', 1) is None
+        assert job_number_format('HUN', 1) is None
+        assert job_number_format('HUN 059', None) is None
+
+    def test_round_trip(self):
+        assert format_job_number('HUN ', 3, 7) == 'HUN 007'
+        assert format_job_number('HUN ', 3, 1000) == 'HUN 1000'
+
+
+class TestLeases:
+
+    def test_one_refill_per_block(self, make_leases):
+        leases, client = make_leases(), FakeClient()
+        taken = [leases.take('HUN', client.refill) for _ in range(4)]
+        assert taken == ['HUN 059', 'HUN 060', 'HUN 061', 'HUN 062']
+        assert client.refills == 2
+        assert leases.remaining('HUN') == 2
+
+    def test_peek_shows_next_without_taking(self, make_leases):
+        leases, client = make_leases(), FakeClient()
+        assert leases.peek('HUN') is None
+        leases.take('HUN', client.refill)
+        assert leases.peek('HUN') == 'HUN 060'
+        assert leases.peek('HUN') == 'HUN 060'
+        assert leases.take('HUN', client.refill) == 'HUN 060'
+
+    def test_clients_are_separate(self, make_leases):
+        leases = make_leases()
+        hun, sky = FakeClient(59), FakeClient(17, prefix='SKY ')
+        assert leases.take('HUN', hun.refill) == 'HUN 059'
+        assert leases.take('SKY', sky.refill) == 'SKY 017'
+        assert leases.peek('HUN') == 'HUN 060'
+
+    def test_failed_refill(self, make_leases):
+        leases = make_leases()
+        assert leases.take('HUN', lambda: None) is None
+        assert leases.peek('HUN') is None
+
+    def test_refill_error_propagates(self, make_leases):
+        leases = make_leases()
+
+        def broken():
+            raise RuntimeError('Airtable down')
+        with pytest.raises(RuntimeError):
+            leases.take('HUN', broken)
+        assert leases.take('HUN', FakeClient().refill) == 'HUN 059'
+
+    def test_concurrent_takes_are_unique(self, make_leases):
+        leases, client = make_leases(), FakeClient(block=5)
+        taken = []
+
+        def worker():
+            for _ in range(10):
+                taken.append(leases.take('HUN', client.refill))
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(taken)) == 40
+        assert client.refills == 8
+
+
+class TestSqlitePersistence:
+
+    def test_unused_lease_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        client = FakeClient()
+        SqliteJobNumberLeases(path).take('HUN', client.refill)
+        restarted = SqliteJobNumberLeases(path)
+        assert restarted.take('HUN', client.refill) == 'HUN 060'
+        assert client.refills == 1
+
+    def test_refill_holds_no_sqlite_lock(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        limiter = SqliteAttemptLimiter(path, 5, 300)
+        client = FakeClient()
+
+        def refill():
+            limiter.fail('1.2.3.4')  # another store writing to the same file, mid-refill
+            return client.refill()
+        assert SqliteJobNumberLeases(path).take('HUN', refill) == 'HUN 059'
+
+    def test_processes_take_turns_refilling(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        first, second = SqliteJobNumberLeases(path), SqliteJobNumberLeases(path)
+        client = FakeClient()
+        refilling, release = threading.Event(), threading.Event()
+
+        def slow_refill():
+            refilling.set()
+            release.wait(5)
+            return client.refill()
+        taken = []
+        thread = threading.Thread(target=lambda: taken.append(first.take('HUN', slow_refill)))
+        thread.start()
+        refilling.wait(5)
+        waiter = threading.Thread(target=lambda: taken.append(second.take('HUN', client.refill)))
+        waiter.start()
+        release.set()
+        thread.join()
+        waiter.join()
+        assert sorted(taken) == ['HUN 059', 'HUN 060']
+        assert client.refills == 1  # the second waited for the first's block
+
+    def test_lapsed_claim_is_taken_over(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        dead = SqliteJobNumberLeases(path, claim_seconds=0.1)
+        assert dead._claim_refill(dead._conn(), 'HUN')  # claimed, then the process died
+        assert SqliteJobNumberLeases(path, timeout=5).take('HUN', FakeClient().refill) == 'HUN 059'
+
+    def test_failed_refill_releases_claim(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        leases = SqliteJobNumberLeases(path)
+
+        def broken():
+            raise ConnectionError('Airtable unreachable')
+        with pytest.raises(ConnectionError):
+            leases.take('HUN', broken)
+        assert SqliteJobNumberLeases(path, timeout=0.2).take('HUN', FakeClient().refill) == 'HUN 059'
+
+    def test_file_from_before_refill_claims(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE job_number_leases (client_code TEXT PRIMARY KEY, prefix TEXT NOT NULL,'
+                     ' width INTEGER NOT NULL, next INTEGER NOT NULL, end INTEGER NOT NULL)')
+        conn.execute("INSERT INTO job_number_leases VALUES ('HUN', 'HUN ', 3, 60, 62)")
+        conn.commit()
+        conn.close()
+        client = FakeClient(next_num=62)
+        leases = SqliteJobNumberLeases(path)
+        assert [leases.take('HUN', client.refill) for _ in range(3)] == ['HUN 060', 'HUN 061', 'HUN 062']
+        assert client.refills == 1
+
+    def test_waiting_on_a_stuck_refill_times_out(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        holder = SqliteJobNumberLeases(path)
+        assert holder._claim_refill(holder._conn(), 'HUN')
+        with pytest.raises(TimeoutError):
+            SqliteJobNumberLeases(path, timeout=0.2).take('HUN', FakeClient().refill)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
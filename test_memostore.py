@@ -0,0 +1,83 @@
+"""
+test_memostore.py — fingerprint hits and misses, copies, bounds, SQLite persistence
+
+Run: pytest test_memostore.py -v
+"""
+
+import pytest
+
+from conftest import Clock
+from memostore import MemoStore, SqliteMemoStore
+
+
+@pytest.fixture
+def make_store(state_db):
+    def make(max_entries=10000):
+        if state_db is None:
+            return MemoStore(max_entries=max_entries)
+        return SqliteMemoStore(state_db, max_entries=max_entries, clock=Clock(step=1))
+    return make
+
+
+class TestMemo:
+
+    def test_hit_needs_same_fingerprint(self, make_store):
+        store = make_store()
+        store.put('SKY|2026-01-01', 'fp1', {'banking': 26000})
+        assert store.get('SKY|2026-01-01', 'fp1') == {'banking': 26000}
+        assert store.get('SKY|2026-01-01', 'fp2') is None
+        assert store.get('TOW|2026-01-01', 'fp1') is None
+
+    def test_put_replaces(self, make_store):
+        store = make_store()
+        store.put('k', 'fp1', 1)
+        store.put('k', 'fp2', 2)
+        assert store.get('k', 'fp1') is None
+        assert store.get('k', 'fp2') == 2
+        assert len(store) == 1
+
+    def test_returns_copy(self, make_store):
+        store = make_store()
+        store.put('k', 'fp', {'lastQuarter': {'remaining': 5}})
+        store.get('k', 'fp')['lastQuarter']['remaining'] = 0
+        assert store.get('k', 'fp') == {'lastQuarter': {'remaining': 5}}
+
+    def test_none_values_round_trip_as_none(self, make_store):
+        store = make_store()
+        store.put('k', 'fp', {'lastQuarter': None})
+        assert store.get('k', 'fp') == {'lastQuarter': None}
+
+
+class TestBounds:
+
+    def test_memory_evicts_least_recently_used(self):
+        store = MemoStore(max_entries=2)
+        store.put('a', 'fp', 1)
+        store.put('b', 'fp', 2)
+        store.get('a', 'fp')
+        store.put('c', 'fp', 3)
+        assert store.get('b', 'fp') is None
+        assert store.get('a', 'fp') == 1
+
+    def test_sqlite_cap(self, tmp_path):
+        store = SqliteMemoStore(str(tmp_path / 'state.db'), max_entries=10, clock=Clock(step=1))
+        for i in range(SqliteMemoStore.CAP_CHECK_EVERY):
+            store.put(f'k{i}', 'fp', i)
+        assert len(store) == 10
+        assert store.get(f'k{SqliteMemoStore.CAP_CHECK_EVERY - 1}', 'fp') is not None
+
+
+class TestSqlite:
+
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        SqliteMemoStore(path, table='rollover_memo').put('k', 'fp', [1, 2])
+        assert SqliteMemoStore(path, table='rollover_memo').get('k', 'fp') == [1, 2]
+
+    def test_bad_table_name(self, tmp_path):
+        with pytest.raises(ValueError):
+            SqliteMemoStore(str(tmp_path / 'state.db'), table='memo; DROP TABLE x')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,120 @@
+"""
+test_people.py — PeopleDirectory indexes (email, client, PIN) and in-place updates
+
+Run: pytest test_people.py -v
+"""
+
+import pytest
+
+from people import PeopleDirectory
+
+
+RECORDS = [
+    {'id': 'rec1', 'fields': {
+        'Email Address': 'Michael@Hunch.co.nz', 'First Name': 'Michael',
+        'Access': 'Full', 'Active': True, 'clientCode': ['HUN'], 'Pin': 4321,
+    }},
+    {'id': 'rec2', 'fields': {
+        'Email Address': 'sam@one.nz', 'First Name': 'Sam', 'Name': 'Sam Reid',
+        'Access': 'Client WIP', 'Active': True, 'clientCode': ['ONE'],
+    }},
+    {'id': 'rec3', 'fields': {
+        'Email Address': 'ana@one.nz', 'First Name': 'Ana', 'Name': 'Ana Ngata',
+        'Access': 'Client WIP', 'Active': True, 'clientCode': ['ONB'],
+    }},
+    {'id': 'rec4', 'fields': {
+        'Email Address': 'gone@one.nz', 'Name': 'Old Contact',
+        'Active': False, 'clientCode': ['ONE'],
+    }},
+]
+
+
+def make_directory():
+    directory = PeopleDirectory()
+    directory.replace_all(RECORDS)
+    return directory
+
+
+def names(people):
+    return sorted(p.get('Name', p.get('First Name')) for p in people)
+
+
+class TestEmailIndex:
+
+    def test_case_insensitive(self):
+        directory = make_directory()
+        assert directory.by_email('michael@hunch.co.nz')['First Name'] == 'Michael'
+        assert directory.by_email('  MICHAEL@HUNCH.CO.NZ ')['First Name'] == 'Michael'
+
+    def test_unknown(self):
+        assert make_directory().by_email('nobody@example.com') is None
+        assert make_directory().by_email('') is None
+
+    def test_record_id(self):
+        directory = make_directory()
+        assert directory.id_for(' Michael@Hunch.co.nz') == RECORDS[0]['id']
+        assert directory.id_for('nobody@example.com') is None
+
+    def test_email_change_drops_old_address(self):
+        directory = make_directory()
+        directory.upsert({'id': 'rec2', 'fields': {**RECORDS[1]['fields'], 'Email Address': 'sam@one.co.nz'}})
+        assert directory.by_email('sam@one.nz') is None
+        assert directory.by_email('sam@one.co.nz')['First Name'] == 'Sam'
+
+
+class TestPin:
+
+    def test_pin_as_string(self):
+        assert make_directory().pin_for('michael@hunch.co.nz') == '4321'
+
+    def test_no_pin(self):
+        assert make_directory().pin_for('sam@one.nz') is None
+        assert make_directory().pin_for('nobody@example.com') is None
+
+
+class TestClientIndex:
+
+    def test_single_client(self):
+        assert names(make_directory().active_for_clients(['ONB'])) == ['Ana Ngata']
+
+    def test_grouped_clients_active_only(self):
+        people = make_directory().active_for_clients(['ONE', 'ONB', 'ONS'])
+        assert names(people) == ['Ana Ngata', 'Sam Reid']
+
+    def test_deactivated_person_leaves_client(self):
+        directory = make_directory()
+        directory.upsert({'id': 'rec3', 'fields': {**RECORDS[2]['fields'], 'Active': False}})
+        assert directory.active_for_clients(['ONB']) == []
+        assert directory.by_email('ana@one.nz') is not None
+
+    def test_string_client_code(self):
+        directory = make_directory()
+        directory.upsert({'id': 'rec5', 'fields': {'Name': 'Tui', 'Active': True, 'clientCode': 'SKY'}})
+        assert names(directory.active_for_clients(['SKY'])) == ['Tui']
+
+
+class TestUpdates:
+
+    def test_upsert_new(self):
+        directory = make_directory()
+        directory.upsert({'id': 'rec9', 'fields': {'Email Address': 'new@sky.co.nz', 'Active': True}})
+        assert len(directory) == 5
+        assert directory.by_email('new@sky.co.nz') is not None
+
+    def test_remove(self):
+        directory = make_directory()
+        directory.remove('rec2')
+        assert directory.by_email('sam@one.nz') is None
+        assert names(directory.active_for_clients(['ONE'])) == []
+        directory.remove('rec2')  # unknown is a no-op
+        assert len(directory) == 3
+
+    def test_replace_all_drops_missing(self):
+        directory = make_directory()
+        directory.replace_all(RECORDS[:1])
+        assert len(directory) == 1
+        assert directory.active_for_clients(['ONE']) == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
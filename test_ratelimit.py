@@ -0,0 +1,127 @@
+"""
+test_ratelimit.py — AttemptLimiter / SqliteAttemptLimiter lockout, expiry and size cap
+
+Run: pytest test_ratelimit.py -v
+"""
+
+import pytest
+
+from conftest import Clock
+from ratelimit import AttemptLimiter, SqliteAttemptLimiter
+
+
+@pytest.fixture
+def make_limiter(state_db):
+    def make(clock, max_keys=10000):
+        if state_db is None:
+            return AttemptLimiter(5, 300, max_keys=max_keys, shards=4, clock=clock)
+        return SqliteAttemptLimiter(state_db, 5, 300, max_keys=max_keys, clock=clock)
+    return make
+
+
+class TestLockout:
+
+    def test_locks_on_fifth_fail(self, make_limiter):
+        limiter = make_limiter(Clock())
+        assert [limiter.fail('1.2.3.4') for _ in range(5)] == [False] * 4 + [True]
+        assert limiter.locked_for('1.2.3.4') == 300
+        assert limiter.locked_for('5.6.7.8') == 0
+
+    def test_lock_lifts_after_lockout(self, make_limiter):
+        clock = Clock()
+        limiter = make_limiter(clock)
+        for _ in range(5):
+            limiter.fail('ip')
+        clock.t += 120
+        assert limiter.locked_for('ip') == 180
+        clock.t += 181
+        assert limiter.locked_for('ip') == 0
+        assert limiter.fail('ip') is False  # fresh count after the lock
+
+    def test_reset_clears(self, make_limiter):
+        limiter = make_limiter(Clock())
+        for _ in range(4):
+            limiter.fail('ip')
+        limiter.reset('ip')
+        assert limiter.fail('ip') is False
+
+    def test_old_fails_are_forgotten(self, make_limiter):
+        clock = Clock()
+        limiter = make_limiter(clock)
+        for _ in range(4):
+            limiter.fail('ip')
+        clock.t += 301
+        assert limiter.fail('ip') is False
+
+
+class TestBounds:
+
+    def test_expired_entries_are_swept(self, make_limiter):
+        clock = Clock()
+        limiter = make_limiter(clock)
+        for i in range(50):
+            limiter.fail(f'10.0.0.{i}')
+        assert len(limiter) == 50
+        clock.t += 400
+        limiter.fail('other')
+        assert len(limiter) == 1
+
+    def test_size_cap_evicts_oldest(self):
+        clock = Clock()
+        limiter = AttemptLimiter(5, 300, max_keys=8, shards=1, clock=clock)
+        for i in range(20):
+            clock.t += 1
+            limiter.fail(f'ip{i}')
+        assert len(limiter) == 8
+        assert limiter.locked_for('ip0') == 0
+        for _ in range(4):
+            limiter.fail('ip19')
+        assert limiter.locked_for('ip19') > 0
+
+    def test_memory_flat_under_spray(self):
+        clock = Clock()
+        limiter = AttemptLimiter(5, 300, max_keys=100, shards=4, clock=clock)
+        for i in range(10000):
+            clock.t += 0.01
+            limiter.fail(f'ip{i}')
+        assert len(limiter) <= 100
+        assert self.wheel_keys(limiter) == len(limiter)  # evicted keys leave their bucket too
+
+    def test_retouched_and_reset_keys_leave_the_wheel(self):
+        clock = Clock()
+        limiter = AttemptLimiter(5, 300, max_keys=100, shards=1, clock=clock)
+        for _ in range(3):
+            clock.t += 10
+            limiter.fail('ip1')
+        limiter.fail('ip2')
+        assert self.wheel_keys(limiter) == 2
+        limiter.reset('ip1')
+        limiter.reset('ip2')
+        assert self.wheel_keys(limiter) == 0
+
+    @staticmethod
+    def wheel_keys(limiter):
+        return sum(len(b) for s in limiter._shards for b in s.wheel)
+
+    def test_sqlite_size_cap(self, tmp_path):
+        limiter = SqliteAttemptLimiter(str(tmp_path / 'state.db'), 5, 300, max_keys=10, clock=Clock())
+        limiter.CAP_CHECK_EVERY = 1
+        for i in range(30):
+            limiter.fail(f'ip{i}')
+        assert len(limiter) == 10
+
+
+class TestSqliteShared:
+
+    def test_lock_visible_to_second_instance(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        clock = Clock()
+        first = SqliteAttemptLimiter(path, 5, 300, clock=clock)
+        for _ in range(5):
+            first.fail('ip')
+        second = SqliteAttemptLimiter(path, 5, 300, clock=clock)  # another worker / a restart
+        assert second.locked_for('ip') == 300
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,137 @@
+"""
+test_resilience.py — CircuitBreaker states, StaleCache ageing / bounds, LatencyTracker
+percentiles and RateBudget spending
+
+Run: pytest test_resilience.py -v
+"""
+
+import pytest
+
+from conftest import Clock
+from resilience import CircuitBreaker, LatencyTracker, RateBudget, StaleCache
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(3, 30, clock=Clock())
+        assert [breaker.failure('Projects') for _ in range(3)] == [False, False, True]
+        assert breaker.allow('Projects') is False
+        assert breaker.allow('Clients') is True
+        assert breaker.open_keys() == ['Projects']
+
+    def test_success_resets_count(self):
+        breaker = CircuitBreaker(3, 30, clock=Clock())
+        breaker.failure('Projects')
+        breaker.failure('Projects')
+        breaker.success('Projects')
+        breaker.failure('Projects')
+        assert breaker.allow('Projects') is True
+
+    def test_single_trial_after_cooldown(self):
+        clock = Clock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.failure('Tracker')
+        clock.t += 31
+        assert breaker.allow('Tracker') is True
+        assert breaker.allow('Tracker') is False  # trial already in flight
+
+    def test_trial_success_closes(self):
+        clock = Clock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.failure('Tracker')
+        clock.t += 31
+        breaker.allow('Tracker')
+        breaker.success('Tracker')
+        assert breaker.is_open('Tracker') is False
+        assert breaker.allow('Tracker') is True
+
+    def test_trial_failure_restarts_cooldown(self):
+        clock = Clock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.failure('Tracker')
+        clock.t += 31
+        breaker.allow('Tracker')
+        assert breaker.failure('Tracker') is False  # already open, not newly opened
+        clock.t += 10
+        assert breaker.allow('Tracker') is False
+        clock.t += 21
+        assert breaker.allow('Tracker') is True
+
+
+class TestStaleCache:
+
+    def test_age(self):
+        clock = Clock()
+        cache = StaleCache(clock=clock)
+        cache.put('/api/clients', b'[]')
+        clock.t += 42
+        assert cache.get('/api/clients') == (b'[]', 42)
+        assert cache.get('/api/jobs/all') is None
+
+    def test_bounded_oldest_evicted(self):
+        cache = StaleCache(max_entries=2, clock=Clock())
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.put('a', 3)  # refresh moves 'a' to newest
+        cache.put('c', 4)
+        assert cache.get('b') is None
+        assert cache.get('a')[0] == 3
+        assert len(cache) == 2
+
+    def test_discard(self):
+        cache = StaleCache(clock=Clock())
+        cache.put('a', 1)
+        cache.discard('a')
+        assert cache.get('a') is None
+
+
+class TestLatencyTracker:
+
+    def test_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record('Projects', 0.1)
+        assert tracker.percentile('Projects') is None
+
+    def test_p95_nearest_rank(self):
+        tracker = LatencyTracker(min_samples=1)
+        for i in range(1, 101):
+            tracker.record('Projects', i / 100)
+        assert tracker.percentile('Projects', 95) == 0.95
+        assert tracker.percentile('Projects', 50) == 0.5
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=10, min_samples=1)
+        for _ in range(10):
+            tracker.record('Tracker', 5.0)
+        for _ in range(10):
+            tracker.record('Tracker', 0.2)
+        assert tracker.percentile('Tracker') == 0.2
+
+
+class TestRateBudget:
+
+    def test_try_spend_stops_at_empty(self):
+        budget = RateBudget(5, clock=Clock())
+        assert [budget.try_spend() for _ in range(6)] == [True] * 5 + [False]
+
+    def test_required_spend_blocks_optional(self):
+        clock = Clock()
+        budget = RateBudget(5, clock=clock)
+        for _ in range(8):
+            budget.spend()  # 3 into debt
+        clock.t += 0.6      # +3 tokens: back to zero
+        assert budget.try_spend() is False
+        clock.t += 0.2
+        assert budget.try_spend() is True
+
+    def test_refill_capped_at_burst(self):
+        clock = Clock()
+        budget = RateBudget(5, clock=clock)
+        clock.t += 100
+        assert [budget.try_spend() for _ in range(6)] == [True] * 5 + [False]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
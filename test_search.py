@@ -0,0 +1,117 @@
+"""
+test_search.py — SearchIndex behaviour (tokenising, prefix match, ranking, incremental updates)
+
+Run: pytest test_search.py -v
+"""
+
+import pytest
+
+from search import SearchIndex, tokenize
+
+
+WEIGHTS = {'jobNumber': 5.0, 'jobName': 3.0, 'description': 1.5}
+
+
+def make_index():
+    index = SearchIndex(WEIGHTS)
+    index.upsert('job:SKY 017', {
+        'jobNumber': 'SKY 017',
+        'jobName': 'Winter campaign',
+        'description': 'Always-on social for the winter sports launch',
+    }, {'type': 'job', 'jobNumber': 'SKY 017', 'clientCode': 'SKY'})
+    index.upsert('job:TOW 066', {
+        'jobNumber': 'TOW 066',
+        'jobName': 'Skyline rates notice',
+        'description': 'Council campaign refresh',
+    }, {'type': 'job', 'jobNumber': 'TOW 066', 'clientCode': 'TOW'})
+    index.upsert('update:rec1', {
+        'update': 'Client approved the winter storyboard',
+    }, {'type': 'update', 'jobNumber': 'SKY 017', 'clientCode': 'SKY'})
+    return index
+
+
+class TestTokenize:
+
+    def test_lowercases_and_splits(self):
+        assert tokenize('Always-on Social!') == ['always', 'on', 'social']
+
+    def test_job_number_gets_squashed_token(self):
+        assert tokenize('SKY 017') == ['sky', '017', 'sky017']
+
+    def test_empty(self):
+        assert tokenize('') == []
+        assert tokenize(None) == []
+
+
+class TestSearch:
+
+    def test_exact_word(self):
+        results = make_index().search('storyboard')
+        assert [r['type'] for r in results] == ['update']
+
+    def test_prefix_match(self):
+        results = make_index().search('campa')
+        assert {r['jobNumber'] for r in results} == {'SKY 017', 'TOW 066'}
+
+    def test_all_tokens_must_match(self):
+        results = make_index().search('winter council')
+        assert results == []
+
+    def test_job_number_query_squashed_or_spaced(self):
+        index = make_index()
+        assert index.search('SKY017')[0]['jobNumber'] == 'SKY 017'
+        assert index.search('sky 017')[0]['jobNumber'] == 'SKY 017'
+
+    def test_exact_term_outranks_prefix(self):
+        # 'sky' is an exact job-number token for SKY 017 and only a prefix of 'skyline'
+        results = make_index().search('sky')
+        assert results[0]['jobNumber'] == 'SKY 017'
+        assert results[-1]['jobNumber'] == 'TOW 066'
+
+    def test_heavier_field_ranks_first(self):
+        # 'winter' is in SKY 017's name (x3) and in the update text (x1)
+        results = make_index().search('winter')
+        assert results[0]['type'] == 'job'
+        assert results[1]['type'] == 'update'
+
+    def test_predicate_filters(self):
+        results = make_index().search('campaign', predicate=lambda p: p['clientCode'] == 'TOW')
+        assert [r['jobNumber'] for r in results] == ['TOW 066']
+
+    def test_limit(self):
+        assert len(make_index().search('campaign', limit=1)) == 1
+
+    def test_blank_query(self):
+        assert make_index().search('  ') == []
+
+
+class TestIncremental:
+
+    def test_upsert_replaces_old_terms(self):
+        index = make_index()
+        index.upsert('job:SKY 017', {'jobNumber': 'SKY 017', 'jobName': 'Summer campaign'},
+                     {'type': 'job', 'jobNumber': 'SKY 017', 'clientCode': 'SKY'})
+        assert [r['type'] for r in index.search('winter')] == ['update']
+        assert index.search('summer')[0]['jobNumber'] == 'SKY 017'
+
+    def test_remove_drops_doc_and_orphan_terms(self):
+        index = make_index()
+        index.remove('update:rec1')
+        assert 'update:rec1' not in index
+        assert index.search('storyboard') == []
+        assert 'storyboard' not in index._sorted_terms
+
+    def test_remove_unknown_is_noop(self):
+        index = make_index()
+        index.remove('job:NOPE')
+        assert len(index) == 3
+
+    def test_clear(self):
+        index = make_index()
+        index.clear()
+        assert len(index) == 0
+        assert index.search('winter') == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,35 @@
+"""
+test_statedb.py — per-thread SQLite connections shared by the state stores
+
+Run: pytest test_statedb.py -v
+"""
+
+import threading
+
+import pytest
+
+from statedb import SqliteStore
+
+
+class TestConnections:
+
+    def test_one_connection_per_thread(self, tmp_path):
+        store = SqliteStore(str(tmp_path / 'state.db'))
+        assert store._conn() is store._conn()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(store._conn()))
+        thread.start()
+        thread.join()
+        assert other[0] is not store._conn()
+
+    def test_wal_and_autocommit(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        conn = SqliteStore(path)._conn()
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        conn.execute('CREATE TABLE t (x INTEGER)')
+        conn.execute('INSERT INTO t VALUES (1)')
+        assert SqliteStore(path)._conn().execute('SELECT x FROM t').fetchall() == [(1,)]  # no commit needed
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,192 @@
+"""
+test_tablecache.py — TableCache upserts, key index, change stamps and tombstones;
+field-level write diffs, the change journal
+
+Run: pytest test_tablecache.py -v
+"""
+
+import pytest
+
+from conftest import Clock
+from tablecache import TableCache, changed_fields, field_value
+
+
+def job(record_id, number, status='In Progress', **fields):
+    return {'id': record_id, 'fields': {'Job Number': number, 'Status': status, **fields}}
+
+
+def make_cache(clock=None):
+    cache = TableCache(key_field='Job Number', clock=clock or Clock())
+    cache.replace_all([job('rec1', 'SKY 017'), job('rec2', 'TOW 066'), job('rec3', 'SKY 018', 'Completed')])
+    return cache
+
+
+class TestFieldValue:
+
+    def test_unwraps_lookup_list(self):
+        assert field_value({'Client Code': ['SKY']}, 'Client Code') == 'SKY'
+        assert field_value({'Client Code': []}, 'Client Code') == ''
+        assert field_value({'Spend': 5}, 'Spend') == 5
+        assert field_value({}, 'Spend') == ''
+
+
+class TestChangedFields:
+
+    CURRENT = {'Stage': 'Craft', 'Status': 'In Progress', 'With Client?': True, 'Client': ['recSKY']}
+
+    def test_resubmitted_form_is_noop(self):
+        updates = {'Stage': 'Craft', 'Status': 'In Progress', 'With Client?': True, 'Client': ['recSKY']}
+        assert changed_fields(self.CURRENT, updates) == {}
+
+    def test_only_changed_fields(self):
+        updates = {'Stage': 'Refine', 'Status': 'In Progress'}
+        assert changed_fields(self.CURRENT, updates) == {'Stage': 'Refine'}
+
+    def test_blanks_match_missing(self):
+        # Airtable leaves out empty fields and unticked checkboxes
+        updates = {'Update Due': None, 'Live': '', 'Description': ''}
+        assert changed_fields(self.CURRENT, updates) == {}
+        assert changed_fields({}, {'With Client?': False}) == {}
+
+    def test_clearing_a_value_is_a_change(self):
+        assert changed_fields(self.CURRENT, {'With Client?': False}) == {'With Client?': False}
+        assert changed_fields(self.CURRENT, {'Client': []}) == {'Client': []}
+
+    def test_numbers(self):
+        assert changed_fields({'Spend': 1000}, {'Spend': 1000.0}) == {}
+        assert changed_fields({}, {'Spend': 0}) == {'Spend': 0}
+
+
+class TestReads:
+
+    def test_loaded_and_ordered(self):
+        cache = make_cache()
+        assert cache.loaded
+        assert [r['id'] for r in cache.records()] == ['rec1', 'rec2', 'rec3']
+
+    def test_predicate(self):
+        cache = make_cache()
+        active = cache.records(lambda r: r['fields']['Status'] != 'Completed')
+        assert [r['id'] for r in active] == ['rec1', 'rec2']
+
+    def test_get_by_key(self):
+        cache = make_cache()
+        assert cache.get_by_key('TOW 066')['id'] == 'rec2'
+        assert cache.get_by_key('NOPE 001') is None
+
+    def test_renumber_moves_key(self):
+        cache = make_cache()
+        cache.upsert(job('rec1', 'SKY 020'))
+        assert cache.get_by_key('SKY 017') is None
+        assert cache.get_by_key('SKY 020')['id'] == 'rec1'
+
+
+class TestChanges:
+
+    def test_upsert_stamps_only_real_changes(self):
+        clock = Clock()
+        cache = make_cache(clock)
+        clock.t = 2000
+        assert cache.upsert(job('rec1', 'SKY 017')) is False
+        assert cache.upsert(job('rec2', 'TOW 066', 'On Hold')) is True
+        changed, removed = cache.changed_since(1500)
+        assert [r['id'] for r in changed] == ['rec2']
+        assert removed == []
+
+    def test_new_record_appended(self):
+        cache = make_cache()
+        cache.upsert(job('rec9', 'SKY 019'))
+        assert cache.records()[-1]['id'] == 'rec9'
+
+    def test_remove_reports_tombstone(self):
+        clock = Clock()
+        cache = make_cache(clock)
+        clock.t = 2000
+        assert cache.remove('rec3') is True
+        assert cache.remove('rec3') is False
+        changed, removed = cache.changed_since(1500)
+        assert changed == []
+        assert [r['fields']['Job Number'] for r in removed] == ['SKY 018']
+        assert cache.get_by_key('SKY 018') is None
+
+    def test_reload_stamps_diffs_and_drops_missing(self):
+        clock = Clock()
+        cache = make_cache(clock)
+        clock.t = 2000
+        cache.replace_all([job('rec2', 'TOW 066'), job('rec1', 'SKY 017', 'On Hold')])
+        changed, removed = cache.changed_since(1500)
+        assert [r['id'] for r in changed] == ['rec1']
+        assert [r['id'] for r in removed] == ['rec3']
+        assert [r['id'] for r in cache.records()] == ['rec2', 'rec1']
+
+    def test_reload_keeps_writes_made_during_its_fetch(self):
+        clock = Clock()
+        cache = make_cache(clock)
+        clock.t = 2000.5  # the reload's fetch started at 2000
+        cache.upsert(job('rec1', 'SKY 017', 'On Hold'))   # written through mid-fetch
+        cache.upsert(job('rec9', 'SKY 019'))              # created mid-fetch
+        cache.remove('rec3')                              # deleted mid-fetch
+        clock.t = 2001
+        v = cache.version
+        cache.replace_all([job('rec1', 'SKY 017'), job('rec2', 'TOW 066'), job('rec3', 'SKY 018')], as_of=2000)
+        assert cache.get('rec1')['fields']['Status'] == 'On Hold'
+        assert cache.get('rec3') is None
+        assert [r['id'] for r in cache.records()] == ['rec1', 'rec2', 'rec9']
+        assert cache.changes_after(v) == (v, [])  # nothing journalled for patchers to replay
+
+    def test_top_up_skips_records_written_since_its_fetch(self):
+        clock = Clock()
+        cache = make_cache(clock)
+        clock.t = 2000
+        cache.upsert(job('rec1', 'SKY 017', 'On Hold'))
+        assert cache.upsert(job('rec1', 'SKY 017'), as_of=1999) is False
+        assert cache.upsert(job('rec1', 'SKY 017'), as_of=2000) is True
+
+    def test_tombstones_expire_on_reload(self):
+        clock = Clock()
+        cache = TableCache(tombstone_seconds=60, clock=clock)
+        cache.replace_all([job('rec1', 'A 1')])
+        cache.remove('rec1')
+        clock.t += 61
+        cache.replace_all([])
+        assert cache.changed_since(0) == ([], [])
+
+    def test_version_ticks_on_change_only(self):
+        cache = make_cache()
+        v = cache.version
+        cache.upsert(job('rec1', 'SKY 017'))
+        assert cache.version == v
+        cache.upsert(job('rec1', 'SKY 017', 'On Hold'))
+        cache.remove('rec2')
+        assert cache.version == v + 2
+
+
+class TestJournal:
+
+    def test_changes_after(self):
+        cache = make_cache()
+        v = cache.version
+        assert cache.changes_after(v) == (v, [])
+        cache.upsert(job('rec1', 'SKY 017', 'On Hold'))
+        cache.remove('rec2')
+        version, changes = cache.changes_after(v)
+        assert version == v + 2
+        assert [(old and old['fields']['Status'], new and new['fields']['Status']) for old, new in changes] == [
+            ('In Progress', 'On Hold'), ('In Progress', None)]
+        assert cache.changes_after(v + 1)[1] == changes[1:]
+
+    def test_new_record_has_no_old(self):
+        cache = TableCache()
+        cache.upsert(job('rec1', 'A 1'))
+        assert cache.changes_after(0) == (1, [(None, job('rec1', 'A 1'))])
+
+    def test_journal_overflow_means_rebuild(self):
+        cache = TableCache(journal_size=2)
+        for i in range(3):
+            cache.upsert(job(f'rec{i}', f'A {i}'))
+        assert cache.changes_after(0) == (3, None)
+        assert len(cache.changes_after(1)[1]) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
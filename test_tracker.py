@@ -17,7 +17,18 @@ from tracker import (
     get_chart_months,
     get_rollover,
     get_historic_quarter_dates,
+    rollover_fingerprint,
+    walk_rollovers,
+    simulate_rollovers,
+    get_client_summary,
+    get_portfolio,
+    client_fields,
+    compute_client_rollovers,
+    group_by_quarter,
+    build_range_index,
+    range_totals,
 )
+from trackerframe import TrackerFrame
 
 
 # ===== Fixtures =====
@@ -743,5 +754,350 @@ class TestHistoricQuarterDates:
         assert len(dates) == 3
 
 
+class TestRolloverFingerprint:
+    """rollover_fingerprint changes exactly when a closed rollover's inputs do."""
+
+    Q3 = date(2026, 1, 1)  # SKY Q3 (Jan-Mar); previous quarter Oct-Dec
+
+    def fingerprint(self, entries, history=BUDGET_HISTORY, fallback=CLIENTS_FALLBACK):
+        return rollover_fingerprint('SKY', self.Q3, 'June', history, fallback, entries)
+
+    def test_stable_and_order_independent(self):
+        entries = sky_q3_underspend_26k()
+        assert self.fingerprint(entries) == self.fingerprint(list(reversed(entries)))
+
+    def test_back_edit_in_quarter_changes_it(self):
+        edited = sky_q3_underspend_26k()
+        edited[0] = {**edited[0], 'spend': 2500}
+        assert self.fingerprint(edited) != self.fingerprint(sky_q3_underspend_26k())
+
+    def test_previous_quarter_rows_count(self):
+        december = {'client': 'SKY', 'month': 'December', 'spend': 100, 'spendType': 'Extra budget', 'ballpark': False}
+        entries = sky_q3_underspend_26k()
+        assert self.fingerprint(entries + [december]) != self.fingerprint(entries)
+
+    def test_unrelated_rows_ignored(self):
+        entries = sky_q3_underspend_26k()
+        other = [
+            {'client': 'TOW', 'month': 'January', 'spend': 999, 'spendType': 'Project budget', 'ballpark': False},
+            {'client': 'SKY', 'month': 'May', 'spend': 999, 'spendType': 'Project budget', 'ballpark': False},
+        ]
+        assert self.fingerprint(entries + other) == self.fingerprint(entries)
+
+    def test_later_budget_change_ignored(self):
+        later = BUDGET_HISTORY + [{'Client': 'SKY', 'Effective From': '2026-04-01', 'Monthly Committed': 12000}]
+        earlier = BUDGET_HISTORY + [{'Client': 'SKY', 'Effective From': '2026-03-01', 'Monthly Committed': 12000}]
+        entries = sky_q3_underspend_26k()
+        assert self.fingerprint(entries, later) == self.fingerprint(entries)
+        assert self.fingerprint(entries, earlier) != self.fingerprint(entries)
+
+    def test_fallback_counts(self):
+        entries = sky_q3_underspend_26k()
+        assert self.fingerprint(entries, fallback={**CLIENTS_FALLBACK, 'SKY': 9000}) != self.fingerprint(entries)
+
+
+class TestWalkRollovers:
+    """walk_rollovers matches get_rollover quarter by quarter, in one pass."""
+
+    MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+              'August', 'September', 'October', 'November', 'December']
+
+    def entries(self):
+        # Uneven spend across a year for ONS (renegotiated Jan 2026) and SKY,
+        # with the odd excluded spend type and a pre-system gap (no August).
+        out = []
+        for i, month in enumerate(self.MONTHS):
+            if month == 'August':
+                continue
+            out.append({'client': 'ONS', 'month': month, 'spend': 18000 + 3100 * (i % 4),
+                        'spendType': 'Project budget', 'ballpark': i % 2 == 0})
+            out.append({'client': 'SKY', 'month': month, 'spend': str(7000 + 2500 * (i % 3)),
+                        'spendType': 'Project budget', 'ballpark': False})
+        out.append({'client': 'ONS', 'month': 'May', 'spend': 50000, 'spendType': 'Extra budget', 'ballpark': False})
+        return out
+
+    @pytest.mark.parametrize('client,year_end', [('ONS', 'March'), ('SKY', 'June'), ('TOW', 'September')])
+    def test_closed_quarters_match_get_rollover(self, client, year_end):
+        entries = self.entries()
+        walked = list(walk_rollovers(client, date(2024, 7, 1), date(2026, 6, 30), year_end,
+                                     BUDGET_HISTORY, CLIENTS_FALLBACK, entries))
+        expected = [
+            get_rollover(client, d, year_end, BUDGET_HISTORY, CLIENTS_FALLBACK, entries, is_closed=True)
+            for d in reversed(get_historic_quarter_dates(year_end, date(2026, 7, 1), n_quarters=len(walked)))
+        ]
+        assert len(walked) == 8
+        assert walked == expected
+
+    @pytest.mark.parametrize('today', [date(2026, 5, 3), date(2026, 4, 1), date(2026, 6, 30)])
+    def test_live_quarter_ends_walk(self, today):
+        entries = self.entries()
+        walked = list(walk_rollovers('SKY', date(2025, 7, 1), date(2030, 1, 1), 'June',
+                                     BUDGET_HISTORY, CLIENTS_FALLBACK, entries, today=today))
+        assert [r['quarterKey'] for r in walked] == ['JUL-SEP', 'OCT-DEC', 'JAN-MAR', 'APR-JUN']
+        assert walked[-1] == get_rollover('SKY', today, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, entries)
+        assert all(r['isClosed'] for r in walked[:-1])
+
+    def test_start_mid_quarter(self):
+        walked = list(walk_rollovers('SKY', date(2026, 2, 14), date(2026, 2, 14), 'June',
+                                     BUDGET_HISTORY, CLIENTS_FALLBACK, sky_q3_underspend_26k()))
+        assert [r['quarterKey'] for r in walked] == ['JAN-MAR']
+        assert walked[0]['nextQuarter']['banking'] == 26000
+
+    def test_empty_range(self):
+        assert list(walk_rollovers('SKY', date(2026, 7, 1), date(2026, 1, 1), 'June',
+                                   BUDGET_HISTORY, CLIENTS_FALLBACK, [])) == []
+
+    @pytest.mark.parametrize('client,year_end', [('ONS', 'March'), ('SKY', 'June')])
+    def test_frame_gives_same_results(self, client, year_end):
+        entries = self.entries()
+        frame = TrackerFrame.from_entries(entries)
+        args = (client, date(2024, 7, 1), date(2026, 6, 30), year_end, BUDGET_HISTORY, CLIENTS_FALLBACK)
+        assert list(walk_rollovers(*args, frame, today=date(2026, 5, 3))) == \
+            list(walk_rollovers(*args, entries, today=date(2026, 5, 3)))
+        for d in (date(2026, 5, 3), date(2026, 1, 1)):
+            for closed in (False, True):
+                assert get_rollover(client, d, year_end, BUDGET_HISTORY, CLIENTS_FALLBACK, frame, closed) == \
+                    get_rollover(client, d, year_end, BUDGET_HISTORY, CLIENTS_FALLBACK, entries, closed)
+            assert rollover_fingerprint(client, d, year_end, BUDGET_HISTORY, CLIENTS_FALLBACK, frame) == \
+                rollover_fingerprint(client, d, year_end, BUDGET_HISTORY, CLIENTS_FALLBACK, entries)
+
+    def test_each_quarter_summed_once(self, monkeypatch):
+        import tracker
+        calls = []
+        real = tracker._quarter_months
+        monkeypatch.setattr(tracker, '_quarter_months', lambda first: calls.append(first) or real(first))
+        list(walk_rollovers('SKY', date(2024, 7, 1), date(2026, 6, 30), 'June',
+                            BUDGET_HISTORY, CLIENTS_FALLBACK, self.entries()))
+        assert len(calls) == 9  # 8 quarters + the one before the first
+
+
+class TestPortfolio:
+    """Client summaries and agency totals for /api/tracker/portfolio."""
+
+    TODAY = date(2026, 5, 3)  # SKY (June year-end) Q4 Apr-Jun; ONS (March) Q1 Apr-Jun
+
+    def entries(self):
+        q2 = [{'client': 'SKY', 'month': m, 'spend': 10000, 'spendType': 'Project budget', 'ballpark': False}
+              for m in ('October', 'November', 'December')]
+        april = [{'client': 'SKY', 'month': 'April', 'spend': 15000, 'spendType': 'Project budget', 'ballpark': False},
+                 {'client': 'SKY', 'month': 'May', 'spend': 2000, 'spendType': 'Project budget', 'ballpark': True},
+                 {'client': 'ONS', 'month': 'April', 'spend': 21000, 'spendType': 'Project budget', 'ballpark': False},
+                 {'client': 'ONS', 'month': 'April', 'spend': 900, 'spendType': 'Extra budget', 'ballpark': False}]
+        return q2 + sky_q3_underspend_26k() + april
+
+    def test_sky_summary(self):
+        summary = get_client_summary('SKY', self.TODAY, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, self.entries())
+        assert summary['previousQuarter'] == {'label': 'Q3', 'quarterKey': 'JAN-MAR',
+                                              'committed': 30000, 'spent': 4000, 'variance': 26000}
+        assert summary['currentQuarter'] == {'label': 'Q4', 'quarterKey': 'APR-JUN',
+                                             'committed': 30000, 'spent': 17000, 'variance': 13000}
+        # FY from July 2025: 10 months committed; Jul-Sep had no entries
+        assert summary['yearToDate'] == {'committed': 110000, 'spent': 51000, 'variance': 59000}
+        # $26K banked from Q3; April overspent $5K chips it
+        assert summary['rollover'] == {'banked': 26000, 'chipped': 5000, 'expiring': 21000,
+                                       'expiresOn': '2026-06-30', 'banking': 0}
+
+    def test_rollover_matches_get_rollover(self):
+        live = get_rollover('SKY', self.TODAY, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, self.entries())
+        summary = get_client_summary('SKY', self.TODAY, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, self.entries())
+        assert summary['rollover']['expiring'] == live['lastQuarter']['remaining']
+
+    def test_no_carry(self):
+        summary = get_client_summary('ONS', self.TODAY, 'March', BUDGET_HISTORY, CLIENTS_FALLBACK, self.entries())
+        assert summary['rollover'] == {'banked': 0, 'chipped': 0, 'expiring': 0, 'expiresOn': '', 'banking': 0}
+        assert summary['currentQuarter']['spent'] == 21000  # Extra budget excluded
+        assert summary['yearToDate'] == {'committed': 40000, 'spent': 21000, 'variance': 19000}
+
+    def test_totals(self):
+        clients = [{'code': 'SKY', 'name': 'Sky', 'yearEnd': 'June'},
+                   {'code': 'ONS', 'name': 'One NZ Simplification', 'yearEnd': 'March'}]
+        portfolio = get_portfolio(clients, self.TODAY, BUDGET_HISTORY, CLIENTS_FALLBACK, self.entries())
+        assert [c['code'] for c in portfolio['clients']] == ['SKY', 'ONS']
+        assert portfolio['totals']['currentQuarter'] == {'committed': 90000, 'spent': 38000, 'variance': 52000}
+        assert portfolio['totals']['rollover']['expiring'] == 21000
+
+    def test_empty(self):
+        portfolio = get_portfolio([], self.TODAY, BUDGET_HISTORY, CLIENTS_FALLBACK, [])
+        assert portfolio['clients'] == []
+        assert portfolio['totals']['yearToDate'] == {'committed': 0, 'spent': 0, 'variance': 0}
+
+
+class TestGroupByQuarter:
+    """?view=quarter on /api/tracker/data."""
+
+    TODAY = date(2026, 5, 3)  # SKY (June year-end): FY Jul 2025 - Jun 2026, in Q4
+
+    def row(self, job, month, spend, spend_type='Project budget', ballpark=False):
+        return {'id': f'rec{job}{month}', 'client': 'SKY', 'jobNumber': job, 'projectName': f'Project {job}',
+                'owner': 'Sam', 'description': f'{month} note', 'jobDescription': f'About {job}',
+                'spend': spend, 'month': month, 'spendType': spend_type, 'ballpark': ballpark}
+
+    def test_fiscal_quarters(self):
+        grouped = group_by_quarter([], 'June', self.TODAY)
+        assert [(q['label'], q['quarterKey'], q['isCurrent']) for q in grouped['quarters']] == [
+            ('Q1', 'JUL-SEP', False), ('Q2', 'OCT-DEC', False), ('Q3', 'JAN-MAR', False), ('Q4', 'APR-JUN', True)]
+        assert grouped['quarters'][0]['months'] == ['July', 'August', 'September']
+
+    def test_quarter_job_month(self):
+        rows = [self.row('SKY 010', 'May', 2000, ballpark=True),
+                self.row('SKY 010', 'April', 5000),
+                self.row('SKY 010', 'April', 1000),
+                self.row('SKY 011', 'April', 3000),
+                self.row('SKY 010', 'April', 400, spend_type='Extra budget'),
+                self.row('SKY 011', 'October', 7000)]
+        quarters = group_by_quarter(rows, 'June', self.TODAY)['quarters']
+        q4 = quarters[3]
+        assert q4['spend'] == 11400
+        assert q4['bySpendType'] == {'Project budget': 11000, 'Extra budget': 400}
+        assert q4['ballpark'] is True
+        assert [(j['jobNumber'], j['spendType'], j['spend']) for j in q4['jobs']] == [
+            ('SKY 010', 'Project budget', 8000), ('SKY 011', 'Project budget', 3000),
+            ('SKY 010', 'Extra budget', 400)]
+
+        job = q4['jobs'][0]
+        assert job['jobDescription'] == 'About SKY 010'
+        assert job['ballpark'] is True
+        # Fiscal month order, not row order; April holds both its rows
+        assert [(m['month'], m['spend'], m['ballpark']) for m in job['months']] == [
+            ('April', 6000, False), ('May', 2000, True)]
+        assert [r['spend'] for r in job['months'][0]['rows']] == [5000, 1000]
+
+        assert quarters[1]['spend'] == 7000 and quarters[1]['ballpark'] is False
+        assert quarters[0]['jobs'] == [] and quarters[0]['spend'] == 0
+
+    def test_unplaced(self):
+        grouped = group_by_quarter([self.row('SKY 010', 'Sometime', 500)], 'June', self.TODAY)
+        assert [r['month'] for r in grouped['unplaced']] == ['Sometime']
+        assert sum(q['spend'] for q in grouped['quarters']) == 0
+
+
+class TestRangeIndex:
+    """Any-window totals for /api/tracker/range."""
+
+    TODAY = TestPortfolio.TODAY
+
+    def index(self, client='SKY', year_end='June'):
+        return build_range_index(client, self.TODAY, year_end, BUDGET_HISTORY, CLIENTS_FALLBACK,
+                                 TestPortfolio().entries())
+
+    def test_window(self):
+        index = self.index()
+        assert (index['start'], index['end'], index['spendFrom']) == ('2025-07', '2026-06', '2025-07')
+        assert len(index['committed']) == 13
+
+    def test_year_to_date_matches_summary(self):
+        summary = get_client_summary('SKY', self.TODAY, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK,
+                                     TestPortfolio().entries())
+        totals = range_totals(self.index(), '2025-07', '2026-05')
+        assert totals == {'from': '2025-07', 'to': '2026-05', 'months': 11, **summary['yearToDate']}
+
+    def test_every_range_matches_month_by_month(self):
+        index = self.index('ONS', 'March')
+        keys = [f'{2025 + (6 + i) // 12}-{(6 + i) % 12 + 1:02d}' for i in range(12)]
+        for lo in range(len(keys)):
+            for hi in range(lo, len(keys)):
+                expected = sum(get_committed('ONS', int(k[:4]), int(k[5:]), BUDGET_HISTORY, CLIENTS_FALLBACK)
+                               for k in keys[lo:hi + 1])
+                assert range_totals(index, keys[lo], keys[hi])['committed'] == expected
+
+    def test_committed_follows_budget_history(self):
+        totals = range_totals(self.index('ONS', 'March'), '2025-11', '2026-02')
+        assert totals['committed'] == 2 * 25000 + 2 * 20000
+
+    def test_spend_placed_in_tracker_year(self):
+        assert range_totals(self.index(), '2025-10', '2025-12')['spent'] == 30000
+
+    @pytest.mark.parametrize('from_month,to_month', [('2024-07', '2025-06'), ('2025-06', '2025-08')])
+    def test_no_committed_without_spend(self, from_month, to_month):
+        # Month names can't be placed in an earlier year, so those months
+        # would count committed against no spend
+        with pytest.raises(ValueError, match='tracker year'):
+            range_totals(self.index(), from_month, to_month)
+
+    @pytest.mark.parametrize('from_month,to_month', [
+        ('2024-04', '2024-06'),  # before the index
+        ('2026-06', '2026-07'),  # past the end
+        ('2026-03', '2026-01'),  # backwards
+        ('2026-13', '2026-12'),
+        ('March', '2026-05'),
+    ])
+    def test_bad_ranges(self, from_month, to_month):
+        with pytest.raises(ValueError):
+            range_totals(self.index(), from_month, to_month)
+
+
+class TestSimulateRollovers:
+    """What-if projections for /api/tracker/simulate."""
+
+    TODAY = TestPortfolio.TODAY  # SKY Q4 Apr-Jun 2026, $26K carried in from Q3
+    NEXT_Q = date(2026, 7, 1)
+
+    def simulate(self, scenarios, quarters=2):
+        return simulate_rollovers('SKY', self.TODAY, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK,
+                                  TestPortfolio().entries(), scenarios, quarters)
+
+    def closed(self, today, entries):
+        return get_rollover('SKY', today, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, entries, is_closed=True)
+
+    def test_baseline_matches_closed_get_rollover(self):
+        [baseline] = self.simulate([[]])
+        entries = TestPortfolio().entries()
+        assert baseline == [self.closed(self.TODAY, entries), self.closed(self.NEXT_Q, entries)]
+
+    def test_scenarios_match_recomputing_with_the_entries(self):
+        push = [{'month': 'June', 'spend': -8000}, {'month': 'July', 'spend': 8000}]
+        big_june = [{'month': 'June', 'spend': 30000}]
+        extra = [{'month': 'June', 'spend': 30000, 'spendType': 'Extra budget'}]
+        results = self.simulate([push, big_june, extra])
+        for scenario, result in zip([push, big_june, extra], results):
+            entries = TestPortfolio().entries() + [
+                {'client': 'SKY', 'spendType': 'Project budget', 'ballpark': True, **e} for e in scenario]
+            assert result == [self.closed(self.TODAY, entries), self.closed(self.NEXT_Q, entries)]
+
+    def test_big_june_chips_the_carry(self):
+        _, big_june = self.simulate([[], [{'month': 'June', 'spend': 30000}]])
+        # Q4: committed 30K, spent 17K + 30K -> 17K over, chipped from the 26K carry
+        assert big_june[0]['lastQuarter']['chipped'] == 17000
+        assert big_june[0]['nextQuarter']['banking'] == 0
+
+    def test_month_outside_projection(self):
+        with pytest.raises(ValueError):
+            self.simulate([[{'month': 'January', 'spend': 100}]])
+        assert len(self.simulate([[{'month': 'December', 'spend': 100}]], quarters=3)[0]) == 3
+        with pytest.raises(ValueError):
+            self.simulate([[{'month': 'January', 'spend': 100}]], quarters=3)  # the quarter before today's
+
+    def test_fourth_quarter_would_reuse_actual_months(self):
+        # Jan-Mar 2027 has the same month names as Jan-Mar 2026, read as actuals
+        with pytest.raises(ValueError):
+            self.simulate([[]], quarters=4)
+
+
+class TestClientFields:
+    """Derived /api/tracker/clients fields, and the rollovers for a worker's shard."""
+
+    TODAY = TestPortfolio.TODAY
+
+    def test_matches_separate_calls(self):
+        entries = TestPortfolio().entries()
+        [rollovers] = compute_client_rollovers([('SKY', 'June')], self.TODAY, BUDGET_HISTORY, CLIENTS_FALLBACK,
+                                               entries)
+        historic = get_historic_quarter_dates('June', self.TODAY)
+        closed = [get_rollover('SKY', d, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, entries, is_closed=True)
+                  for d in reversed(historic)]
+        live = get_rollover('SKY', self.TODAY, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, entries)
+        assert rollovers == closed + [live]
+        fields = client_fields('SKY', self.TODAY, 'June', BUDGET_HISTORY, CLIENTS_FALLBACK, rollovers)
+        assert fields['rolloverObject'] == live
+        assert list(fields['rolloverByQuarter']) == ['JUL-SEP', 'OCT-DEC', 'JAN-MAR', 'APR-JUN']
+
+    def test_shard_keeps_order_and_isolates_errors(self):
+        frame = TrackerFrame.from_entries(TestPortfolio().entries())
+        out = compute_client_rollovers([('ONS', 'March'), ('BAD', 'Smarch'), ('SKY', 'June')],
+                                       self.TODAY, BUDGET_HISTORY, CLIENTS_FALLBACK, frame)
+        assert [r[-1]['currentQuarterLabel'] if isinstance(r, list) else None for r in out] == ['Q1', None, 'Q4']
+        assert 'error' in out[1]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
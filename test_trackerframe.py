@@ -0,0 +1,160 @@
+"""
+test_trackerframe.py — building from Airtable records, interning, per-client rows,
+patching records in place and the running month totals, subsets and pickling
+
+Run: pytest test_trackerframe.py -v
+"""
+
+import pickle
+
+import pytest
+
+from trackerframe import TrackerFrame
+from tracker import _month_totals
+
+
+def record(client, month, spend, spend_type=None, ballpark=False):
+    fields = {'Client Code': [client], 'Month': month, 'Spend': spend, 'Ballpark': ballpark}
+    if spend_type:
+        fields['Spend type'] = spend_type
+    return {'id': f'rec{client}{month}', 'fields': fields}
+
+
+RECORDS = [
+    record('SKY', 'January', 1500),
+    record('TOW', 'January', '$2,000', 'Extra budget', ballpark=True),
+    record('SKY', 'February', 1500.5, ballpark=True),
+    record('SKY', 'Jan', 99),
+]
+
+
+class TestBuild:
+
+    def test_from_records(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        assert len(frame) == 4
+        assert frame.clients == ['SKY', 'TOW']
+        assert frame.spend_types == ['Project budget', 'Extra budget']
+        assert list(frame.month) == [1, 1, 2, 0]
+        assert list(frame.spend) == [1500.0, 2000.0, 1500.5, 99.0]
+        assert list(frame.ballpark) == [0, 1, 1, 0]
+
+    def test_pages_append(self):
+        frame = TrackerFrame()
+        frame.extend_records(RECORDS[:2])
+        frame.extend_records(RECORDS[2:])
+        assert list(frame) == list(TrackerFrame.from_records(RECORDS))
+
+    def test_rows_as_entry_dicts(self):
+        rows = list(TrackerFrame.from_records(RECORDS[:2]))
+        assert rows == [
+            {'client': 'SKY', 'month': 'January', 'spendType': 'Project budget', 'ballpark': False, 'spend': 1500.0},
+            {'client': 'TOW', 'month': 'January', 'spendType': 'Extra budget', 'ballpark': True, 'spend': 2000.0},
+        ]
+
+    def test_entries_round_trip(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        assert list(TrackerFrame.from_entries(frame)) == list(frame)
+
+
+class TestClientRows:
+
+    def test_only_that_client_in_order(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        assert list(frame.client_rows('SKY')) == [
+            ('January', 'Project budget', 1500.0),
+            ('February', 'Project budget', 1500.5),
+            ('', 'Project budget', 99.0),
+        ]
+        assert list(frame.client_rows('NOPE')) == []
+
+    def test_compact(self):
+        frame = TrackerFrame.from_entries(
+            {'client': f'C{i % 20}', 'month': 'May', 'spendType': 'Project budget', 'spend': i}
+            for i in range(10000)
+        )
+        assert frame.nbytes <= 20 * len(frame)
+
+
+class TestPatching:
+
+    def totals_match_rows(self, frame):
+        for client in frame.clients:
+            assert frame.month_totals(client) == _month_totals(client, list(frame))
+
+    def test_month_totals(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        assert frame.month_totals('SKY') == ({'January': 1500, 'February': 1500, '': 99},
+                                             {'January': 1, 'February': 1, '': 1})
+        assert frame.month_totals('TOW') == ({}, {'January': 1})  # Extra budget only
+        assert frame.month_totals('NOPE') == ({}, {})
+        self.totals_match_rows(frame)
+
+    def test_edit_in_place(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        frame.upsert_record(record('SKY', 'January', 2500))
+        assert len(frame) == 4
+        assert frame.month_totals('SKY')[0]['January'] == 2500
+        frame.upsert_record(record('SKY', 'January', 2500, 'Project on us'))
+        assert 'January' not in frame.month_totals('SKY')[0]
+        self.totals_match_rows(frame)
+
+    def test_move_month_and_client(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        moved = {**record('TOW', 'March', 700), 'id': 'recSKYJanuary'}
+        frame.upsert_record(moved)
+        assert frame.month_totals('SKY')[1] == {'February': 1, '': 1}
+        assert frame.month_totals('TOW') == ({'March': 700}, {'January': 1, 'March': 1})
+        assert ('March', 'Project budget', 700.0) in list(frame.client_rows('TOW'))
+        self.totals_match_rows(frame)
+
+    def test_remove_and_new(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        frame.remove_record('recSKYFebruary')
+        frame.remove_record('recNOPE')
+        frame.upsert_record(record('SKY', 'May', 10))
+        assert len(frame) == 4
+        assert [r['month'] for r in frame if r['client'] == 'SKY'] == ['January', '', 'May']
+        assert 'February' not in frame.month_totals('SKY')[1]
+        self.totals_match_rows(frame)
+
+    def test_compacts_under_churn(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        for i in range(1000):
+            frame.upsert_record({**record('SKY', 'May', 10), 'id': f'recChurn{i}'})
+            frame.remove_record(f'recChurn{i}')
+        assert len(frame) == 4
+        assert len(frame.client) <= 4 / (1 - TrackerFrame.COMPACT_FRACTION) + 1
+        assert [r['month'] for r in frame if r['client'] == 'SKY'] == ['January', 'February', '']
+        frame.upsert_record(record('SKY', 'February', 20))  # ids still find their rows
+        assert frame.month_totals('SKY')[0] == {'January': 1500, 'February': 20, '': 99}
+        self.totals_match_rows(frame)
+
+    def test_no_drift(self):
+        frame = TrackerFrame.from_records([record('SKY', 'May', 0.1), record('TOW', 'May', 0.2)])
+        for spend in (0.3, 0.7, 1234.56, 0.1):
+            frame.upsert_record(record('SKY', 'May', spend))
+        frame.upsert_record(record('SKY', 'May', 1))
+        assert frame.month_totals('SKY')[0] == {'May': 1}
+
+
+class TestSubset:
+
+    def test_only_those_clients(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        part = frame.subset({'SKY', 'NOPE'})
+        assert list(part) == [r for r in frame if r['client'] == 'SKY']
+        assert part.month_totals('SKY') == frame.month_totals('SKY')
+        assert len(frame.subset([])) == 0
+
+    def test_pickles(self):
+        frame = TrackerFrame.from_records(RECORDS)
+        copy = pickle.loads(pickle.dumps(frame))
+        assert list(copy) == list(frame)
+        copy.upsert_record(record('SKY', 'January', 10))
+        assert copy.month_totals('SKY')[0]['January'] == 10
+        assert frame.month_totals('SKY')[0]['January'] == 1500
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,114 @@
+"""
+test_webhooks.py — notification MAC check, payload reduction and payload cursors
+
+Payloads below follow Airtable's webhook 'v0' format, as a local stand-in
+would emit them.
+
+Run: pytest test_webhooks.py -v
+"""
+
+import base64
+
+import pytest
+
+from webhooks import PayloadCursors, SqlitePayloadCursors, collect_changes, content_mac, verify_mac
+
+
+SECRET = base64.b64encode(b'0123456789abcdef0123456789abcdef').decode()
+BODY = b'{"base":{"id":"app1"},"webhook":{"id":"ach1"},"timestamp":"2026-10-19T00:00:00.000Z"}'
+
+TABLES = {'tblProjects': 'Projects', 'tblPeople': 'People'}
+
+
+class TestMac:
+
+    def test_round_trip(self):
+        assert verify_mac(SECRET, BODY, content_mac(SECRET, BODY))
+
+    def test_known_format(self):
+        assert content_mac(SECRET, BODY).startswith('hmac-sha256=')
+        assert len(content_mac(SECRET, BODY)) == len('hmac-sha256=') + 64
+
+    def test_tampered_body(self):
+        assert not verify_mac(SECRET, BODY + b' ', content_mac(SECRET, BODY))
+
+    def test_wrong_secret(self):
+        other = base64.b64encode(b'another secret').decode()
+        assert not verify_mac(other, BODY, content_mac(SECRET, BODY))
+
+    def test_missing_header_or_secret(self):
+        assert not verify_mac(SECRET, BODY, '')
+        assert not verify_mac('', BODY, content_mac(SECRET, BODY))
+
+    def test_malformed_secret(self):
+        assert not verify_mac('not base64!', BODY, 'hmac-sha256=00')
+
+
+class TestCollectChanges:
+
+    def test_created_changed_destroyed(self):
+        payloads = [
+            {'changedTablesById': {'tblProjects': {
+                'createdRecordsById': {'recNew': {'cellValuesByFieldId': {}}},
+                'changedRecordsById': {'recA': {'current': {'cellValuesByFieldId': {}}}},
+            }}},
+            {'changedTablesById': {
+                'tblProjects': {'destroyedRecordIds': ['recOld']},
+                'tblPeople': {'changedRecordsById': {'recP': {}}},
+            }},
+        ]
+        changes = collect_changes(payloads, TABLES)
+        assert changes == {
+            'Projects': {'changed': {'recNew', 'recA'}, 'destroyed': {'recOld'}},
+            'People': {'changed': {'recP'}, 'destroyed': set()},
+        }
+
+    def test_created_then_destroyed_is_destroyed(self):
+        payloads = [
+            {'changedTablesById': {'tblProjects': {'createdRecordsById': {'recX': {}}}}},
+            {'changedTablesById': {'tblProjects': {'destroyedRecordIds': ['recX']}}},
+        ]
+        assert collect_changes(payloads, TABLES)['Projects'] == {'changed': set(), 'destroyed': {'recX'}}
+
+    def test_unknown_table_keyed_by_id(self):
+        payloads = [{'changedTablesById': {'tblOther': {'changedRecordsById': {'rec1': {}}}}}]
+        assert 'tblOther' in collect_changes(payloads, TABLES)
+
+    def test_schema_only_payload(self):
+        assert collect_changes([{'timestamp': 'x', 'baseTransactionNumber': 4}], TABLES) == {}
+
+
+@pytest.fixture
+def make_cursors(state_db):
+    def make():
+        if state_db is None:
+            return PayloadCursors()
+        return SqlitePayloadCursors(state_db)
+    return make
+
+
+class TestPayloadCursors:
+
+    def test_starts_at_one(self, make_cursors):
+        assert make_cursors().get('ach1') == 1
+
+    def test_advances_per_webhook(self, make_cursors):
+        cursors = make_cursors()
+        cursors.advance('ach1', 7)
+        assert cursors.get('ach1') == 7
+        assert cursors.get('ach2') == 1
+
+    def test_never_moves_back(self, make_cursors):
+        cursors = make_cursors()
+        cursors.advance('ach1', 9)
+        cursors.advance('ach1', 7)  # a slower drain finishing late
+        assert cursors.get('ach1') == 9
+
+    def test_sqlite_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'state.db')
+        SqlitePayloadCursors(path).advance('ach1', 12)
+        assert SqlitePayloadCursors(path).get('ach1') == 12
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -156,6 +156,12 @@ async function loadTodos() {
     }
 }
 
+// Seed from /api/bootstrap so the first visit to the view skips the fetch
+function seedTodos(list) {
+    todos = list;
+    todosLoaded = true;
+}
+
 // ===== RENDER =====
 function renderTodoContent() {
     const today = nzToday();
@@ -664,6 +670,24 @@ function deleteTodoFromModal() {
     closeTodoModal();
     deleteTodo(id);
 }
+// ===== LIVE EVENTS =====
+// Patch the local list from a /api/events 'todo' event (fired by any tab's save).
+// Only touches the list once it's loaded — a later loadTodos() picks it up anyway.
+function applyTodoEvent(event) {
+    if (!todosLoaded || !event) return;
+    const id = event.todo ? event.todo.id : event.id;
+    const idx = todos.findIndex(t => t.id === id);
+    if (event.action === 'deleted') {
+        if (idx === -1) return;
+        todos.splice(idx, 1);
+    } else if (idx === -1) {
+        todos.unshift(event.todo);  // newest first, same as the API order
+    } else {
+        todos[idx] = event.todo;
+    }
+    if (state.currentView === 'todo') renderTodoContent();
+}
+
 
 // ===== MODAL: EVENT HANDLERS (scoped) =====
 // Close modal on overlay click
@@ -686,6 +710,8 @@ document.addEventListener('click', (e) => {
 // ===== EXPORTS =====
 window.renderTodos = renderTodos;
 window.loadTodos = loadTodos;
+window.seedTodos = seedTodos;
+window.applyTodoEvent = applyTodoEvent;
 window.openTodoModal = openTodoModal;
 window.closeTodoModal = closeTodoModal;
 window.toggleTodoModalDropdown = toggleTodoModalDropdown;
@@ -232,9 +232,11 @@ function formatRolloverLine(rolloverObj) {
 }
 
 // ===== DATA LOADING =====
+// The dropdown list only carries the light fields; the selected client's
+// rollover / chart data is fetched on its own by loadTrackerClient.
 async function loadTrackerClients() {
     try {
-        const response = await fetch(`${API_BASE}/tracker/clients`);
+        const response = await fetch(`${API_BASE}/tracker/clients?view=list`);
         if (!response.ok) throw new Error('API returned ' + response.status);
         const data = await response.json();
         populateTrackerClients(data);
@@ -246,6 +248,38 @@ async function loadTrackerClients() {
     }
 }
 
+function trackerClientFields(c) {
+    return {
+        code: c.code,
+        name: c.name,
+        committed: c.committed,
+        quarterlyCommitted: c.committed * 3,
+        rollover: c.rollover || 0,
+        rolloverUseIn: c.rolloverUseIn || '',
+        yearEnd: c.yearEnd,
+        currentQuarter: c.currentQuarter,
+        // Phase 2/3 additions — historically-accurate budget data
+        committedByMonth: c.committedByMonth,
+        rolloverObject: c.rolloverObject,
+        rolloverByQuarter: c.rolloverByQuarter || {},
+        chartMonths: c.chartMonths
+    };
+}
+
+async function loadTrackerClient(clientCode, cacheBust = false) {
+    const client = trackerClients[clientCode];
+    if (!client || (client.detailLoaded && !cacheBust)) return;
+    try {
+        const url = `${API_BASE}/tracker/clients?client=${clientCode}${cacheBust ? '&_t=' + Date.now() : ''}`;
+        const response = await fetch(url);
+        if (!response.ok) throw new Error('API returned ' + response.status);
+        const [data] = await response.json();
+        if (data) trackerClients[clientCode] = { ...trackerClientFields(data), detailLoaded: true };
+    } catch (e) {
+        console.log('Using list fields for tracker client:', clientCode);
+    }
+}
+
 function populateTrackerClients(data) {
     trackerClients = {};
     
@@ -256,21 +290,7 @@ function populateTrackerClients(data) {
     }
     
     filteredData.forEach(c => {
-        trackerClients[c.code] = {
-            code: c.code,
-            name: c.name,
-            committed: c.committed,
-            quarterlyCommitted: c.committed * 3,
-            rollover: c.rollover || 0,
-            rolloverUseIn: c.rolloverUseIn || '',
-            yearEnd: c.yearEnd,
-            currentQuarter: c.currentQuarter,
-            // Phase 2/3 additions — historically-accurate budget data
-            committedByMonth: c.committedByMonth,
-            rolloverObject: c.rolloverObject,
-            rolloverByQuarter: c.rolloverByQuarter || {},
-            chartMonths: c.chartMonths
-        };
+        trackerClients[c.code] = trackerClientFields(c);
     });
     
     const menu = $('tracker-client-menu');
@@ -314,7 +334,13 @@ function populateTrackerClients(data) {
     }
 }
 
+// Rows and the client's rollover / chart data, fetched side by side
 async function loadTrackerData(clientCode, cacheBust = false) {
+    await Promise.all([loadTrackerRows(clientCode, cacheBust), loadTrackerClient(clientCode, cacheBust)]);
+    return true;
+}
+
+async function loadTrackerRows(clientCode, cacheBust = false) {
     try {
         const url = `${API_BASE}/tracker/data?client=${clientCode}${cacheBust ? '&_t=' + Date.now() : ''}`;
         const response = await fetch(url);
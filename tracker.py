@@ -4,15 +4,30 @@ tracker.py — Pure functions for tracker math.
 Owns:
 - Quarter math (current + previous, given a financial year-end month)
 - Committed amount lookup (Budget History with fallback to Clients table)
-- Rollover calculation (debt-to-client model, floor at zero)
+- Rollover calculation (debt-to-client model, floor at zero), per quarter
+  or as a single forward walk over a run of quarters
+- What-if projections: rollover for the coming quarters under planned spend
 - Chart months (6-month range for the tracker bar chart)
-
-No Flask, no Airtable. Caller assembles data and passes it in.
+- Fingerprints of a closed quarter's rollover inputs (for memoising results)
+- The derived per-client fields of /api/tracker/clients, singly or for a
+  batch of clients (the unit of work handed to a worker process)
+- Portfolio summary: per-client and agency-wide quarter / year-to-date totals
+- Quarter view: a client's tracker rows grouped quarter -> job -> month,
+  with subtotals and ballpark flags
+- Range index: cumulative monthly committed / spend, for any-window totals
+
+No Flask, no Airtable. Caller assembles data and passes it in. Tracker
+entries are a list of dicts ('client', 'month', 'spendType', 'ballpark',
+'spend') or a trackerframe.TrackerFrame.
 """
 
+import hashlib
+import json
 from datetime import date
 from typing import Optional
 
+from trackerframe import TrackerFrame, spend_value
+
 
 MONTH_NUM = {
     'January': 1, 'February': 2, 'March': 3, 'April': 4,
@@ -21,6 +36,10 @@ MONTH_NUM = {
 }
 MONTH_NAME = {v: k for k, v in MONTH_NUM.items()}
 
+# Part of every rollover_fingerprint. Bump when get_rollover's math changes,
+# so memoised results from the old math are recomputed rather than served.
+ROLLOVER_VERSION = 1
+
 
 # ===== Internal helpers =====
 
@@ -60,6 +79,16 @@ def _quarter_months(quarter_first: date) -> list:
     return out
 
 
+def _client_rows(client_code: str, tracker_entries):
+    """(month, spendType, spend as a number) for each of client's tracker entries."""
+    if isinstance(tracker_entries, TrackerFrame):
+        yield from tracker_entries.client_rows(client_code)
+        return
+    for row in tracker_entries:
+        if row.get('client') == client_code:
+            yield row.get('month'), row.get('spendType'), spend_value(row.get('spend', 0))
+
+
 def _spend_for_month(client_code: str, month_name: str,
                      tracker_entries: list) -> int:
     """Sum tracker spend where:
@@ -79,19 +108,8 @@ def _spend_for_month(client_code: str, month_name: str,
     clients (March/June/September year-ends) repeat month names within that
     window.
     """
-    total = 0
-    for row in tracker_entries:
-        if row.get('client') != client_code:
-            continue
-        if row.get('month') != month_name:
-            continue
-        if row.get('spendType') != 'Project budget':
-            continue
-        spend = row.get('spend', 0)
-        if isinstance(spend, str):
-            spend = float(spend.replace('$', '').replace(',', '') or 0)
-        total += spend
-    return int(total)
+    spend_by_month, _ = _month_totals(client_code, tracker_entries)
+    return spend_by_month.get(month_name, 0)
 
 
 # ===== Public API =====
@@ -282,12 +300,8 @@ def get_rollover(client_code: str, today: date,
     # Pre-system suppression: if the previous quarter has ZERO tracker entries
     # for this client, that quarter pre-dates the tracker system being live for
     # them. Don't manufacture a phantom carry from "no entries = full underspend".
-    prev_month_names = {m['month_name'] for m in prev_q['months']}
-    prev_entry_count = sum(
-        1 for row in tracker_entries
-        if row.get('client') == client_code
-        and row.get('month') in prev_month_names
-    )
+    spend_by_month, count_by_month = _month_totals(client_code, tracker_entries)
+    prev_entry_count = sum(count_by_month.get(m['month_name'], 0) for m in prev_q['months'])
     prev_quarter_has_data = prev_entry_count > 0
 
     if prev_quarter_has_data:
@@ -298,9 +312,7 @@ def get_rollover(client_code: str, today: date,
                 client_code, m['year'], m['month_num'],
                 budget_history, clients_fallback,
             )
-            prev_spent_total += _spend_for_month(
-                client_code, m['month_name'], tracker_entries,
-            )
+            prev_spent_total += spend_by_month.get(m['month_name'], 0)
         inherited = max(0, prev_committed_total - prev_spent_total)
     else:
         inherited = 0
@@ -318,12 +330,20 @@ def get_rollover(client_code: str, today: date,
             client_code, m['year'], m['month_num'],
             budget_history, clients_fallback,
         )
-        curr_spent_total += _spend_for_month(
-            client_code, m['month_name'], tracker_entries,
-        )
+        curr_spent_total += spend_by_month.get(m['month_name'], 0)
 
     net = curr_committed_total - curr_spent_total
 
+    return _rollover_result(
+        curr_q_num, curr_q_first, curr_q['months'], prev_q['label'],
+        prev_quarter_has_data, inherited, net, is_closed,
+    )
+
+
+def _rollover_result(curr_q_num: int, curr_q_first: date, curr_months: list,
+                     prev_label: str, prev_quarter_has_data: bool,
+                     inherited: int, net: int, is_closed: bool) -> dict:
+    """get_rollover's response, from the quarter's inherited carry and net."""
     if net >= 0:
         # Net under (or exactly even): banks to next quarter. Inherited untouched.
         banking = net
@@ -350,7 +370,7 @@ def get_rollover(client_code: str, today: date,
             'remaining': remaining,
             'inherited': inherited,
             'chipped': chipped,
-            'previousQuarterLabel': prev_q['label'],
+            'previousQuarterLabel': prev_label,
             'expiresOn': _last_day_of_quarter(curr_q_first).isoformat(),
         }
 
@@ -369,7 +389,7 @@ def get_rollover(client_code: str, today: date,
         'isClosed': is_closed,
         'currentQuarterLabel': f'Q{curr_q_num}',
         'nextQuarterLabel': f'Q{next_q_num}',
-        'quarterKey': _quarter_key_from_months(curr_q['months']),
+        'quarterKey': _quarter_key_from_months(curr_months),
     }
 
 
@@ -403,3 +423,532 @@ def get_historic_quarter_dates(year_end_month: str, today: date,
     """
     _, curr_q_first = _quarter_from_today(year_end_month, today)
     return [_add_months(curr_q_first, -3 * i) for i in range(1, n_quarters + 1)]
+
+
+def _month_totals(client_code: str, tracker_entries: list) -> tuple:
+    """({month_name: int spend}, {month_name: entry count}) for client, in one
+    pass — what _spend_for_month and the pre-system check read. A TrackerFrame
+    answers from its running totals without reading rows."""
+    if isinstance(tracker_entries, TrackerFrame):
+        return tracker_entries.month_totals(client_code)
+    spend_by_month = {}
+    count_by_month = {}
+    for month, spend_type, spend in _client_rows(client_code, tracker_entries):
+        count_by_month[month] = count_by_month.get(month, 0) + 1
+        if spend_type == 'Project budget':
+            spend_by_month[month] = spend_by_month.get(month, 0) + spend
+    return {m: int(total) for m, total in spend_by_month.items()}, count_by_month
+
+
+def _committed_lookup(client_code: str, budget_history: list, clients_fallback: dict):
+    """get_committed for one client with its Budget History rows parsed once.
+    Returns committed(year, month_num) -> int."""
+    rows = []
+    for row in budget_history:
+        if row.get('Client') != client_code:
+            continue
+        eff = row.get('Effective From')
+        if isinstance(eff, str):
+            eff = date.fromisoformat(eff)
+        if eff is not None:
+            rows.append((eff, row.get('Monthly Committed', 0)))
+    fallback = int(clients_fallback.get(client_code, 0))
+
+    def committed(year: int, month_num: int) -> int:
+        target = date(year, month_num, 1)
+        best = None
+        for eff, amount in rows:
+            # Strictly later wins, so the first of equal dates is kept (as get_committed)
+            if eff <= target and (best is None or eff > best[0]):
+                best = (eff, amount)
+        return int(best[1]) if best else fallback
+
+    return committed
+
+
+def walk_rollovers(client_code: str, start: date, end: date,
+                   year_end_month: str,
+                   budget_history: list,
+                   clients_fallback: dict,
+                   tracker_entries: list,
+                   today: Optional[date] = None):
+    """Yield get_rollover results for each quarter from the one containing
+    start to the one containing end, oldest first, in one forward pass.
+
+    Each quarter is summed once and its net becomes the next quarter's
+    inherited carry, so N quarters cost N + 1 quarter evaluations (calling
+    get_rollover per quarter costs 2N).
+
+    Quarters are closed (as get_rollover(quarter's first day, ...,
+    is_closed=True)). If today is given, the quarter containing it is live
+    (as get_rollover(today, ...)) and the walk stops there.
+    """
+    spend_by_month, count_by_month = _month_totals(client_code, tracker_entries)
+    committed = _committed_lookup(client_code, budget_history, clients_fallback)
+
+    def quarter_net(months, before=None):
+        total = 0
+        for m in months:
+            if before is not None and date(m['year'], m['month_num'], 1) >= before:
+                continue  # in-flight or future month — skipped in live mode
+            total += committed(m['year'], m['month_num']) - spend_by_month.get(m['month_name'], 0)
+        return total
+
+    _, q_first = _quarter_from_today(year_end_month, start)
+    _, last_first = _quarter_from_today(year_end_month, end)
+    live_first = None
+    if today is not None:
+        _, live_first = _quarter_from_today(year_end_month, today)
+        last_first = min(last_first, live_first)
+        today_first = date(today.year, today.month, 1)
+
+    prev_months = _quarter_months(_add_months(q_first, -3))
+    prev_net = quarter_net(prev_months)
+    while q_first <= last_first:
+        q_num, _ = _quarter_from_today(year_end_month, q_first)
+        months = _quarter_months(q_first)
+        prev_quarter_has_data = any(count_by_month.get(m['month_name']) for m in prev_months)
+        inherited = max(0, prev_net) if prev_quarter_has_data else 0
+        is_closed = q_first != live_first
+        net = quarter_net(months, None if is_closed else today_first)
+        yield _rollover_result(
+            q_num, q_first, months, f'Q{4 if q_num == 1 else q_num - 1}',
+            prev_quarter_has_data, inherited, net, is_closed,
+        )
+        prev_months, prev_net = months, net
+        q_first = _add_months(q_first, 3)
+
+
+# The quarter before today's is read as actuals; a 4th projected quarter
+# would reuse its month names (Tracker months carry no year) and count that
+# spend twice.
+SIMULATE_MAX_QUARTERS = 3
+
+
+def simulate_rollovers(client_code: str, today: date,
+                       year_end_month: str,
+                       budget_history: list,
+                       clients_fallback: dict,
+                       tracker_entries: list,
+                       scenarios: list,
+                       quarters: int = 2) -> list:
+    """Projected rollover for each what-if scenario: the quarter containing
+    today and the (quarters - 1) after it, each as if closed (all 3 months,
+    as get_rollover(..., is_closed=True)), oldest first.
+
+    A scenario is a list of planned entries {'month', 'spend', 'spendType'
+    (default 'Project budget')} added on top of the client's actual rows;
+    negative spend takes planned spend out of a month, so "push this job to
+    next month" is -X in one month and +X in the next. Months are by name and
+    must fall in the projected quarters.
+
+    The client's rows, committed amounts and the carry into today's quarter
+    are worked out once; each scenario only re-sums its own months. Returns
+    one list of rollover results per scenario, in scenario order. ValueError
+    if quarters isn't 1..SIMULATE_MAX_QUARTERS or an entry's month is outside
+    the projection.
+    """
+    if not 1 <= quarters <= SIMULATE_MAX_QUARTERS:
+        raise ValueError(f'quarters must be 1-{SIMULATE_MAX_QUARTERS}')
+    spend_by_month, count_by_month = _month_totals(client_code, tracker_entries)
+    committed = _committed_lookup(client_code, budget_history, clients_fallback)
+
+    _, curr_q_first = _quarter_from_today(year_end_month, today)
+    prev_months = _quarter_months(_add_months(curr_q_first, -3))
+    prev_net = sum(committed(m['year'], m['month_num']) - spend_by_month.get(m['month_name'], 0)
+                   for m in prev_months)
+    prev_has_data = any(count_by_month.get(m['month_name']) for m in prev_months)
+
+    projected = []  # (q_num, q_first, months, committed per month)
+    for i in range(quarters):
+        q_first = _add_months(curr_q_first, 3 * i)
+        months = _quarter_months(q_first)
+        projected.append((_quarter_from_today(year_end_month, q_first)[0], q_first, months,
+                          [committed(m['year'], m['month_num']) for m in months]))
+    projected_names = {m['month_name'] for _, _, months, _ in projected for m in months}
+
+    results = []
+    for scenario in scenarios:
+        spend_delta, count_delta = {}, {}
+        for entry in scenario:
+            month = entry.get('month')
+            if month not in projected_names:
+                raise ValueError(f'Month {month!r} is outside the projected quarters')
+            count_delta[month] = count_delta.get(month, 0) + 1
+            if entry.get('spendType', 'Project budget') == 'Project budget':
+                spend_delta[month] = spend_delta.get(month, 0) + spend_value(entry.get('spend', 0))
+
+        out = []
+        net, has_data = prev_net, prev_has_data
+        for q_num, q_first, months, committed_by_month in projected:
+            inherited = max(0, net) if has_data else 0
+            net = 0
+            for m, month_committed in zip(months, committed_by_month):
+                name = m['month_name']
+                net += month_committed - spend_by_month.get(name, 0) - int(spend_delta.get(name, 0))
+            out.append(_rollover_result(
+                q_num, q_first, months, f'Q{4 if q_num == 1 else q_num - 1}',
+                has_data, inherited, net, True,
+            ))
+            has_data = any(count_by_month.get(m['month_name']) or count_delta.get(m['month_name'])
+                           for m in months)
+        results.append(out)
+    return results
+
+
+def rollover_fingerprint(client_code: str, today: date,
+                         year_end_month: str,
+                         budget_history: list,
+                         clients_fallback: dict,
+                         tracker_entries: list) -> str:
+    """Digest of every input get_rollover(..., is_closed=True) reads for the
+    quarter containing today: the client's month totals (spend and row count)
+    for that quarter's and the previous quarter's months, its Budget History
+    rows in effect by the quarter's last month, its fallback committed, and
+    ROLLOVER_VERSION.
+
+    Equal fingerprints mean equal closed rollovers, so a stored result stays
+    valid until an old row is back-edited. (Live quarters also depend on
+    today, so aren't covered.)
+    """
+    _, curr_q_first = _quarter_from_today(year_end_month, today)
+    months = _quarter_months(_add_months(curr_q_first, -3)) + _quarter_months(curr_q_first)
+    last_month = _add_months(curr_q_first, 2).isoformat()
+
+    spend_by_month, count_by_month = _month_totals(client_code, tracker_entries)
+    rows = [(m['month_name'], spend_by_month.get(m['month_name'], 0), count_by_month.get(m['month_name'], 0))
+            for m in months]
+    history = sorted(
+        (str(row.get('Effective From')), str(row.get('Monthly Committed', 0)))
+        for row in budget_history
+        if row.get('Client') == client_code and str(row.get('Effective From'))[:10] <= last_month
+    )
+    payload = [ROLLOVER_VERSION, client_code, year_end_month, curr_q_first.isoformat(),
+               rows, history, str(clients_fallback.get(client_code, 0))]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+# ===== Tracker client fields =====
+
+def client_fields(client_code: str, today: date,
+                  year_end_month: str,
+                  budget_history: list,
+                  clients_fallback: dict,
+                  rollovers: list) -> dict:
+    """The derived fields /api/tracker/clients adds to a client, given its
+    rollovers (closed quarters oldest first, then the live quarter).
+
+    rolloverByQuarter is keyed by JAN-MAR style quarter key; the frontend
+    looks up the quarter being viewed and picks its template by isClosed.
+    """
+    return {
+        'rolloverObject': rollovers[-1],
+        'chartMonths': get_chart_months(year_end_month, today, client_code,
+                                        budget_history, clients_fallback),
+        'committedByMonth': get_committed_by_month(client_code, today,
+                                                   budget_history, clients_fallback),
+        'rolloverByQuarter': {r['quarterKey']: r for r in rollovers if r.get('quarterKey')},
+    }
+
+
+def compute_client_rollovers(clients: list, today: date,
+                             budget_history: list,
+                             clients_fallback: dict,
+                             tracker_entries,
+                             n_quarters: int = 3) -> list:
+    """Rollovers for each (client_code, year_end_month) in clients, in order:
+    the n_quarters closed quarters oldest first, then the live one, from one
+    walk_rollovers pass per client (client_fields' rollovers argument).
+
+    Module-level and picklable-argument only, so a process pool can run it
+    on a shard of clients; the caller memoises the closed quarters. A client
+    whose math fails gets {'error': message} instead, so one bad client
+    doesn't sink the shard.
+    """
+    out = []
+    for client_code, year_end_month in clients:
+        try:
+            start = get_historic_quarter_dates(year_end_month, today, n_quarters)[-1]
+            out.append(list(walk_rollovers(client_code, start, today, year_end_month,
+                                           budget_history, clients_fallback, tracker_entries,
+                                           today=today)))
+        except Exception as e:
+            out.append({'error': str(e)})
+    return out
+
+
+def _fiscal_year_months(year_end_month: str, today: date) -> list:
+    """Month dicts from the start of today's financial year through today's month."""
+    months_in = (today.month - MONTH_NUM[year_end_month] - 1) % 12  # months before today's in this FY
+    first = _add_months(date(today.year, today.month, 1), -months_in)
+    out = []
+    for i in range(months_in + 1):
+        d = _add_months(first, i)
+        out.append({'year': d.year, 'month_num': d.month, 'month_name': MONTH_NAME[d.month]})
+    return out
+
+
+PORTFOLIO_WINDOWS = ('previousQuarter', 'currentQuarter', 'yearToDate')
+PORTFOLIO_ROLLOVER_FIELDS = ('banked', 'chipped', 'expiring', 'banking')
+
+
+def get_client_summary(client_code: str, today: date,
+                       year_end_month: str,
+                       budget_history: list,
+                       clients_fallback: dict,
+                       tracker_entries: list) -> dict:
+    """Committed / spent / variance for the previous quarter, current quarter
+    (all 3 months) and financial year to date (through today's month), plus
+    the live rollover position.
+
+    Spend and committed come from one pass over the client's rows; the
+    rollover from a two-quarter walk_rollovers.
+
+    Shape:
+      {
+        'previousQuarter': {'label', 'quarterKey', 'committed', 'spent', 'variance'},
+        'currentQuarter':  {'label', 'quarterKey', 'committed', 'spent', 'variance'},
+        'yearToDate':      {'committed', 'spent', 'variance'},
+        'rollover': {
+          'banked': int,     # carried in from the previous quarter
+          'chipped': int,    # of which used by overspend so far
+          'expiring': int,   # still unused — expires on expiresOn
+          'expiresOn': str,  # ISO date (last day of current quarter), '' if no carry
+          'banking': int,    # net underspend of completed months, heading to next quarter
+        },
+      }
+    """
+    spend_by_month, _ = _month_totals(client_code, tracker_entries)
+    committed = _committed_lookup(client_code, budget_history, clients_fallback)
+
+    def window(months):
+        committed_total = sum(committed(m['year'], m['month_num']) for m in months)
+        spent_total = sum(spend_by_month.get(m['month_name'], 0) for m in months)
+        return {'committed': committed_total, 'spent': spent_total,
+                'variance': committed_total - spent_total}
+
+    _, curr_q_first = _quarter_from_today(year_end_month, today)
+    prev_q_first = _add_months(curr_q_first, -3)
+    prev_rollover, live = walk_rollovers(client_code, prev_q_first, today, year_end_month,
+                                         budget_history, clients_fallback, tracker_entries,
+                                         today=today)
+
+    last_quarter = live['lastQuarter'] or {}
+    return {
+        'previousQuarter': {'label': prev_rollover['currentQuarterLabel'],
+                            'quarterKey': prev_rollover['quarterKey'],
+                            **window(_quarter_months(prev_q_first))},
+        'currentQuarter': {'label': live['currentQuarterLabel'],
+                           'quarterKey': live['quarterKey'],
+                           **window(_quarter_months(curr_q_first))},
+        'yearToDate': window(_fiscal_year_months(year_end_month, today)),
+        'rollover': {
+            'banked': last_quarter.get('inherited', 0),
+            'chipped': last_quarter.get('chipped', 0),
+            'expiring': last_quarter.get('remaining', 0),
+            'expiresOn': last_quarter.get('expiresOn', '') if last_quarter.get('remaining') else '',
+            'banking': (live['nextQuarter'] or {}).get('banking', 0),
+        },
+    }
+
+
+def get_portfolio(clients: list, today: date,
+                  budget_history: list,
+                  clients_fallback: dict,
+                  tracker_entries: list) -> dict:
+    """get_client_summary for each retainer client, plus agency-wide totals.
+
+    Args:
+      clients: [{'code', 'name', 'yearEnd' (month name)}]
+
+    Returns {'clients': [{'code', 'name', **summary}], 'totals': {...}} where
+    totals sums each window's committed / spent / variance and the rollover
+    amounts across clients (quarters are each client's own fiscal quarters).
+    """
+    out = []
+    totals = {name: {'committed': 0, 'spent': 0, 'variance': 0} for name in PORTFOLIO_WINDOWS}
+    totals['rollover'] = {name: 0 for name in PORTFOLIO_ROLLOVER_FIELDS}
+    for client in clients:
+        summary = get_client_summary(client['code'], today, client['yearEnd'],
+                                     budget_history, clients_fallback, tracker_entries)
+        for name in PORTFOLIO_WINDOWS:
+            for field in ('committed', 'spent', 'variance'):
+                totals[name][field] += summary[name][field]
+        for field in PORTFOLIO_ROLLOVER_FIELDS:
+            totals['rollover'][field] += summary['rollover'][field]
+        out.append({'code': client['code'], 'name': client['name'], **summary})
+    return {'clients': out, 'totals': totals}
+
+
+def _fiscal_quarters(year_end_month: str, today: date) -> list:
+    """The 4 quarters of today's financial year, in order:
+    [{'label', 'quarterKey', 'months': [month dicts]}]."""
+    months_in = (today.month - MONTH_NUM[year_end_month] - 1) % 12
+    first = _add_months(date(today.year, today.month, 1), -months_in)
+    quarters = []
+    for q in range(4):
+        months = _quarter_months(_add_months(first, 3 * q))
+        quarters.append({'label': f'Q{q + 1}', 'quarterKey': _quarter_key_from_months(months),
+                         'months': months})
+    return quarters
+
+
+def group_by_quarter(rows: list, year_end_month: str, today: date) -> dict:
+    """Tracker rows (get_tracker_data's dicts) grouped quarter -> job -> month
+    over today's financial year.
+
+    Months are placed by name (Tracker entries don't carry a year — see
+    _spend_for_month). Jobs keep the order they first appear in rows, split
+    by spend type the way the tracker table lists them; a month can hold
+    more than one row.
+
+    Shape:
+      {
+        'quarters': [{
+          'label': 'Q1', 'quarterKey': 'APR-JUN', 'months': ['April', ...],
+          'isCurrent': bool, 'spend': float, 'ballpark': bool,
+          'bySpendType': {spendType: float},
+          'jobs': [{
+            'jobNumber', 'projectName', 'owner', 'jobDescription', 'spendType',
+            'spend', 'ballpark',
+            'months': [{'month', 'spend', 'ballpark', 'rows': [row, ...]}],
+          }],
+        }],   # all 4, in fiscal order
+        'unplaced': [row, ...],   # Month isn't a month name
+      }
+
+    ballpark is true at any level if any row under it is a ballpark figure.
+    """
+    current_first = _quarter_from_today(year_end_month, today)[1]
+    quarters = []
+    quarter_of_month = {}
+    for quarter in _fiscal_quarters(year_end_month, today):
+        months = quarter['months']
+        quarters.append({
+            'label': quarter['label'],
+            'quarterKey': quarter['quarterKey'],
+            'months': [m['month_name'] for m in months],
+            'isCurrent': (months[0]['year'], months[0]['month_num']) == (current_first.year, current_first.month),
+            'spend': 0,
+            'ballpark': False,
+            'bySpendType': {},
+            'jobs': [],
+        })
+        for m in months:
+            quarter_of_month[m['month_name']] = quarters[-1]
+
+    jobs = {}  # (quarterKey, jobNumber, spendType) -> job group
+    unplaced = []
+    for row in rows:
+        quarter = quarter_of_month.get(row.get('month'))
+        if quarter is None:
+            unplaced.append(row)
+            continue
+        spend = spend_value(row.get('spend', 0))
+        ballpark = bool(row.get('ballpark'))
+        spend_type = row.get('spendType', 'Project budget')
+
+        key = (quarter['quarterKey'], row.get('jobNumber', ''), spend_type)
+        job = jobs.get(key)
+        if job is None:
+            job = jobs[key] = {
+                'jobNumber': row.get('jobNumber', ''),
+                'projectName': row.get('projectName', ''),
+                'owner': row.get('owner', ''),
+                'jobDescription': row.get('jobDescription', ''),
+                'spendType': spend_type,
+                'spend': 0,
+                'ballpark': False,
+                'months': {name: None for name in quarter['months']},
+            }
+            quarter['jobs'].append(job)
+        month = job['months'][row['month']]
+        if month is None:
+            month = job['months'][row['month']] = {'month': row['month'], 'spend': 0,
+                                                   'ballpark': False, 'rows': []}
+        month['rows'].append(row)
+        for group in (month, job, quarter):
+            group['spend'] += spend
+            group['ballpark'] = group['ballpark'] or ballpark
+        quarter['bySpendType'][spend_type] = quarter['bySpendType'].get(spend_type, 0) + spend
+
+    for job in jobs.values():
+        job['months'] = [m for m in job['months'].values() if m is not None]
+    return {'quarters': quarters, 'unplaced': unplaced}
+
+
+# ===== Range index =====
+
+def _month_key(d: date) -> str:
+    return f'{d.year:04d}-{d.month:02d}'
+
+
+def _parse_month_key(key: str) -> date:
+    """'YYYY-MM' -> first of that month. ValueError if malformed."""
+    try:
+        year, month = key.split('-')
+        return date(int(year), int(month), 1)
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f'Bad month {key!r} (expected YYYY-MM)')
+
+
+def build_range_index(client_code: str, today: date,
+                      year_end_month: str,
+                      budget_history: list,
+                      clients_fallback: dict,
+                      tracker_entries: list) -> dict:
+    """Cumulative monthly committed and spend for client, so range_totals can
+    answer any window in O(1). Built with one pass over the client's rows.
+
+    Tracker entries don't carry a year (see _spend_for_month), so spend can
+    only be placed in the 12 months ending with today's quarter — the year
+    the tracker shows. The index covers just those months: a window reaching
+    outside them would count committed with no spend against it.
+
+    Shape (JSON-serialisable, so it can be cached):
+      {
+        'start': 'YYYY-MM', 'end': 'YYYY-MM', 'spendFrom': 'YYYY-MM',  # spendFrom == start
+        'committed': [0, c0, c0+c1, ...],   # prefix sums, len = 13
+        'spent':     [0, s0, s0+s1, ...],
+      }
+    """
+    spend_by_month, _ = _month_totals(client_code, tracker_entries)
+    committed = _committed_lookup(client_code, budget_history, clients_fallback)
+    _, curr_q_first = _quarter_from_today(year_end_month, today)
+    start = _add_months(curr_q_first, -9)
+
+    committed_sums, spent_sums = [0], [0]
+    for i in range(12):
+        d = _add_months(start, i)
+        committed_sums.append(committed_sums[-1] + committed(d.year, d.month))
+        spent_sums.append(spent_sums[-1] + spend_by_month.get(MONTH_NAME[d.month], 0))
+    return {
+        'start': _month_key(start),
+        'end': _month_key(_add_months(start, 11)),
+        'spendFrom': _month_key(start),
+        'committed': committed_sums,
+        'spent': spent_sums,
+    }
+
+
+def range_totals(index: dict, from_month: str, to_month: str) -> dict:
+    """Committed / spent / variance from from_month through to_month
+    ('YYYY-MM', inclusive) out of a build_range_index index.
+
+    ValueError if either month is malformed or outside the index (the
+    tracker year), or the range runs backwards.
+    """
+    start = _parse_month_key(index['start'])
+    first = _parse_month_key(from_month)
+    last = _parse_month_key(to_month)
+    if last < first:
+        raise ValueError(f'{to_month} is before {from_month}')
+    lo = (first.year - start.year) * 12 + first.month - start.month
+    hi = (last.year - start.year) * 12 + last.month - start.month + 1
+    if lo < 0 or hi > len(index['committed']) - 1:
+        raise ValueError(f"Range outside the tracker year {index['start']}..{index['end']}"
+                         " (Tracker months carry no year, so spend outside it can't be placed)")
+    committed = index['committed'][hi] - index['committed'][lo]
+    spent = index['spent'][hi] - index['spent'][lo]
+    return {'from': from_month, 'to': to_month, 'months': hi - lo,
+            'committed': committed, 'spent': spent, 'variance': committed - spent}
@@ -0,0 +1,262 @@
+"""
+trackerframe.py — Tracker entries as compact columns.
+
+Owns:
+- TrackerFrame: one row per Tracker record, stored column-wise in arrays —
+  client and spend type interned to small ints, month as its number (1-12),
+  spend as a float64, ballpark as a 0/1 byte — instead of a dict per row
+- Building a frame straight from Airtable Tracker records, page by page
+- A per-client row index, so one client's rows are read without a full scan
+- Patching a record in place (edited or removed by id), compacting the
+  columns once removed rows pass COMPACT_FRACTION of them, and per-client
+  running month totals kept up to date by every append / patch, so the
+  rollover math reads 12 numbers instead of the client's rows
+- Subsets of clients, picklable, for handing to worker processes
+
+No Flask, no Airtable calls. tracker.py takes a TrackerFrame anywhere it
+takes a list of tracker entry dicts.
+"""
+
+import threading
+from array import array
+
+
+MONTH_NAMES = ('', 'January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December')
+_MONTH_ORDINAL = {name: i for i, name in enumerate(MONTH_NAMES) if name}
+
+
+def _first(value):
+    """Unwrap a single-value Airtable lookup list."""
+    if isinstance(value, list):
+        return value[0] if value else ''
+    return value
+
+
+def spend_value(spend) -> float:
+    """Tracker spend as a number ('$1,500' -> 1500.0)."""
+    if isinstance(spend, str):
+        return float(spend.replace('$', '').replace(',', '') or 0)
+    return float(spend or 0)
+
+
+def _record_row(record, client_field):
+    """(client, month, spend type, spend, ballpark) of an Airtable Tracker record."""
+    fields = record.get('fields', {})
+    return (_first(fields.get(client_field, '')), fields.get('Month', ''),
+            fields.get('Spend type', 'Project budget'), fields.get('Spend', 0),
+            fields.get('Ballpark', False))
+
+
+class TrackerFrame:
+    """Tracker rows in columns. Thread-safe: reads see each patch whole.
+
+    Columns (index = row number; a removed record's row stays, unindexed,
+    until the next compaction renumbers the live rows):
+      client: id into .clients
+      month: 1-12, or 0 for text that isn't a month name
+      spend: float
+      spend_type: id into .spend_types
+      ballpark: 1 / 0
+
+    Running totals are kept per client and month in whole cents, so applying
+    and reversing an edit leaves no float drift.
+    """
+
+    PROJECT_BUDGET = 'Project budget'
+    COMPACT_FRACTION = 0.25
+
+    def __init__(self):
+        self.clients = []
+        self.spend_types = []
+        self._client_ids = {}
+        self._spend_type_ids = {}
+        self.client = array('I')
+        self.month = array('B')
+        self.spend = array('d')
+        self.spend_type = array('B')
+        self.ballpark = array('B')
+        self._lock = threading.Lock()
+        self._rows_by_client = {}  # client id -> array('I') of row numbers
+        self._row_of_id = {}       # Airtable record id -> row number
+        self._removed = 0
+        self._totals = {}          # client id -> {month: [project cents, project rows, rows]}
+
+    @classmethod
+    def from_records(cls, records, client_field: str = 'Client Code') -> 'TrackerFrame':
+        """Frame of raw Airtable Tracker records ({'id', 'fields'})."""
+        frame = cls()
+        frame.extend_records(records, client_field)
+        return frame
+
+    @classmethod
+    def from_entries(cls, entries) -> 'TrackerFrame':
+        """Frame of tracker entry dicts ('client', 'month', 'spendType', 'ballpark', 'spend')."""
+        frame = cls()
+        for row in entries:
+            frame.append(row.get('client'), row.get('month'), row.get('spendType'),
+                         row.get('spend', 0), row.get('ballpark', False))
+        return frame
+
+    def subset(self, client_codes) -> 'TrackerFrame':
+        """New frame holding only client_codes' rows (e.g. one worker's share)."""
+        frame = TrackerFrame()
+        with self._lock:
+            for code in client_codes:
+                client_id = self._client_ids.get(code)
+                if client_id is None:
+                    continue
+                for i in self._rows_by_client[client_id]:
+                    frame._append_locked(code, MONTH_NAMES[self.month[i]], self.spend_types[self.spend_type[i]],
+                                         self.spend[i], self.ballpark[i], None)
+        return frame
+
+    def __getstate__(self):
+        with self._lock:
+            state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def extend_records(self, records, client_field: str = 'Client Code') -> None:
+        """Append Airtable records — e.g. one page of a list response at a time."""
+        with self._lock:
+            for record in records:
+                self._append_locked(*_record_row(record, client_field), record.get('id'))
+
+    def append(self, client, month, spend_type, spend, ballpark=False, record_id=None) -> None:
+        with self._lock:
+            self._append_locked(client, month, spend_type, spend, ballpark, record_id)
+
+    def upsert_record(self, record, client_field: str = 'Client Code') -> None:
+        """Add an Airtable record, or overwrite the row already holding its id."""
+        with self._lock:
+            row = self._row_of_id.get(record.get('id'))
+            if row is None:
+                self._append_locked(*_record_row(record, client_field), record.get('id'))
+                return
+            client, month, spend_type, spend, ballpark = _record_row(record, client_field)
+            spend = spend_value(spend)
+            self._count_locked(row, -1)
+            client_id = self._client_id_locked(client)
+            if client_id != self.client[row]:
+                self._rows_by_client[self.client[row]].remove(row)
+                self._rows_by_client[client_id].append(row)
+                self.client[row] = client_id
+            self.month[row] = _MONTH_ORDINAL.get(month, 0)
+            self.spend[row] = spend
+            self.spend_type[row] = self._spend_type_id_locked(spend_type)
+            self.ballpark[row] = 1 if ballpark else 0
+            self._count_locked(row, 1)
+
+    def remove_record(self, record_id) -> None:
+        """Drop the row holding record_id (no-op if none)."""
+        with self._lock:
+            row = self._row_of_id.pop(record_id, None)
+            if row is None:
+                return
+            self._count_locked(row, -1)
+            self._rows_by_client[self.client[row]].remove(row)
+            self._removed += 1
+            if self._removed > self.COMPACT_FRACTION * len(self.client):
+                self._compact_locked()
+
+    def _compact_locked(self):
+        """Drop removed rows from the columns, keeping the live rows' order.
+        Totals are per client and month, so they carry over as they are."""
+        live = sorted(row for rows in self._rows_by_client.values() for row in rows)
+        new_row = {old: new for new, old in enumerate(live)}
+        for name in ('client', 'month', 'spend', 'spend_type', 'ballpark'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[i] for i in live)))
+        for client_id, rows in self._rows_by_client.items():
+            self._rows_by_client[client_id] = array('I', (new_row[i] for i in rows))
+        self._row_of_id = {record_id: new_row[row] for record_id, row in self._row_of_id.items()}
+        self._removed = 0
+
+    def _client_id_locked(self, client):
+        client_id = self._client_ids.get(client)
+        if client_id is None:
+            client_id = self._client_ids[client] = len(self.clients)
+            self.clients.append(client)
+            self._rows_by_client[client_id] = array('I')
+            self._totals[client_id] = {}
+        return client_id
+
+    def _spend_type_id_locked(self, spend_type):
+        type_id = self._spend_type_ids.get(spend_type)
+        if type_id is None:
+            type_id = self._spend_type_ids[spend_type] = len(self.spend_types)
+            self.spend_types.append(spend_type)
+        return type_id
+
+    def _append_locked(self, client, month, spend_type, spend, ballpark, record_id):
+        spend = spend_value(spend)
+        client_id = self._client_id_locked(client)
+        row = len(self.client)
+        self._rows_by_client[client_id].append(row)
+        self.client.append(client_id)
+        self.month.append(_MONTH_ORDINAL.get(month, 0))
+        self.spend.append(spend)
+        self.spend_type.append(self._spend_type_id_locked(spend_type))
+        self.ballpark.append(1 if ballpark else 0)
+        if record_id is not None:
+            self._row_of_id[record_id] = row
+        self._count_locked(row, 1)
+
+    def _count_locked(self, row, sign):
+        """Add (sign 1) or take back (sign -1) row's share of its client's totals."""
+        totals = self._totals[self.client[row]].setdefault(self.month[row], [0, 0, 0])
+        if self.spend_types[self.spend_type[row]] == self.PROJECT_BUDGET:
+            totals[0] += sign * round(self.spend[row] * 100)
+            totals[1] += sign
+        totals[2] += sign
+
+    def __len__(self):
+        return len(self.client) - self._removed
+
+    def __iter__(self):
+        """Rows as tracker entry dicts (for callers that want the old shape)."""
+        with self._lock:
+            rows = sorted(row for rows in self._rows_by_client.values() for row in rows)
+        for i in rows:
+            yield {
+                'client': self.clients[self.client[i]],
+                'month': MONTH_NAMES[self.month[i]],
+                'spendType': self.spend_types[self.spend_type[i]],
+                'ballpark': bool(self.ballpark[i]),
+                'spend': self.spend[i],
+            }
+
+    def client_rows(self, client_code):
+        """(month name, spend type, spend) for each of client_code's rows, in order.
+        Month is '' for text that wasn't a month name."""
+        with self._lock:
+            client_id = self._client_ids.get(client_code)
+            if client_id is None:
+                return
+            rows = [(MONTH_NAMES[self.month[i]], self.spend_types[self.spend_type[i]], self.spend[i])
+                    for i in self._rows_by_client[client_id]]
+        yield from rows
+
+    def month_totals(self, client_code) -> tuple:
+        """({month name: int Project budget spend}, {month name: row count}) for
+        client_code, from the running totals (months with no rows left out)."""
+        spend_by_month, count_by_month = {}, {}
+        with self._lock:
+            for month, (cents, project_rows, rows) in self._totals.get(self._client_ids.get(client_code), {}).items():
+                if project_rows:
+                    spend_by_month[MONTH_NAMES[month]] = int(cents / 100)
+                if rows:
+                    count_by_month[MONTH_NAMES[month]] = rows
+        return spend_by_month, count_by_month
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the columns and row index (excluding the interned strings)."""
+        columns = (self.client, self.month, self.spend, self.spend_type, self.ballpark,
+                   *self._rows_by_client.values())
+        return sum(len(col) * col.itemsize for col in columns)
@@ -770,12 +770,13 @@ async function submitUpdate() {
             jobUpdatePayload.description = $um('update-modal-description-input').value.trim();
         }
 
-        const jobRes = await fetch(`${API_BASE}/job/${encodeURIComponent(job.jobNumber)}/update`, {
+        // One round-trip: job update, tracker write, then the jobs delta
+        const ops = [{
+            id: 'job',
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(jobUpdatePayload),
-        });
-        if (!jobRes.ok) throw new Error('Job update failed');
+            path: `/api/job/${encodeURIComponent(job.jobNumber)}/update`,
+            body: jobUpdatePayload,
+        }];
 
         // 2. Build tracker payload — only submit if there's a spend value
         const spendRaw = $um('update-modal-spend-input').value.replace(/,/g, '').replace(/[^0-9]/g, '');
@@ -787,49 +788,58 @@ async function submitUpdate() {
         const shouldWriteTracker = spendNum > 0 || updateModalState.currentMonthTrackerId;
 
         if (shouldWriteTracker) {
+            const trackerPayload = {
+                spend: spendNum,
+                month: monthName,
+                description: notesText,
+                ballpark: updateModalState.ballpark,
+                spendType: 'Project budget',
+            };
             if (updateModalState.currentMonthTrackerId) {
                 // Update existing tracker record
-                const trackerPayload = {
-                    id: updateModalState.currentMonthTrackerId,
-                    spend: spendNum,
-                    month: monthName,
-                    description: notesText,
-                    ballpark: updateModalState.ballpark,
-                    spendType: 'Project budget',
-                };
-                const trkRes = await fetch(`${API_BASE}/tracker/update`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(trackerPayload),
-                });
-                if (!trkRes.ok) throw new Error('Tracker update failed');
+                trackerPayload.id = updateModalState.currentMonthTrackerId;
+                ops.push({ id: 'tracker', method: 'POST', path: '/api/tracker/update', body: trackerPayload });
             } else {
                 // Create new tracker record
-                const trackerPayload = {
-                    jobNumber: job.jobNumber,
-                    spend: spendNum,
-                    month: monthName,
-                    description: notesText,
-                    ballpark: updateModalState.ballpark,
-                    spendType: 'Project budget',
-                };
-                const trkRes = await fetch(`${API_BASE}/tracker/create`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(trackerPayload),
-                });
-                if (!trkRes.ok) throw new Error('Tracker create failed');
+                trackerPayload.jobNumber = job.jobNumber;
+                ops.push({ id: 'tracker', method: 'POST', path: '/api/tracker/create', body: trackerPayload });
             }
         }
 
+        const jobsCursor = (typeof state !== 'undefined') ? state.jobsCursor : null;
+        if (jobsCursor) {
+            ops.push({ id: 'jobs', method: 'GET', path: `/api/jobs/changes?since=${encodeURIComponent(jobsCursor)}` });
+        }
+
+        const batchRes = await fetch(`${API_BASE}/batch`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ ops }),
+        });
+        if (!batchRes.ok) throw new Error('Save failed');
+        const results = Object.fromEntries((await batchRes.json()).results.map(r => [r.id, r]));
+        if (results.job.status >= 400) throw new Error('Job update failed');
+        if (results.tracker && results.tracker.status >= 400) {
+            throw new Error(updateModalState.currentMonthTrackerId ? 'Tracker update failed' : 'Tracker create failed');
+        }
+
+        // The server skips writes that would change nothing — then there's nothing to refresh
+        let refreshTypes = [];
+        if (!results.job.body.skipped) refreshTypes.push('jobs');
+        if (results.tracker && !results.tracker.body.skipped) refreshTypes.push('tracker');
+
         // Track this job as updated in this modal session (so it's not suggested as "next")
         updateModalState.sessionUpdatedJobs.add(job.jobNumber);
 
         // Refresh jobs (and tracker if visible) — needs fresh state.allJobs
-        // before findNextJob below.
+        // before findNextJob below. The jobs delta came back in the batch.
         try {
+            if (results.jobs?.status === 200 && typeof window.applyJobChanges === 'function') {
+                window.applyJobChanges(results.jobs.body);
+                refreshTypes = refreshTypes.filter(t => t !== 'jobs');
+            }
             if (typeof window.refreshAfterMutation === 'function') {
-                await window.refreshAfterMutation(['jobs', 'tracker']);
+                if (refreshTypes.length) await window.refreshAfterMutation(refreshTypes);
             } else {
                 // Fallback: shouldn't fire if app.js loaded normally
                 const r = await fetch(`${API_BASE}/jobs/all`);
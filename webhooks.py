@@ -0,0 +1,113 @@
+"""
+webhooks.py — Airtable webhook notifications and payloads.
+
+Owns:
+- MAC check for incoming notifications (X-Airtable-Content-MAC, HMAC-SHA256
+  of the raw body with the webhook's base64 secret), and signing, so a local
+  stand-in can emit notifications the receiver accepts
+- Reducing a run of webhook payloads to the record ids that changed and
+  were destroyed, per table
+- The payload cursor per webhook, only ever moved forward — in memory, or
+  SqlitePayloadCursors (a statedb twin) so a restart resumes where it left
+  off instead of replaying from 1
+
+No Flask, no Airtable calls. Caller fetches payloads and refreshes its caches.
+"""
+
+import base64
+import hashlib
+import hmac
+import threading
+
+from statedb import SqliteStore
+
+
+MAC_HEADER = 'X-Airtable-Content-MAC'
+MAC_PREFIX = 'hmac-sha256='
+
+
+def content_mac(secret_b64: str, body: bytes) -> str:
+    """Header value Airtable sends for body: 'hmac-sha256=<hex digest>'."""
+    key = base64.b64decode(secret_b64)
+    return MAC_PREFIX + hmac.new(key, body, hashlib.sha256).hexdigest()
+
+
+def verify_mac(secret_b64: str, body: bytes, header: str) -> bool:
+    """True if header is the MAC of body under secret_b64 (constant-time)."""
+    if not secret_b64 or not header:
+        return False
+    try:
+        expected = content_mac(secret_b64, body)
+    except (ValueError, TypeError):
+        return False  # malformed secret
+    return hmac.compare_digest(expected, header.strip())
+
+
+def collect_changes(payloads: list, table_names: dict) -> dict:
+    """Record ids touched by payloads (Airtable 'v0' payload format), per table.
+
+    Args:
+      payloads: list of payload dicts, oldest first
+      table_names: {table_id: table_name}; unknown ids are keyed by id
+
+    Returns {table_name: {'changed': set(record ids), 'destroyed': set(record ids)}}.
+    Created records count as changed; a record created and then destroyed
+    within the run is only reported destroyed.
+    """
+    out = {}
+    for payload in payloads:
+        for table_id, table in (payload.get('changedTablesById') or {}).items():
+            entry = out.setdefault(table_names.get(table_id, table_id),
+                                   {'changed': set(), 'destroyed': set()})
+            entry['changed'].update(table.get('createdRecordsById') or {})
+            entry['changed'].update(table.get('changedRecordsById') or {})
+            entry['destroyed'].update(table.get('destroyedRecordIds') or [])
+    for entry in out.values():
+        entry['changed'] -= entry['destroyed']
+    return out
+
+
+class PayloadCursors:
+    """Next payload cursor per webhook id, in memory. Airtable cursors start at 1."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cursors = {}
+
+    def get(self, webhook_id: str) -> int:
+        with self._lock:
+            return self._cursors.get(webhook_id, 1)
+
+    def advance(self, webhook_id: str, cursor: int) -> None:
+        """Move webhook_id's cursor to cursor (never backwards)."""
+        with self._lock:
+            self._cursors[webhook_id] = max(cursor, self._cursors.get(webhook_id, 1))
+
+
+class SqlitePayloadCursors(SqliteStore):
+    """SQLite twin of PayloadCursors.
+
+    Args:
+      path: SQLite database file (created if missing)
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._conn().execute(
+            'CREATE TABLE IF NOT EXISTS webhook_cursors ('
+            ' webhook_id TEXT PRIMARY KEY, cursor INTEGER NOT NULL)'
+        )
+
+    def get(self, webhook_id: str) -> int:
+        row = self._conn().execute(
+            'SELECT cursor FROM webhook_cursors WHERE webhook_id = ?', (webhook_id,)
+        ).fetchone()
+        return row[0] if row else 1
+
+    def advance(self, webhook_id: str, cursor: int) -> None:
+        # One statement, so two processes draining at once can't move it back
+        self._conn().execute(
+            'INSERT INTO webhook_cursors (webhook_id, cursor) VALUES (?, ?)'
+            ' ON CONFLICT (webhook_id) DO UPDATE SET cursor = MAX(cursor, excluded.cursor)',
+            (webhook_id, cursor)
+        )